@@ -2,12 +2,19 @@
 """MetaOpt
 
 Usage:
+  metaopt worker --connect HOST:PORT [--workers N] [--authkey KEY]
+  metaopt worker --queue PATH [--workers N]
   metaopt (-h | --help)
   metaopt --version
 
 Options:
-  -h --help        Show this screen.
-  -v --version     Show version.
+  -h --help            Show this screen.
+  -v --version         Show version.
+  --connect HOST:PORT  Address of the coordinator to run workers for.
+  --queue PATH         Task database on a shared filesystem to run workers for.
+  --workers N          Number of worker processes [default: number of CPUs].
+  --authkey KEY        Key shared with the coordinator
+                       [default: $METAOPT_AUTHKEY].
 
 """
 
@@ -16,12 +23,54 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
+import signal
 import sys
 
 # First Party
 import metaopt
 
 
+def _get_option(arguments, name, default=None):
+    """Returns the value following the given option, if given."""
+    try:
+        return arguments[arguments.index(name) + 1]
+    except ValueError:
+        return default
+
+
+def _exit(signum, frame):
+    """Exits on the given signal, cleaning up like on any other exit."""
+    del frame
+    # do not interrupt the cleanup by repeated signals
+    signal.signal(signum, signal.SIG_IGN)
+    sys.exit(128 + signum)
+
+
+def worker(arguments):
+    """Runs workers for the coordinator or queue given by the arguments."""
+    resources = _get_option(arguments, "--workers")
+    if resources is not None:
+        resources = int(resources)
+
+    # terminate the workers along with the node
+    signal.signal(signal.SIGTERM, _exit)
+
+    # imported here, so that printing the version stays fast
+    if "--queue" in arguments:
+        from metaopt.concurrent.worker.queue_node import QueueWorkerNode
+
+        QueueWorkerNode(path=_get_option(arguments, "--queue"),
+                        resources=resources).run()
+        return
+
+    from metaopt.concurrent.worker.node import WorkerNode
+
+    host, port = _get_option(arguments, "--connect").rsplit(":", 1)
+    WorkerNode(address=(host, int(port)),
+               authkey=_get_option(arguments, "--authkey"),
+               resources=resources).run()
+
+
 if __name__ == '__main__':
 
     commands_version = ['-v', '--version']
@@ -33,7 +82,10 @@ if __name__ == '__main__':
         command = sys.argv[1]
         if command in commands_version:
             print(version)
+        elif command == "worker" and ("--connect" in sys.argv or
+                                      "--queue" in sys.argv):
+            worker(sys.argv[2:])
         else:
             print(__doc__)
-    except:
+    except (IndexError, ValueError):
         print(__doc__)
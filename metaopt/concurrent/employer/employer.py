@@ -31,6 +31,18 @@ class Employer(BaseEmployer):
 
         self._worker_count -= 1
 
+    def cancel(self, call_id, reason=None):
+        """
+        Asks the worker executing the call given by id to abort it.
+
+        Returns the id of the worker asked or None, if this employer's workers
+        can not abort calls. Lay off the worker then.
+        """
+        del call_id
+        del reason
+
+        return None
+
     def abandon(self, reason=None):
         del reason
 
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Employer of the workers that worker nodes offer via a TCP transport.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+from threading import RLock
+
+# First Party
+from metaopt.concurrent.employer.employer import Employer
+from metaopt.concurrent.employer.util.exception import LayoffError
+
+
+class NodeWorkerEmployer(Employer):
+    """
+    Employer of the workers that worker nodes offer via a TCP transport.
+
+    Each node offers as many workers as it has capacity for. Nodes may join
+    and get lost at any time, so the number of workers varies. Laying off a
+    worker makes its node replace it by a new one, which the node offers
+    again. The calls of lost nodes get issued to the remaining workers.
+    """
+
+    def __init__(self, transport, status_db):
+        """
+        :param:    transport    TCP transport the nodes connect to
+        :param:    status_db    status database to report layoffs to
+        """
+        super(NodeWorkerEmployer, self).__init__()
+
+        self._transport = transport
+        self._status_db = status_db
+
+        # ids of the workers offered by the nodes and of the employed ones
+        self._worker_ids_offered = []
+        self._worker_ids = []
+
+        # nodes come and go in the transport's receiving thread
+        self._lock = RLock()
+
+        transport.set_handlers(offer_handler=self._handle_offer,
+                               loss_handler=self._handle_loss)
+
+    @property
+    def worker_count_max(self):
+        """Returns the number of workers all nodes have capacity for."""
+        with self._lock:
+            return len(self._worker_ids_offered) + len(self._worker_ids)
+
+    def _handle_offer(self, worker_ids):
+        """Takes note of the given workers offered by a node."""
+        with self._lock:
+            self._worker_ids_offered.extend(worker_ids)
+
+        # an invoker waiting for workers can issue its calls now
+        self._status_db.wake_up()
+
+    def _handle_loss(self, worker_ids):
+        """Reports the calls of the given workers lost with their node."""
+        with self._lock:
+            for worker_id in worker_ids:
+                if worker_id in self._worker_ids_offered:
+                    self._worker_ids_offered.remove(worker_id)
+                if worker_id in self._worker_ids:
+                    self._worker_ids.remove(worker_id)
+                    self._status_db.report_loss(worker_id=worker_id)
+
+        # the calls of the lost workers can be issued to others now
+        self._status_db.wake_up()
+
+    def employ(self, number_of_workers=1):
+        """
+        Employs a given number of the offered workers for future tasks.
+        """
+        with self._lock:
+            if len(self._worker_ids_offered) < number_of_workers:
+                raise IndexError("The nodes offer not so many workers.")
+
+            for _ in range(number_of_workers):
+                worker_id = self._worker_ids_offered.pop(0)
+                try:
+                    self._transport.connect(worker_id)
+                except KeyError:
+                    # The node of the worker was lost just now.
+                    # So there is no worker to employ.
+                    continue
+                self._worker_ids.append(worker_id)
+
+    def lay_off(self, call_id, reason=None):
+        """
+        Lays off the worker that started the call given by id, if any.
+
+        The calls the worker did not start, yet, are kept for other workers.
+
+        :param call_id: ID of the call whose executing worker to lay off.
+        :param reason: Reason for the lay off. (optional)
+        """
+        with self._lock:
+            try:
+                worker_id = self._status_db.get_worker_id(call_id=call_id)
+            except KeyError:
+                # The call was completed or never issued.
+                # So we have nothing to do here.
+                return
+            if worker_id in self._worker_ids:
+                self._lay_off(worker_id, reason, orphan=True)
+
+    def _lay_off(self, worker_id, reason, orphan=False):
+        """Lays off the worker given by id for the given reason."""
+        self._worker_ids.remove(worker_id)
+
+        # makes the node terminate the worker and offer a new one
+        self._transport.disconnect(worker_id)
+
+        # report the calls the worker will never finish
+        self._status_db.report_layoff(worker_id=worker_id, reason=reason,
+                                      orphan=orphan)
+
+    def abandon(self, reason=None):
+        """
+        Lays off all workers.
+        """
+        with self._lock:
+            if reason is None:
+                reason = LayoffError("Releasing all workers.")
+            # copy worker ids so that _lay_off does not modify
+            for worker_id in self._worker_ids[:]:
+                self._lay_off(worker_id=worker_id, reason=reason)
+
+    @property
+    def worker_ids(self):
+        """Returns the ids of the employed workers."""
+        with self._lock:
+            return list(self._worker_ids)
+
+    @property
+    def worker_count(self):
+        """Returns the number of currently employed workers."""
+        with self._lock:
+            return len(self._worker_ids)
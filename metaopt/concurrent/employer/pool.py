@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Pool of worker processes that outlives the invokers using it.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+from threading import Lock
+
+# First Party
+from metaopt.concurrent.employer.process import ProcessWorkerEmployer
+from metaopt.concurrent.employer.util.exception import LayoffError
+from metaopt.concurrent.transport.pipe import PipeTransport
+
+
+class ProcessWorkerPool(object):
+    """
+    Pool of worker processes that outlives the invokers using it.
+
+    Spawns all workers up front and keeps them alive across optimizations, so
+    that neither process startup nor module imports are repeated. One invoker
+    at a time uses the pool. When it stops, only the workers that still have
+    tasks get replaced, all others are kept for the next invoker.
+
+    The workers of the pool do not count against the CPUs other employers
+    share, so that invokers without the pool still get workers of their own.
+    """
+
+    def __init__(self, resources=None, initializer=None, initargs=(),
+                 placement=None):
+        """
+        :param resources: Number of worker processes to keep. Defaults to the
+                          number of CPUs.
+        :param initializer: Function each worker calls once on start. Its
+                            return value is the worker's context.
+        :param initargs: Arguments to call the initializer with.
+        :param placement: WorkerPlacement pinning the workers to disjoint CPUs
+                          and limiting their native threads.
+        """
+        super(ProcessWorkerPool, self).__init__()
+
+        # pipes connecting the invokers to each worker process directly
+        self._transport = PipeTransport()
+
+        # whether an invoker is currently using this pool
+        self._attached = False
+
+        self._employer = ProcessWorkerEmployer(transport=self._transport,
+                                               status_db=None,
+                                               resources=resources,
+                                               initializer=initializer,
+                                               initargs=initargs,
+                                               placement=placement,
+                                               shared=False)
+
+        self._closed = False
+
+        # invokers may be stopped by timers in other threads
+        self._lock = Lock()
+
+        self._fill()
+
+    def _fill(self):
+        """Employs workers till this pool is full, all of them at once."""
+        self._employer.employ(number_of_workers=self.worker_count_max -
+                              len(self._employer.worker_ids))
+
+    @property
+    def transport(self):
+        """Property for the transport connecting to the workers."""
+        return self._transport
+
+    @property
+    def worker_count_max(self):
+        """Returns the number of workers this pool keeps at most."""
+        return self._employer.worker_count_max
+
+    @property
+    def worker_count_source(self):
+        """Returns where the maximum number of workers came from."""
+        return self._employer.worker_count_source
+
+    @property
+    def worker_ids(self):
+        """Returns the ids of the workers in this pool."""
+        return self._employer.worker_ids
+
+    @property
+    def closed(self):
+        """Indicates whether this pool was closed."""
+        return self._closed
+
+    def attach(self):
+        """
+        Hands this pool over to an invoker.
+
+        Returns the employer of the pool's workers for the invoker to use. The
+        invoker sets the employer's status database for the layoffs.
+        Raises ValueError if another invoker uses the pool or it was closed.
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError("The worker pool was closed.")
+            if self._attached:
+                raise ValueError("The worker pool is used by another invoker.")
+            self._attached = True
+
+            # replace the workers laid off by the previous invoker
+            self._fill()
+            return self._employer
+
+    def detach(self, reason=None):
+        """
+        Takes this pool back from the invoker using it.
+
+        Lays off the workers that did not finish the tasks issued to them, so
+        that the next invoker does not get their outcomes. This reports their
+        calls as laid off to the invoker's status database.
+        """
+        with self._lock:
+            if not self._attached:
+                return
+
+            status_db = self._employer.status_db
+            if reason is None:
+                reason = LayoffError("Releasing busy workers.")
+            for worker_id in self._employer.worker_ids:
+                if status_db is not None and status_db.is_busy(worker_id):
+                    self._employer.lay_off_worker(worker_id=worker_id,
+                                                  reason=reason)
+
+            self._employer.status_db = None
+            self._attached = False
+
+    def close(self):
+        """Terminates all workers of this pool and closes its transport."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+            reason = LayoffError("Closing the worker pool.")
+            for worker_id in self._employer.worker_ids:
+                self._employer.lay_off_worker(worker_id=worker_id,
+                                              reason=reason)
+            self._transport.close()
@@ -7,14 +7,17 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
-from multiprocessing.synchronize import Lock
+import os
+import signal
+import uuid
+from multiprocessing import Lock
 
 # First Party
 from metaopt.concurrent.employer.employer import Employer
 from metaopt.concurrent.employer.util. \
-    determine_worker_count import determine_worker_count
+    determine_worker_count import detect_worker_count
 from metaopt.concurrent.employer.util.exception import LayoffError
-from metaopt.concurrent.model.call_lifecycle import Layoff
+from metaopt.concurrent.employer.util.memory import measure_rss
 from metaopt.concurrent.worker.process import ProcessWorker
 
 
@@ -29,27 +32,69 @@ class ProcessWorkerEmployer(Employer):
     _lock = Lock()
     _worker_processes = []
 
-    def __init__(self, queue_tasks, queue_outcome, queue_start,
-                 status_db, resources=None):
+    # seconds a terminated worker gets to exit before it is killed
+    TERMINATE_TIMEOUT = 5
+
+    def __init__(self, transport, status_db, resources=None, initializer=None,
+                 initargs=(), placement=None, shared=True):
         """
+        :param:    transport    transport to connect the workers with
         :param:    resources    number of (possibly virtual) CPUs to use,
                                 defaults to all
+        :param:    initializer  function each worker calls once on start,
+                                its return value is the worker's context
+        :param:    initargs     arguments to call the initializer with
+        :param:    placement    WorkerPlacement pinning the workers to
+                                disjoint CPUs, as many workers as fit
+        :param:    shared       whether the workers count against the CPUs
+                                all shared employers use, or only against
+                                a limit of this employer
         """
         super(ProcessWorkerEmployer, self).__init__()
 
         with self._lock:
-            # use the given queues
-            self._queue_outcome = queue_outcome
-            self._queue_start = queue_start
-            self._queue_task = queue_tasks
+            # use the given transport
+            self._transport = transport
             # use up to all CPUs
-            self._worker_count_max = determine_worker_count(resources)
+            self._worker_count_max, self._worker_count_source = \
+                detect_worker_count(resources)
+            # place the workers on slots of CPUs, by worker id
+            self._placement = placement
+            self._cpu_count = self._worker_count_max
+            self._slots = dict()
+            if placement is not None:
+                self._worker_count_max = placement.count_workers(
+                    self._cpu_count)
             self._status_db = status_db
+            if not shared:
+                # keep the worker processes apart from the shared ones
+                self._worker_processes = []
+            # workers employed by this very employer
+            self._worker_ids = set()
+            # setup of the workers employed by this very employer
+            self._initializer = initializer
+            self._initargs = initargs
 
     @property
     def worker_count_max(self):
         return self._worker_count_max
 
+    @property
+    def worker_count_source(self):
+        """Returns where the maximum number of workers came from."""
+        return self._worker_count_source
+
+    @property
+    def status_db(self):
+        """Property for the status database layoffs get reported to."""
+        return self._status_db
+
+    @status_db.setter
+    def status_db(self, status_db):
+        """Property setter for the status database attribute."""
+        with self._lock:
+            self._status_db = status_db
+
     def employ(self, number_of_workers=1):
         """
         Employs a given number worker processes for future tasks.
@@ -60,16 +105,36 @@ class ProcessWorkerEmployer(Employer):
                 raise IndexError("Cannot employ so many worker processes.")
 
             for _ in range(number_of_workers):
-                worker_process = \
-                    ProcessWorker(queue_tasks=self._queue_task,
-                                  queue_outcome=self._queue_outcome,
-                                  queue_start=self._queue_start)
+                worker_id = uuid.uuid4()
+                connection = self._transport.connect(worker_id)
+                cpus, threads = self._place(worker_id)
+                worker_process = ProcessWorker(worker_id=worker_id,
+                                               connection=connection,
+                                               initializer=self._initializer,
+                                               initargs=self._initargs,
+                                               cpus=cpus, threads=threads)
                 self._worker_processes.append(worker_process)
+                self._worker_ids.add(worker_id)
+
+    def _place(self, worker_id):
+        """Returns the CPUs and the threads of the given new worker."""
+        if self._placement is None:
+            return None, None
+
+        # take the first slot no other worker of ours has
+        slots_taken = set(self._slots.values())
+        slot = next(slot for slot in range(len(slots_taken) + 1)
+                    if slot not in slots_taken)
+        self._slots[worker_id] = slot
+        return (self._placement.get_cpus(slot, self._cpu_count),
+                self._placement.threads_per_worker)
 
     def lay_off(self, call_id, reason=None):
         """
         Lays off the worker process that started the call given by id, if any.
 
+        The calls the worker did not start, yet, are kept for other workers.
+
         :param call_id: ID of the call whose executing worker to lay off.
         :param reason: Reason for the lay off. (optional)
         """
@@ -86,37 +151,75 @@ class ProcessWorkerEmployer(Employer):
             except KeyError:
                 # nothing to do
                 return
-            self._lay_off(worker_process, reason)
+            self._lay_off(worker_process, reason, orphan=True)
+
+    def lay_off_worker(self, worker_id, reason=None, orphan=False):
+        """
+        Lays off the worker process given by id, if it is employed.
+
+        :param worker_id: ID of the worker to lay off.
+        :param reason: Reason for the lay off. (optional)
+        :param orphan: Whether to keep the calls the worker did not start for
+                       other workers. (optional)
+        """
+        with self._lock:
+            try:
+                worker_process = self._get_worker_process_for_id(worker_id)
+            except KeyError:
+                # nothing to do
+                return
+            self._lay_off(worker_process, reason, orphan=orphan)
 
-    def _lay_off(self, worker_process, reason):
+    def cancel(self, call_id, reason=None):
+        """
+        Asks the worker process executing the call given by id to abort it.
+
+        The call gets reported as laid off right away, the worker process is
+        kept for the next tasks. Returns the id of the worker asked, if any.
+
+        :param call_id: ID of the call to abort.
+        :param reason: Reason for the cancellation. (optional)
+        """
+        with self._lock:
+            try:
+                worker_id = self._status_db.get_worker_id(call_id=call_id)
+                worker_process = self._get_worker_process_for_id(worker_id)
+            except KeyError:
+                # The call was completed or its worker laid off meanwhile.
+                # So there is nothing to abort.
+                return None
+            if self._status_db.cancel_running_call(call_id=call_id,
+                                                   reason=reason) is None:
+                # The worker did not start the call, yet.
+                return None
+            worker_process.cancel(call_id)
+            return worker_id
+
+    def _lay_off(self, worker_process, reason, orphan=False):
         """Lays off the given process workers for the given reason."""
 
         # send kill signal and wait for the process to die
         # TODO assert worker_process.is_alive()
         worker_process.terminate()
         try:
-            worker_process.join()
+            worker_process.join(self.TERMINATE_TIMEOUT)
+            if worker_process.is_alive():
+                # The worker ignored the signal, so it can not ignore this.
+                os.kill(worker_process.pid, signal.SIGKILL)
+                worker_process.join()
         except OSError:
             # The worker has already terminated.
             # That is OK, just carry on.
             pass
         self._worker_processes.remove(worker_process)
+        self._worker_ids.discard(worker_process.worker_id)
+        self._slots.pop(worker_process.worker_id, None)
+        self._transport.disconnect(worker_process.worker_id)
 
-        try:
-            call = self._status_db.get_running_call(worker_process.worker_id)
-        except KeyError:
-            # The terminated worker was idle
-            try:
-                call = self._status_db.pop_idle_call()
-            except ValueError:
-                # No task was started for this worker process.
-                # Construct a None "call" manually to use as a dummy pay load.
-                call = None
-
-        # send manually constructed layoff outcome
-        layoff = Layoff(worker_id=worker_process.worker_id, call=call,
-                        value=reason)
-        self._queue_outcome.put(layoff)
+        # report the calls the worker will never finish, if anybody listens
+        if self._status_db is not None:
+            self._status_db.report_layoff(worker_id=worker_process.worker_id,
+                                          reason=reason, orphan=orphan)
 
     def abandon(self, reason=None):
         """
@@ -137,6 +240,31 @@ class ProcessWorkerEmployer(Employer):
         raise KeyError("There is no worker with the given worker id: %s" %
                        worker_id)
 
+    @property
+    def worker_ids(self):
+        """Returns the ids of the worker processes this employer employed."""
+        with self._lock:
+            return [worker_process.worker_id
+                    for worker_process in self._worker_processes
+                    if worker_process.worker_id in self._worker_ids]
+
+    def measure_memory(self):
+        """
+        Returns the resident memory of the employed worker processes in bytes,
+        by worker id. Leaves out processes that can not be measured.
+        """
+        with self._lock:
+            processes = [(worker_process.worker_id, worker_process.pid)
+                         for worker_process in self._worker_processes
+                         if worker_process.worker_id in self._worker_ids]
+
+        usage = dict()
+        for worker_id, pid in processes:
+            rss = measure_rss(pid)
+            if rss is not None:
+                usage[worker_id] = rss
+        return usage
+
     @property
     def worker_count(self):
         """Returns the number of currently running worker processes."""
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Employer of workers that run in threads of the invoker's process.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import uuid
+from threading import RLock
+
+# First Party
+from metaopt.concurrent.employer.employer import Employer
+from metaopt.concurrent.employer.util. \
+    determine_worker_count import detect_worker_count
+from metaopt.concurrent.employer.util.exception import LayoffError
+from metaopt.concurrent.worker.thread import ThreadWorker
+
+
+class ThreadWorkerEmployer(Employer):
+    """
+    Employer of workers that run in threads of the invoker's process.
+
+    Threads can not be terminated. So laying off a worker disconnects it and
+    abandons its thread. The thread finishes the call it is executing, if
+    any, but the outcome gets dropped, and then ends.
+    """
+
+    def __init__(self, transport, status_db, resources=None):
+        """
+        :param:    transport    transport to connect the workers with
+        :param:    status_db    status database to report layoffs to
+        :param:    resources    number of threads to use, defaults to the
+                                number of (possibly virtual) CPUs
+        """
+        super(ThreadWorkerEmployer, self).__init__()
+
+        self._transport = transport
+        self._status_db = status_db
+        self._worker_count_max, self._worker_count_source = \
+            detect_worker_count(resources)
+
+        # workers in the order of employment
+        self._worker_threads = []
+
+        self._lock = RLock()
+
+    @property
+    def worker_count_max(self):
+        return self._worker_count_max
+
+    @property
+    def worker_count_source(self):
+        """Returns where the maximum number of workers came from."""
+        return self._worker_count_source
+
+    def employ(self, number_of_workers=1):
+        """
+        Employs a given number of worker threads for future tasks.
+        """
+        with self._lock:
+            if self._worker_count_max < \
+                    (len(self._worker_threads) + number_of_workers):
+                raise IndexError("Cannot employ so many worker threads.")
+
+            for _ in range(number_of_workers):
+                worker_id = uuid.uuid4()
+                connection = self._transport.connect(worker_id)
+                self._worker_threads.append(
+                    ThreadWorker(worker_id=worker_id, connection=connection))
+
+    def lay_off(self, call_id, reason=None):
+        """
+        Lays off the worker thread that started the call given by id, if any.
+
+        The calls the worker did not start, yet, are kept for other workers.
+
+        :param call_id: ID of the call whose executing worker to lay off.
+        :param reason: Reason for the lay off. (optional)
+        """
+        with self._lock:
+            try:
+                worker_id = self._status_db.get_worker_id(call_id=call_id)
+            except KeyError:
+                # The call was completed or never issued.
+                # So we have nothing to do here.
+                return
+            for worker_thread in self._worker_threads:
+                if worker_thread.worker_id == worker_id:
+                    self._lay_off(worker_thread, reason, orphan=True)
+                    return
+
+    def _lay_off(self, worker_thread, reason, orphan=False):
+        """Lays off the given thread worker for the given reason."""
+        self._worker_threads.remove(worker_thread)
+
+        # makes the thread end as soon as it is done with its current call
+        self._transport.disconnect(worker_thread.worker_id)
+
+        # report the calls the worker will never finish
+        self._status_db.report_layoff(worker_id=worker_thread.worker_id,
+                                      reason=reason, orphan=orphan)
+
+    def abandon(self, reason=None):
+        """
+        Lays off all worker threads.
+        """
+        with self._lock:
+            if reason is None:
+                reason = LayoffError("Releasing all workers.")
+            # copy worker threads so that _lay_off does not modify
+            for worker_thread in self._worker_threads[:]:
+                self._lay_off(worker_thread=worker_thread, reason=reason)
+
+    @property
+    def worker_ids(self):
+        """Returns the ids of the worker threads."""
+        with self._lock:
+            return [worker_thread.worker_id
+                    for worker_thread in self._worker_threads]
+
+    @property
+    def worker_count(self):
+        """Returns the number of currently employed worker threads."""
+        with self._lock:
+            return len(self._worker_threads)
@@ -7,26 +7,151 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
+import math
+import os
+from collections import namedtuple
 from multiprocessing import cpu_count
 
+# environment variable overriding the detected number of CPUs
+ENVIRONMENT_VARIABLE = "METAOPT_WORKERS"
 
-def determine_worker_count(request=None):
+# where the kernel lists the cgroups of this process and mounts their files
+PROC_CGROUP = "/proc/self/cgroup"
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+WorkerCount = namedtuple("WorkerCount", ["count", "source"])
+"""
+Number of workers that can run and where it came from.
+
+The source is one of "request", "environment", "cgroup", "affinity",
+"cpu_count" and "default".
+"""
+
+
+def _read_first(directories, name):
+    """Returns the content of the first file of that name, None if none."""
+    for directory in directories:
+        try:
+            with open(os.path.join(directory, name)) as cgroup_file:
+                return cgroup_file.read().strip()
+        except (IOError, OSError):
+            continue
+    return None
+
+
+def _read_cgroup_quota(controllers, path):
     """
-    Determines the maximum number of worker processes or threads.
+    Returns the CPU quota and period of the given cgroup, None if unlimited.
 
-    If there are more physical or virtual CPUs available on this machine than
-    the number of requested request, the latter is returned.
+    cgroup v2 lists no controllers and has both in cpu.max, cgroup v1 has them
+    in files of their own.
     """
-    if request is None:
+    path = path.lstrip("/")
+    if not controllers:
+        directories = [os.path.join(CGROUP_ROOT, path), CGROUP_ROOT]
+        limits = _read_first(directories, "cpu.max")
+        if limits is None:
+            return None
+        quota, period = limits.split()
+    elif "cpu" in controllers.split(","):
+        directories = [os.path.join(CGROUP_ROOT, controllers, path),
+                       os.path.join(CGROUP_ROOT, controllers),
+                       os.path.join(CGROUP_ROOT, "cpu")]
+        quota = _read_first(directories, "cpu.cfs_quota_us")
+        period = _read_first(directories, "cpu.cfs_period_us")
+    else:
+        return None
+
+    if quota in (None, "max", "-1") or period is None:
+        return None
+    return int(quota), int(period)
+
+
+def _count_cgroup_cpus():
+    """Returns the CPUs the cgroup quota of this process allows, or None."""
+    try:
+        with open(PROC_CGROUP) as proc_file:
+            entries = [line.strip().split(":", 2) for line in proc_file]
+    except (IOError, OSError):
+        # not on Linux
+        return None
+
+    counts = []
+    for entry in entries:
+        if len(entry) != 3:
+            continue
+        try:
+            limits = _read_cgroup_quota(controllers=entry[1], path=entry[2])
+        except ValueError:
+            # unexpected content, so ignore this cgroup
+            continue
+        if limits is not None:
+            quota, period = limits
+            counts.append(max(1, int(math.ceil(quota / period))))
+    return min(counts) if counts else None
+
+
+def _count_cpus():
+    """Returns the CPUs this process may run on and where that came from."""
+    try:
+        # Python 3.3 and later on Linux
+        return WorkerCount(len(os.sched_getaffinity(0)), "affinity")
+    except AttributeError:
+        pass
+
+    try:
+        return WorkerCount(cpu_count(), "cpu_count")
+    except NotImplementedError:
+        # assume single core, to be safe
+        return WorkerCount(1, "default")
+
+
+def _detect_cpus():
+    """Returns the number of CPUs available to this process and its source."""
+    override = os.environ.get(ENVIRONMENT_VARIABLE)
+    if override:
         try:
-            # attempt automatic configuration
-            return cpu_count()
-        except NotImplementedError:
-            # assume single core, to be safe
-            return 1
+            count = int(override)
+        except ValueError:
+            count = 0
+        if count <= 0:
+            raise ValueError("%s needs to be a positive integer, not %r." %
+                             (ENVIRONMENT_VARIABLE, override))
+        return WorkerCount(count, "environment")
+
+    worker_count = _count_cpus()
+    count_cgroup = _count_cgroup_cpus()
+    if count_cgroup is not None and count_cgroup < worker_count.count:
+        return WorkerCount(count_cgroup, "cgroup")
+    return worker_count
+
+
+def detect_worker_count(request=None):
+    """
+    Determines the maximum number of worker processes or threads, and its
+    source.
+
+    Returns the request, if any. Otherwise the environment variable
+    METAOPT_WORKERS, if set. Otherwise the number of CPUs this process may run
+    on, i.e. its CPU affinity, limited by the CPU quota of its cgroup (v1 or
+    v2) as in containers.
+    """
+    if request is None:
+        return _detect_cpus()
     if type(request) is not int:
         raise NotImplementedError("Request parameter needs to be of type int.")
     if request <= 0:
         raise NotImplementedError("Request parameter needs to be greater 0.")
 
-    return request
+    return WorkerCount(request, "request")
+
+
+def determine_worker_count(request=None):
+    """
+    Determines the maximum number of worker processes or threads.
+
+    If there are more physical or virtual CPUs available on this machine than
+    the number of requested request, the latter is returned. See
+    :func:`detect_worker_count` for how the CPUs are counted.
+    """
+    return detect_worker_count(request).count
@@ -12,3 +12,14 @@ class LayoffError(Exception):
 
     def __init__(self, message=None):
         super(LayoffError, self).__init__(message)
+
+
+class NoWorkerError(Exception):
+    """Indicates that there is no worker and none can be employed."""
+
+    def __init__(self, message=None):
+        super(NoWorkerError, self).__init__(message)
+
+
+class MemoryLimitError(LayoffError):
+    """Indicates that a worker got laid off for exceeding its memory limit."""
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Utility to measure the memory of worker processes.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+
+try:
+    # psutil
+    import psutil
+except ImportError:
+    # Without psutil, memory is only measured where /proc is available.
+    psutil = None
+
+try:
+    PAGE_SIZE = os.sysconf(str("SC_PAGE_SIZE"))
+except (AttributeError, ValueError):
+    PAGE_SIZE = 4096
+
+
+def measure_rss(pid):
+    """
+    Returns the resident memory of the given process in bytes.
+
+    Returns None if it can not be measured, e.g. as the process is gone.
+    """
+    try:
+        with open("/proc/%d/statm" % pid) as statm_file:
+            return int(statm_file.read().split()[1]) * PAGE_SIZE
+    except (IOError, OSError, IndexError, ValueError):
+        pass
+
+    if psutil is None:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return None
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Policy placing worker processes on the CPUs of this machine.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+
+try:
+    # threadpoolctl
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    # Without it, the environment variables only limit the thread pools of
+    # libraries loaded after placing the process.
+    threadpool_limits = None
+
+# environment variables sizing the thread pools of OpenMP and BLAS libraries
+THREAD_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                    "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS",
+                    "NUMEXPR_NUM_THREADS")
+
+
+def place_process(cpus=None, threads=None):
+    """
+    Pins this process to the given CPUs and limits its native thread pools.
+
+    Meant to be called in a fresh worker process, before the objective
+    function gets imported. Pinning is skipped where it is not supported.
+    """
+    if threads is not None:
+        for name in THREAD_VARIABLES:
+            os.environ[name] = str(threads)
+        if threadpool_limits is not None:
+            # thread pools of libraries imported by the parent already
+            threadpool_limits(limits=threads)
+
+    if cpus is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+
+class WorkerPlacement(object):
+    """
+    Policy placing worker processes on disjoint sets of CPUs.
+
+    Each worker gets a slot of as many CPUs as threads it may run. It gets
+    pinned to them and the thread pools of OpenMP, OpenBLAS, MKL and the like
+    are limited to that many threads. So the workers together run as many
+    threads as there are CPUs, instead of one thread pool per worker each as
+    large as the machine. Only as many workers fit as there are slots.
+    """
+
+    def __init__(self, threads_per_worker=1, pin=True):
+        """
+        :param threads_per_worker: Number of CPUs and threads of each worker.
+        :param pin: Whether to pin the workers to their CPUs, or to only
+                    limit their threads.
+        """
+        super(WorkerPlacement, self).__init__()
+
+        if type(threads_per_worker) is not int or threads_per_worker <= 0:
+            raise ValueError("threads_per_worker needs to be a positive int.")
+
+        self._threads_per_worker = threads_per_worker
+        self._pin = pin
+
+    @property
+    def threads_per_worker(self):
+        """Property for the number of CPUs and threads of each worker."""
+        return self._threads_per_worker
+
+    def count_workers(self, cpu_count):
+        """Returns the number of workers that fit on the given CPUs."""
+        return max(1, cpu_count // self._threads_per_worker)
+
+    def get_cpus(self, slot, cpu_count):
+        """
+        Returns the CPUs of the given slot, None if not pinning.
+
+        The slots are taken from the first cpu_count CPUs this process may run
+        on. Slots wrap around if there are fewer.
+        """
+        if not self._pin or not hasattr(os, "sched_getaffinity"):
+            return None
+
+        cpus = sorted(os.sched_getaffinity(0))[:cpu_count]
+        start = slot * self._threads_per_worker
+        return set(cpus[(start + offset) % len(cpus)]
+                   for offset in range(self._threads_per_worker))
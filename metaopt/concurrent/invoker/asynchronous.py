@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Invoker that awaits coroutine objective functions on an asyncio event loop.
+
+Requires Python 3.5 or later.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import asyncio
+import inspect
+import itertools
+from collections import deque
+from functools import partial
+from threading import Condition, Lock, RLock, Thread
+
+# First Party
+from metaopt.concurrent.employer.util.exception import LayoffError
+from metaopt.concurrent.invoker.invoker import Invoker
+from metaopt.concurrent.invoker.util.call_callbacks import CallCallbacks
+from metaopt.concurrent.invoker.util.call_handle import CallHandle
+from metaopt.concurrent.model.call_lifecycle import Call, Error, Layoff, \
+    Result
+from metaopt.core.call.call import call as call_function
+from metaopt.core.returnspec.util.wrap_return_values import wrap_return_values
+from metaopt.core.stoppable.util.decorator import stoppable, stopping
+
+
+class AsyncInvoker(Invoker):
+    """
+    Invoker that awaits coroutine objective functions on an asyncio event loop.
+
+    All calls run concurrently on a single event loop, so thousands of calls
+    waiting for I/O, e.g. remote services or simulations, cost next to
+    nothing. The objective function is an ``async def`` function, plain
+    functions are called on the loop directly.
+
+    The optimizer keeps running in its own thread. Outcomes are handed to it
+    in :meth:`wait`, so its callbacks never run concurrently. Stopping a call
+    cancels its task, which raises CancelledError in the objective function.
+    """
+
+    def __init__(self, concurrency=1000, loop=None):
+        """
+        :param concurrency: Number of calls awaited at once at most, the
+                            others wait for their turn.
+        :param loop: Running event loop to await the calls on. Its thread must
+                     not block on the optimization. Runs an event loop in a
+                     thread of our own, if None.
+        """
+        super(AsyncInvoker, self).__init__()
+
+        self._concurrency = concurrency
+
+        if loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = Thread(target=self._run_loop)
+            self._thread.daemon = True
+            self._thread.start()
+        else:
+            self._loop = loop
+            self._thread = None
+
+        # created on the loop, for the loop
+        self._semaphore = None
+
+        # small integers identifying calls
+        self._call_ids = itertools.count()
+
+        # tasks of the calls not done yet, only used on the loop
+        self._tasks = dict()
+
+        # callbacks to call as soon as calls started and with their outcomes,
+        # which get handed over to wait() after them
+        self._callbacks = CallCallbacks(report=self._hand_over)
+
+        # reasons for stopping calls, by call id
+        self._reasons = dict()
+
+        # outcomes reported by the loop, handed to the caller in wait()
+        self._outcomes = deque()
+        self._outcomes_awaited = 0
+
+        # We can not prohibit others to use us in parallel, so make this
+        # invoker thread-safe. Callbacks may invoke again, so be reentrant.
+        self._lock = RLock()
+
+        # lock for the state shared with the loop, only held briefly
+        self._condition = Condition(Lock())
+
+    @property
+    def loop(self):
+        """Property for the event loop awaiting the calls."""
+        return self._loop
+
+    def _run_loop(self):
+        """Runs our own loop till we are stopped."""
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _execute(self, call):
+        """Awaits the given call as soon as there is room for it."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+
+        async with self._semaphore:
+            self._start(call.id)
+
+            # Calling a coroutine function returns its coroutine.
+            value = call_function(f=call.function, fargs=call.args,
+                                  param_spec=call.param_spec).raw_values
+            if inspect.isawaitable(value):
+                value = await value
+            return wrap_return_values(value, call.return_spec)
+
+    def _schedule(self, call):
+        """Creates the task for the given call, on the loop."""
+        if self._stopped:
+            # The call was invoked while we were stopped.
+            # So report it as cancelled right away.
+            self._report(Layoff(worker_id=None, call=call,
+                                value=LayoffError("The invoker was stopped.")))
+            return
+
+        task = self._loop.create_task(self._execute(call))
+        task.add_done_callback(partial(self._done, call))
+        self._tasks[call.id] = task
+
+    def _cancel(self, call_id):
+        """Cancels the task of the given call, on the loop."""
+        try:
+            self._tasks[call_id].cancel()
+        except KeyError:
+            # The call is done already.
+            # So there is nothing to cancel.
+            with self._condition:
+                self._reasons.pop(call_id, None)
+
+    def _cancel_all(self, reason):
+        """Cancels all tasks, on the loop, and stops a loop of our own."""
+        with self._condition:
+            for call_id in self._tasks:
+                self._reasons.setdefault(call_id, reason)
+
+        for task in self._tasks.values():
+            task.cancel()
+        self._stop_loop()
+
+    def _stop_loop(self):
+        """Stops our own loop as soon as its tasks are done, on the loop."""
+        if self._thread is not None and self._stopped and not self._tasks:
+            self._loop.stop()
+
+    def _start(self, call_id):
+        """Calls the start callbacks of the given call, on the loop."""
+        for callback in self._callbacks.start(call_id):
+            callback()
+
+    def _done(self, call, task):
+        """Reports the outcome of the given task, on the loop."""
+        del self._tasks[call.id]
+
+        with self._condition:
+            reason = self._reasons.pop(call.id, None)
+
+        if task.cancelled():
+            if reason is None:
+                reason = LayoffError("The call was cancelled.")
+            outcome = Layoff(worker_id=None, call=call, value=reason)
+        elif task.exception() is not None:
+            outcome = Error(worker_id=None, call=call, value=task.exception())
+        else:
+            outcome = Result(worker_id=None, call=call, value=task.result())
+
+        self._report(outcome)
+        self._stop_loop()
+
+    def _report(self, outcome):
+        """
+        Calls the outcome callbacks of the given outcome, then hands it over
+        to wait(), on the loop.
+        """
+        self._callbacks.complete(outcome)
+        self._callbacks.call_outcome_callbacks()
+
+    def _hand_over(self, outcome):
+        """Hands the given outcome over to wait()."""
+        with self._condition:
+            self._outcomes.append(outcome)
+            self._condition.notify_all()
+
+    def _handle_outcome(self, outcome):
+        """Hands the given outcome over to the caller."""
+        if isinstance(outcome, Result):
+            callback = self._caller.on_result
+        else:
+            callback = self._caller.on_error
+        callback(value=outcome.value, fargs=outcome.call.args,
+                 **(outcome.call.kwargs or dict()))
+
+    @stoppable
+    def invoke(self, caller, fargs, **kwargs):
+        """
+        Invokes call(f, fargs) with the given function and the given arguments.
+
+        Returns right away, the call waits on the loop till there is room.
+        """
+        with self._lock:
+            self._caller = caller
+
+            call = Call(id=next(self._call_ids), function=self._f,
+                        args=fargs, kwargs=kwargs,
+                        param_spec=self._param_spec,
+                        return_spec=self._return_spec)
+            call_handle = CallHandle(invoker=self, call_id=call.id)
+            with self._condition:
+                self._outcomes_awaited += 1
+            self._loop.call_soon_threadsafe(self._schedule, call)
+            return call_handle
+
+    def wait(self):
+        """Blocks till all currently invoked calls were reported."""
+        while True:
+            with self._condition:
+                if self._outcomes_awaited == 0:
+                    return
+                while not self._outcomes:
+                    self._condition.wait()
+                self._outcomes_awaited -= 1
+                outcome = self._outcomes.popleft()
+
+            # The callbacks may invoke again, so do not block the loop.
+            with self._lock:
+                self._handle_outcome(outcome=outcome)
+
+    def add_start_callback(self, call_id, callback):
+        """Calls the given callback as soon as the given call started."""
+        if not self._callbacks.add_start_callback(call_id, callback):
+            callback()
+
+    def add_outcome_callback(self, call_id, callback):
+        """Calls the given callback with the outcome of the given call."""
+        self._callbacks.add_outcome_callback(call_id, callback)
+
+    @stoppable
+    def stop_call(self, call_id, reason):
+        """
+        Stops a call given by its id, by cancelling its task.
+
+        Gets called by a timer in an individual thread.
+        """
+        with self._condition:
+            self._reasons.setdefault(call_id, reason)
+        self._loop.call_soon_threadsafe(self._cancel, call_id)
+
+    @stoppable
+    @stopping
+    def stop(self, reason=None):
+        """
+        Cancels all calls, their layoffs are reported in :meth:`wait`.
+
+        Gets called by a timer in an individual thread.
+        """
+        self._loop.call_soon_threadsafe(self._cancel_all, reason)
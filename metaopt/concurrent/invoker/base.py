@@ -102,6 +102,28 @@ class BaseInvoker(Stoppable):
         """
         pass
 
+    @stoppable
+    def invoke_many(self, caller, fargs_list, kwargs_list=None):
+        """
+        Invoke an objective function with each of the given arguments.
+
+        Behaves like calling :meth:`invoke` for each element of `fargs_list`,
+        passing the corresponding element of `kwargs_list` as keyword
+        arguments. Implementations may override this method for submitting a
+        whole batch of calls at once.
+
+        :param caller: Caller
+        :param fargs_list: List of arguments `f` should be applied to
+        :param kwargs_list: List of additional data arguments (optional)
+
+        :rtype: List of TaskHandles, one for each of the given arguments.
+        """
+        if kwargs_list is None:
+            kwargs_list = [dict() for _ in fargs_list]
+
+        return [self.invoke(caller, fargs, **kwargs)
+                for fargs, kwargs in zip(fargs_list, kwargs_list)]
+
     @abc.abstractmethod
     def wait(self):
         """
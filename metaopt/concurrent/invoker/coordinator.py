@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Invoker that invokes objective functions on worker nodes of several machines.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# First Party
+from metaopt.concurrent.employer.node import NodeWorkerEmployer
+from metaopt.concurrent.invoker.multiprocess import MultiProcessInvoker
+from metaopt.concurrent.transport.tcp import TCPTransport
+
+
+class CoordinatorInvoker(MultiProcessInvoker):
+    """
+    Invoker that invokes objective functions on worker nodes of several
+    machines.
+
+    Listens for worker nodes, which are started by ``metaopt worker --connect
+    HOST:PORT`` on each machine. Nodes authenticate by a key shared with us
+    and may join at any time. Each of them runs as many worker processes as
+    it has capacity for. Calls wait till a node joins.
+
+    The calls of a node that hangs up or stops sending heartbeats get issued
+    to the workers of the remaining nodes. The objective function and its
+    arguments must be importable and picklable on all nodes.
+    """
+
+    def __init__(self, address=("localhost", 0), authkey=None, prefetch=None,
+                 heartbeat_timeout=None):
+        """
+        :param  address: Host and port to listen on for nodes. Listens on an
+                         arbitrary free port of the local host, by default.
+        :param  authkey: Key shared with the nodes. Defaults to the value of
+                         the environment variable METAOPT_AUTHKEY.
+        :param  prefetch: Number of tasks issued to each worker at most,
+                          including the one it executes. Will automatically
+                          configure itself by the duration of calls, if None.
+        :param  heartbeat_timeout: Seconds of silence after which a node is
+                                   considered lost.
+        """
+        # used for creating the transport in the constructor of our parent
+        self._address = address
+        self._authkey = authkey
+        self._heartbeat_timeout = heartbeat_timeout
+
+        super(CoordinatorInvoker, self).__init__(prefetch=prefetch)
+
+    @property
+    def address(self):
+        """Property for the host and port nodes connect to."""
+        return self._transport.address
+
+    @property
+    def worker_count_max(self):
+        """Returns the number of workers all nodes have capacity for."""
+        return self._employer.worker_count_max
+
+    def _check_workers(self):
+        """Does nothing, as calls wait till a node offers workers."""
+
+    def _create_transport(self):
+        """Returns the transport the nodes connect to."""
+        return TCPTransport(address=self._address, authkey=self._authkey,
+                            heartbeat_timeout=self._heartbeat_timeout)
+
+    def _create_employer(self, resources, initializer, initargs):
+        """Returns the employer of the workers the nodes offer."""
+        del resources, initializer, initargs
+        return NodeWorkerEmployer(transport=self._transport,
+                                  status_db=self._status_db)
+
+    def _share_param_spec(self):
+        """Returns the parameter specification, nodes can not map our files."""
+        return self._param_spec
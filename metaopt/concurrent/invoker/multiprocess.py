@@ -7,71 +7,219 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
-import uuid
-from multiprocessing import Manager
-from threading import Lock
+import itertools
+import math
+from copy import copy
+from threading import Event, Lock, RLock, Thread, Timer, current_thread
 
 # First Party
 from metaopt.concurrent.employer.process import ProcessWorkerEmployer
+from metaopt.concurrent.employer.util.exception import MemoryLimitError, \
+    NoWorkerError
 from metaopt.concurrent.invoker.invoker import Invoker
 from metaopt.concurrent.invoker.util.call_handle import CallHandle
+from metaopt.concurrent.invoker.util.call_queue import CallQueue
 from metaopt.concurrent.invoker.util.determine_package import determine_package
+from metaopt.concurrent.invoker.util.shared_arrays import SharedArrays
+from metaopt.concurrent.invoker.util.split_batch_outcome import \
+    split_batch_outcome
 from metaopt.concurrent.invoker.util.status_db import StatusDB
 from metaopt.concurrent.model.call_lifecycle import Call, Error, Layoff, \
     Result, Task
+from metaopt.concurrent.transport.pipe import PipeTransport
+from metaopt.core.call.util.batch import BatchArgs, is_batch
 from metaopt.core.stoppable.util.decorator import stoppable, stopping
 from metaopt.core.stoppable.util.exception import StoppedError
 
 
-try:
-    xrange  # will work in python2, only @UndefinedVariable
-except NameError:
-    xrange = range  # rename range to xrange in python3
-
-
 class MultiProcessInvoker(Invoker):
     """
     Invoker that invokes objective functions in parallel using processes.
+
+    Tasks are issued to the workers ahead of time, so that each worker finds
+    its next task waiting as soon as it finished the current one.
     """
 
-    def __init__(self, resources=None):
+    # bounds for the number of tasks issued to a worker at once
+    PREFETCH_MIN = 2
+    PREFETCH_MAX = 16
+
+    # seconds of work to keep issued to each worker when tuning the prefetch
+    PREFETCH_SECONDS = 0.01
+
+    # bound for the number of tasks issued to a worker in one message and
+    # the seconds of work to issue at once when tuning it
+    CHUNK_MAX = 8
+    CHUNK_SECONDS = 0.002
+
+    # seconds a worker gets for aborting a stopped call before it is replaced
+    GRACE_PERIOD = 1.0
+
+    # seconds between samples of the memory of the workers
+    MEMORY_INTERVAL = 0.1
+
+    def __init__(self, resources=None, prefetch=None, pool=None,
+                 initializer=None, initargs=(), grace_period=None,
+                 placement=None, memory_limit=None, memory_interval=None,
+                 chunk=None, duration_model=None, aging=CallQueue.AGING):
         """
         :param  resources: Number of CPUs to use at most. Will automatically
                            configure itself, if None.
+        :param  prefetch: Number of tasks issued to each worker at most,
+                          including the one it executes. Will automatically
+                          configure itself by the duration of calls, if None.
+        :param  pool: Worker pool to use instead of employing workers of our
+                      own. The pool is kept alive on stop. Overrides resources,
+                      the initializer and the placement.
+        :param  initializer: Function each worker process calls once before
+                             any call. Its return value becomes the context
+                             the objective function gets by get_context().
+        :param  initargs: Arguments to call the initializer with.
+        :param  grace_period: Seconds a worker gets for aborting a stopped
+                              call, before it is terminated and replaced.
+                              Terminates workers right away, if 0.
+        :param  placement: WorkerPlacement pinning the worker processes to
+                           disjoint CPUs and limiting their native threads.
+        :param  memory_limit: Bytes of resident memory each worker may use.
+                              Workers exceeding it get replaced, their
+                              running call fails with MemoryLimitError.
+        :param  memory_interval: Seconds between samples of the memory of the
+                                 workers. Samples only if given or if there is
+                                 a memory limit.
+        :param  chunk: Number of tasks issued to a worker in one message, as
+                       soon as it has room for them. Will automatically
+                       configure itself by the duration of calls, if None.
+        :param  duration_model: DurationModel learning the durations of calls
+                                from their args. If given, invoke_many issues
+                                the calls longest predicted first.
+        :param  aging: Seconds a call waits for a worker with room that count
+                       as one level of priority more, so that urgent calls
+                       do not starve the others. Never ages calls, if None.
         """
         super(MultiProcessInvoker, self).__init__()
 
-        # managed queues common to all worker processes
-        self._manager = Manager()
-        queue_task = self._manager.Queue(maxsize=1)
-        queue_start = self._manager.Queue()
-        queue_outcome = self._manager.Queue()
+        self._grace_period = self.GRACE_PERIOD if grace_period is None \
+            else grace_period
+
+        # timers restarting workers that did not abort their calls in time
+        self._timers_cancel = set()
 
-        # TODO don't
-        self._clean_workers = 0
-        self._queue_task = queue_task
-        self._queue_start = queue_start
-        self._queue_outcome = queue_outcome
+        self._pool = pool
+        self._placement = placement
+
+        if pool is None:
+            self._transport = self._create_transport()
+            self._status_db = StatusDB(transport=self._transport)
+            self._employer = self._create_employer(resources=resources,
+                                                   initializer=initializer,
+                                                   initargs=initargs)
+        else:
+            # Take over the pool first, another invoker may be using it.
+            # Only one status database at a time may receive from it.
+            self._employer = pool.attach()
+            self._transport = pool.transport
+            self._status_db = StatusDB(transport=self._transport)
+            self._employer.status_db = self._status_db
 
-        self._status_db = StatusDB(queue_task=queue_task,
-                                   queue_start=queue_start,
-                                   queue_outcome=queue_outcome)
+        self._prefetch = prefetch
+        self._chunk = chunk
+        self._duration_model = duration_model
 
-        self._employer = ProcessWorkerEmployer(resources=resources,
-                                    queue_outcome=queue_outcome,
-                                    queue_start=queue_start,
-                                    queue_tasks=queue_task,
-                                    status_db=self._status_db)
+        # calls waiting for a worker with room, by priority
+        self._queue = CallQueue(aging=aging)
 
-        # we can not prohibit others to use us in parallel, so
-        # make this invoker thread-safe
-        self._lock = Lock()
+        # small integers identifying calls, cheaper to send than UUIDs
+        self._call_ids = itertools.count()
+
+        # We can not prohibit others to use us in parallel, so make this
+        # invoker thread-safe. Callbacks may invoke again, so be reentrant.
+        self._lock = RLock()
+
+        # lock for issuing tasks to workers, also used by timer threads
+        self._lock_dispatch = Lock()
 
         # set by the pluggable invoker or another caller
         self._f = None  # objective function
         self._param_spec = None  # parameter specification
         self._return_spec = None  # return specification
 
+        # NumPy arrays of the extra arguments, mapped into the workers' memory
+        # and the parameter specification referring to them, by the original
+        self._shared_arrays = SharedArrays()
+        self._param_spec_shared = (None, None)
+
+        # thread sampling the memory of the workers, if any
+        self._memory_limit = memory_limit
+        self._memory_interval = memory_interval or self.MEMORY_INTERVAL
+        self._memory_stop = Event()
+        self._memory_thread = None
+        if memory_limit is not None or memory_interval is not None:
+            self._memory_thread = Thread(target=self._monitor_memory)
+            self._memory_thread.daemon = True
+            self._memory_thread.start()
+
+    def _create_transport(self):
+        """Returns the transport connecting us to our workers."""
+        # pipes connecting us to each worker process directly
+        return PipeTransport()
+
+    def _create_employer(self, resources, initializer, initargs):
+        """Returns the employer of our workers."""
+        return ProcessWorkerEmployer(resources=resources,
+                                     transport=self._transport,
+                                     status_db=self._status_db,
+                                     initializer=initializer,
+                                     initargs=initargs,
+                                     placement=self._placement)
+
+    @property
+    def prefetch(self):
+        """Number of tasks issued to each worker at most."""
+        if self._prefetch is not None:
+            return self._prefetch
+
+        duration = self._status_db.duration_mean
+        if not duration:
+            return self.PREFETCH_MIN
+        prefetch = 1 + int(self.PREFETCH_SECONDS / duration)
+        return max(self.PREFETCH_MIN, min(self.PREFETCH_MAX, prefetch))
+
+    @property
+    def queue_stats(self):
+        """
+        Returns the PriorityStats of the calls of each priority, by priority.
+
+        These count the calls waiting for a worker and those issued so far,
+        and tell how long the issued ones waited.
+        """
+        return self._queue.stats
+
+    @property
+    def duration_model(self):
+        """Model predicting the durations of calls, None if not scheduling."""
+        return self._duration_model
+
+    @property
+    def chunk(self):
+        """
+        Number of tasks issued to a worker in one message.
+
+        Fast calls get issued in chunks, so that they take less round trips.
+        The workers report them in chunks, too. Slow calls get issued one by
+        one.
+        """
+        if self._chunk is not None:
+            return self._chunk
+
+        duration = self._status_db.duration_mean
+        if not duration:
+            return 1
+        chunk = int(self.CHUNK_SECONDS / duration)
+        if self._prefetch is not None:
+            # leave room for the next chunk while executing this one
+            chunk = min(chunk, self._prefetch // 2)
+        return max(1, min(self.CHUNK_MAX, chunk))
+
     def _handle_error(self, error):
         """"""
         assert isinstance(error, Error)
@@ -108,8 +256,40 @@ class MultiProcessInvoker(Invoker):
             # Nothing to do here.
             return
 
+    def _record_durations(self, outcome, outcomes):
+        """
+        Records the duration of the call of the given outcome in the duration
+        model, for the args of each of the given outcomes split off it. The
+        candidates of a batch get an even share of its duration each.
+        """
+        if self._duration_model is None or \
+                not isinstance(outcome, (Error, Result)):
+            return
+        duration = self._status_db.get_duration(call_id=outcome.call.id)
+        if duration is None:
+            return
+        for outcome_single in outcomes:
+            self._duration_model.record(outcome_single.call.args,
+                                        duration / len(outcomes))
+
     def _handle_outcome(self, outcome):
-        """"""
+        """
+        Calls back to the caller for the given outcome, once per candidate
+        for the outcome of a batch call. Records the duration of its call
+        first.
+        """
+        if isinstance(getattr(outcome.call, "args", None), BatchArgs):
+            # the caller expects an outcome for each candidate of a batch
+            outcomes = split_batch_outcome(outcome)
+        else:
+            outcomes = [outcome]
+        self._record_durations(outcome, outcomes)
+
+        for outcome in outcomes:
+            self._call_back(outcome)
+
+    def _call_back(self, outcome):
+        """Calls back to the caller for the given outcome of a single call."""
         if isinstance(outcome, Error):
             self._handle_error(error=outcome)
         elif isinstance(outcome, Result):
@@ -121,8 +301,177 @@ class MultiProcessInvoker(Invoker):
             raise ValueError("Objects of this type are not allowed in the " +
                              "outcome queue: %s" % type(outcome))
 
+    def _find_worker(self, counts, prefetch, chunk=1):
+        """
+        Returns the id of the worker to issue the next tasks to, if any.
+
+        Prefers idle workers, then employs new ones, then queues the tasks at
+        the least busy worker, as long as it has room for a chunk of them
+        before reaching the number of tasks to prefetch.
+
+        :param counts: Numbers of tasks issued to each worker by worker id,
+                       gets updated for newly employed workers.
+        :param prefetch: Number of tasks issued to each worker at most.
+        :param chunk: Number of tasks to issue at once.
+        """
+        worker_id = min(counts, key=counts.get) if counts else None
+        if worker_id is not None and counts[worker_id] == 0:
+            return worker_id
+
+        try:
+            # employ one new worker
+            self._employer.employ()
+        except IndexError:
+            # The worker process provider was at its worker limit.
+            # So no new worker could be employed.
+            pass
+        else:
+            for worker_id_new in self._employer.worker_ids:
+                if worker_id_new not in counts:
+                    counts[worker_id_new] = 0
+                    return worker_id_new
+
+        if worker_id is not None and counts[worker_id] + chunk <= prefetch:
+            return worker_id
+        return None
+
+    def _issue(self, calls=(), priorities=None):
+        """
+        Queues the given calls by priority and issues orphaned calls, then
+        queued calls by priority, to workers with room.
+
+        Each worker gets a chunk of calls at once.
+        """
+        with self._lock_dispatch:
+            if self._stopped:
+                raise StoppedError()
+            self._queue.push(calls, priorities)
+
+            calls_orphaned = self._status_db.get_orphaned_calls()
+            count_all = len(calls_orphaned) + len(self._queue)
+
+            counts = dict((worker_id, self._status_db.count_tasks(worker_id))
+                          for worker_id in self._employer.worker_ids)
+            prefetch = self.prefetch
+            # do not hold back fewer calls than a chunk, e.g. single invokes
+            chunk = max(1, min(self.chunk, prefetch, count_all))
+            tasks = []
+            while len(tasks) < count_all:
+                worker_id = self._find_worker(counts, prefetch, chunk)
+                if worker_id is None:
+                    break
+                count = max(1, min(chunk, prefetch - counts[worker_id]))
+                calls_chunk = calls_orphaned[:count]
+                calls_orphaned = calls_orphaned[count:]
+                calls_chunk.extend(self._queue.pop(count - len(calls_chunk)))
+                if not calls_chunk:
+                    break
+                tasks.extend(Task(worker_id=worker_id, call=call)
+                             for call in calls_chunk)
+                counts[worker_id] += len(calls_chunk)
+
+            self._status_db.issue_tasks(tasks)
+
+    def _share_param_spec(self):
+        """
+        Returns the parameter specification with the arrays of its extra
+        arguments shared with the workers instead of copied. Shares arrays
+        changed in place again.
+        """
+        key, param_spec_shared = self._param_spec_shared
+        param_spec = self._param_spec
+        extra_kwargs = getattr(param_spec, "extra_kwargs", None)
+        if key is None or key[0] is not param_spec or \
+                key[1] is not extra_kwargs or \
+                self._shared_arrays.changed(extra_kwargs):
+            param_spec_shared = copy(param_spec)
+            if param_spec is not None:
+                param_spec_shared.extra_kwargs = \
+                    self._shared_arrays.share(extra_kwargs)
+            self._param_spec_shared = ((param_spec, extra_kwargs),
+                                       param_spec_shared)
+        return param_spec_shared
+
+    def _create_call(self, fargs, kwargs, param_spec):
+        """
+        Returns a new call of the objective function for the arguments, with
+        the given shared parameter specification.
+        """
+        return Call(id=next(self._call_ids), function=self._f, args=fargs,
+                    kwargs=kwargs, param_spec=param_spec,
+                    return_spec=self.return_spec)
+
+    def _create_batch_calls(self, fargs_list, kwargs_list, param_spec):
+        """
+        Returns calls of the batch function for chunks of the arguments, as
+        many as workers can run at once, with the given shared parameter
+        specification.
+        """
+        count = max(1, self._employer.worker_count_max)
+        size = max(1, int(math.ceil(len(fargs_list) / count)))
+        return [Call(id=next(self._call_ids), function=self._f,
+                     args=BatchArgs(fargs_list[start:start + size]),
+                     kwargs=kwargs_list[start:start + size],
+                     param_spec=param_spec,
+                     return_spec=self.return_spec)
+                for start in range(0, len(fargs_list), size)]
+
+    def _order_longest_first(self, calls, call_handles):
+        """
+        Returns the indices of the given calls ordered by their predicted
+        durations, longest first, so that no long call starts last. Calls of
+        unknown duration come last, in their order. Notes the predictions in
+        the call handles.
+        """
+        durations = self._duration_model.predict_many(
+            [call.args for call in calls])
+        for call_handle, duration in zip(call_handles, durations):
+            call_handle.duration_predicted = duration
+
+        return sorted(range(len(calls)), key=lambda index: (
+            durations[index] is None, -(durations[index] or 0)))
+
+    def _check_workers(self):
+        """
+        Raises NoWorkerError if there is no worker to issue calls to, as they
+        would wait forever. Issuing employs one, if there is room.
+        """
+        if not self._employer.worker_ids:
+            raise NoWorkerError("No worker process could be employed. "
+                                "Other employers use all CPUs.")
+
+    def _invoke_calls(self, calls, priorities=None):
+        """
+        Queues the given calls by priority, handling outcomes till all of them
+        got issued.
+
+        Holds the lock only for queueing them, not while waiting for room. So
+        the calls of concurrent callers wait in the queue together, by
+        priority.
+        """
+        call_ids = set(call.id for call in calls)
+        try:
+            with self._lock:
+                self._issue(calls, priorities)
+            while True:
+                call_ids = self._queue.queued(call_ids)
+                if not call_ids:
+                    break
+                self._check_workers()
+
+                # All workers have as many tasks as to prefetch.
+                # So wait for room by getting and handling an outcome.
+                outcome = self._status_db.wait_for_one_outcome()
+                if outcome is not None:
+                    with self._lock:
+                        self._handle_outcome(outcome)
+                self._issue()
+        finally:
+            # the caller gets no call handles for calls left, so drop them
+            self._queue.discard(call_ids)
+
     @stoppable
-    def invoke(self, caller, fargs, **kwargs):
+    def invoke(self, caller, fargs, priority=0, **kwargs):
         """
         Invokes call(f, fargs) with the given function and the given arguments.
 
@@ -130,82 +479,182 @@ class MultiProcessInvoker(Invoker):
         Calls back to self._caller.on_error() for unsuccessful calls.
         Can be called asynchronously, but will block if the call can not be
         executed immediately, especially when using multiple processes/threads.
+
+        Returns as soon as the task was issued to a worker, without waiting
+        for the worker to start it. Calls of higher priority get issued
+        before waiting calls of lower priority.
         """
         with self._lock:
             self._caller = caller
 
-            # employ one new worker
-            if self._clean_workers <= 0:
-                try:
-                    self._employer.employ()
-                except IndexError:
-                    # The worker process provider was at its worker limit, already.
-                    # So no new worker could be employed.
-                    # We can not assume this invoke's task will be started immediately.
-                    # So wait for a free worker by getting and handling an outcome.
-                    outcome = self._status_db.wait_for_one_outcome()
-                    self._handle_outcome(outcome)
-
-            # issue task, the first worker to become idle will execute it
-            call = Call(id=uuid.uuid4(),
-                        function=self._f, args=fargs,
-                        kwargs=kwargs,
-                        param_spec=self._param_spec,
-                        return_spec=self.return_spec)
-            task = Task(call=call)
+            call = self._create_call(fargs, kwargs, self._share_param_spec())
+            call_handle = CallHandle(invoker=self, call_id=call.id)
+            if self._duration_model is not None:
+                call_handle.duration_predicted = \
+                    self._duration_model.predict(fargs)
+        self._invoke_calls([call], [priority])
+        return call_handle
 
-            try:
-                self._status_db.issue_task(task)
-                self._clean_workers -= 1
-            except StoppedError:
-                # The status database was already stopped.
-                # This means we are stopped, too.
-                # So abort this invoke.
-                raise StoppedError()
+    @stoppable
+    def invoke_many(self, caller, fargs_list, kwargs_list=None,
+                    priorities=None):
+        """
+        Invokes call(f, fargs) for each of the given arguments at once.
 
-            # wait for any worker to start working on the task
-            # there is always only one task in the queue
-            # so the task that gets started is the one we just issued
-            try:
-                _ = self._status_db.wait_for_one_start()
-            except EOFError:
-                # All workers were stopped before this task was started.
-                # That is OK, just return a regular task handle anyway.
-                pass
+        Issues as many tasks as the workers have room for in one go, by the
+        given priorities of the calls. Batch functions get called for chunks
+        of the arguments instead, one per worker, by the highest priority of
+        their candidates. Stopping the call handle of one of their candidates
+        stops the whole chunk.
+        """
+        if kwargs_list is None:
+            kwargs_list = [dict() for _ in fargs_list]
+        if priorities is None:
+            priorities = [0] * len(fargs_list)
 
-            if self._stopped:
-                raise StoppedError()
+        with self._lock:
+            self._caller = caller
 
-            return CallHandle(invoker=self, call_id=call.id)
+            # the arrays get checked for changes once for all calls
+            param_spec = self._share_param_spec()
+            if is_batch(self._f):
+                calls = self._create_batch_calls(fargs_list, kwargs_list,
+                                                 param_spec)
+                call_handles = [CallHandle(invoker=self, call_id=call.id,
+                                           index=index)
+                                for call in calls
+                                for index in range(len(call.args))]
+                priorities_batch = []
+                for call in calls:
+                    priorities_batch.append(max(priorities[:len(call.args)]))
+                    priorities = priorities[len(call.args):]
+                priorities = priorities_batch
+            else:
+                calls = [self._create_call(fargs, kwargs, param_spec)
+                         for fargs, kwargs in zip(fargs_list, kwargs_list)]
+                call_handles = [CallHandle(invoker=self, call_id=call.id)
+                                for call in calls]
+                if self._duration_model is not None:
+                    # longest first within each priority, as the queue is
+                    # stable
+                    order = self._order_longest_first(calls, call_handles)
+                    calls = [calls[index] for index in order]
+                    priorities = [priorities[index] for index in order]
+        self._invoke_calls(calls, priorities)
+        return call_handles
 
     def wait(self):
         """Blocks till all currently invoked tasks terminate."""
         while self._status_db.outcomes_awaited > 0:
             # we are still expecting another outcome
             try:
+                # issue calls of laid off workers to the remaining ones
+                self._issue()
                 outcome = self._status_db.wait_for_one_outcome()
-            except IOError as e:
+            except StoppedError:
                 # This invoker was stopped via self.stop()
-                # All workers were killed and the queue closed.
+                # All workers were killed and their layoffs are handled there.
                 # We will never get the expected outcome.
                 # That is OK, just do nothing.
-                print(e)
                 return
+            if outcome is None:
+                # New workers became available for the orphaned calls.
+                continue
             with self._lock:
                 self._handle_outcome(outcome=outcome)
 
-        #self._stop_workers(reason="wait")
-        self._clean_workers = self._employer.worker_count_max
+    def add_start_callback(self, call_id, callback):
+        """Calls the given callback as soon as the given call started."""
+        self._status_db.add_start_callback(call_id=call_id, callback=callback)
+
+    def add_outcome_callback(self, call_id, callback):
+        """Calls the given callback with the outcome of the given call."""
+        self._status_db.add_outcome_callback(call_id=call_id,
+                                             callback=callback)
 
+    @stoppable
     def stop_call(self, call_id, reason):
         """
-        Stop a call given by its id, by restarting the executing worker.
+        Stop a call given by its id, by aborting it in the executing worker.
 
-        Gets called by a timer in an individual thread.
+        Calls that were not started yet get cancelled without bothering any
+        worker. Workers that do not abort the call within the grace period
+        get restarted. Gets called by a timer in an individual thread.
         """
 
         assert call_id is not None
-        self._employer.lay_off(call_id=call_id, reason=reason)
+        with self._lock_dispatch:
+            if self._status_db.cancel_idle_call(call_id=call_id,
+                                                reason=reason):
+                return
+
+            if self._grace_period > 0:
+                worker_id = self._employer.cancel(call_id=call_id,
+                                                  reason=reason)
+                if worker_id is not None:
+                    timer = Timer(self._grace_period, self._enforce_cancel,
+                                  kwargs=dict(worker_id=worker_id,
+                                              call_id=call_id,
+                                              reason=reason))
+                    timer.daemon = True
+                    self._timers_cancel.add(timer)
+                    timer.start()
+                    return
+
+            self._employer.lay_off(call_id=call_id, reason=reason)
+            self._replace_worker()
+
+        # issue the tasks the laid off worker did not start to the others
+        self._reissue()
+
+    def _enforce_cancel(self, worker_id, call_id, reason):
+        """Restarts the given worker, if it did not abort the given call."""
+        with self._lock_dispatch:
+            self._timers_cancel.discard(current_thread())
+            if self._stopped or \
+                    not self._status_db.is_cancelling(call_id=call_id):
+                # The worker aborted the call in time.
+                return
+
+            self._employer.lay_off_worker(worker_id=worker_id, reason=reason,
+                                          orphan=True)
+            self._replace_worker()
+
+        self._reissue()
+
+    def _monitor_memory(self):
+        """Samples the memory of the workers, enforcing the limit."""
+        while not self._memory_stop.wait(self._memory_interval):
+            for worker_id, rss in self._employer.measure_memory().items():
+                self._status_db.report_memory(worker_id=worker_id, rss=rss)
+                if self._memory_limit is not None and \
+                        rss > self._memory_limit:
+                    self._enforce_memory_limit(worker_id=worker_id, rss=rss)
+
+    def _enforce_memory_limit(self, worker_id, rss):
+        """Replaces the given worker, which exceeded the memory limit."""
+        reason = MemoryLimitError("The worker used %d bytes of memory, more "
+                                  "than the limit of %d bytes." %
+                                  (rss, self._memory_limit))
+        with self._lock_dispatch:
+            if self._stopped:
+                return
+
+            self._employer.lay_off_worker(worker_id=worker_id, reason=reason,
+                                          orphan=True)
+            self._replace_worker()
+
+        self._reissue()
+
+    def get_memory_peak(self, call_id):
+        """
+        Returns the peak resident memory sampled while executing the given
+        call, in bytes. Returns None if the memory was not sampled.
+        """
+        return self._status_db.get_memory_peak(call_id=call_id)
+
+    def _replace_worker(self):
+        """Employs a worker in place of a laid off one."""
         try:
             self._employer.employ(number_of_workers=1)
         except IndexError:
@@ -214,6 +663,15 @@ class MultiProcessInvoker(Invoker):
             # That is OK, moving on.
             pass
 
+    def _reissue(self):
+        """Issues the calls of laid off workers to the others."""
+        try:
+            self._issue()
+        except StoppedError:
+            # The invoker was stopped meanwhile, this reported all calls.
+            # Nothing to do here.
+            pass
+
     @stoppable
     @stopping
     def stop(self, reason=None):
@@ -222,30 +680,36 @@ class MultiProcessInvoker(Invoker):
 
         Gets called by a timer in an individual thread.
         """
-        self._stop_workers(reason=reason)
+        self._memory_stop.set()
+
+        # terminate all (busy) workers, this reports their calls as laid off
+        with self._lock_dispatch:
+            for timer in self._timers_cancel:
+                timer.cancel()
+            self._timers_cancel.clear()
 
+            # calls waiting for room will not be issued anymore
+            self._queue.clear()
+
+            if self._pool is None:
+                self._employer.abandon(reason=reason)
+            else:
+                self._pool.detach(reason=reason)
+
+        # let waiting invokes and waits return
         self._status_db.stop(reason=reason)
 
-        self._stop_manager()
+        # report the outcomes nobody waits for anymore
+        with self._lock:
+            for outcome in self._status_db.flush_outcomes():
+                self._handle_outcome(outcome=outcome)
 
-    def _stop_manager(self):
-        try:
-            self._manager.shutdown()
-        except OSError:
-            # The manager has already shutdown.
-            # This may happen when all it's queue got closed.
-            # That is OK since we wanted to shut it down anyway.
-            pass
+        if self._pool is None:
+            self._transport.close()
+
+        if self._memory_thread is not None and \
+                self._memory_thread is not current_thread():
+            self._memory_thread.join()
 
-    def _stop_workers(self, reason):
-        # terminate all workers and handle their lay_off outcomes
-        count_workers_killed = self._employer.worker_count
-        self._employer.abandon()
-        for _ in xrange(count_workers_killed - 1):
-            outcome = self._status_db.wait_for_one_outcome()
-            self._handle_outcome(outcome=outcome)
-        #self._employer = ProcessWorkerEmployer(resources=self._resources,
-        #                                       queue_outcome=self._queue_outcome,
-        #                                       queue_start=self._queue_start,
-        #                                       queue_tasks=self._queue_task,
-        #                                       status_db=self._status_db)
+        # workers that mapped the arrays keep them till they terminate
+        self._shared_arrays.close()
@@ -5,6 +5,9 @@
 from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
+# Standard Library
+from threading import Lock
+
 # First Party
 from metaopt.concurrent.invoker.base import BaseInvoker
 from metaopt.core.stoppable.util.decorator import stoppable, stopping
@@ -30,6 +33,12 @@ class PluggableInvoker(BaseInvoker, BaseCaller):
 
         self._caller = None
 
+        # Outcomes held back till the plugins got the task of their
+        # invocation, as lists by the ids of the invocations being invoked.
+        # Other invokers may call back before they return the task.
+        self._outcomes_held = dict()
+        self._lock = Lock()
+
     @property
     def f(self):
         return self._invoker.f
@@ -59,11 +68,57 @@ class PluggableInvoker(BaseInvoker, BaseCaller):
         """Property for the invoker attribute."""
         return self._invoker
 
+    def _hold_outcomes(self, invocations):
+        """Holds back the outcomes of the given invocations till released."""
+        with self._lock:
+            for invocation in invocations:
+                self._outcomes_held[id(invocation)] = []
+
+    def _hold_outcome(self, on_outcome, invocation, **kwargs):
+        """
+        Holds back the outcome given by the callback to call with it, if the
+        given invocation is being invoked. Returns whether it was held back.
+        """
+        with self._lock:
+            outcomes = self._outcomes_held.get(id(invocation))
+            if outcomes is None:
+                return False
+            outcomes.append((on_outcome, dict(kwargs, invocation=invocation)))
+            return True
+
+    def _release_outcomes(self, invocation):
+        """Hands the outcomes held back for the given invocation over."""
+        with self._lock:
+            outcomes = self._outcomes_held.pop(id(invocation), [])
+        for on_outcome, kwargs in outcomes:
+            on_outcome(**kwargs)
+
+    def _hand_over(self, invocation, task):
+        """
+        Hands the given task of the given invocation over to the plugins,
+        before any outcome of it.
+        """
+        invocation.current_task = task
+
+        # Invokers calling back before they return may not give a task.
+        if task is not None:
+            for plugin in self._plugins:
+                plugin.on_invoke(invocation)
+
+        self._release_outcomes(invocation)
+
     @stoppable
-    def invoke(self, caller, fargs, invocation=None, **kwargs):
-        """Implementation of the inherited abstract invoke method."""
+    def invoke(self, caller, fargs, invocation=None, priority=None, **kwargs):
+        """
+        Implementation of the inherited abstract invoke method.
+
+        Passes a given priority on to invokers supporting priorities.
+        """
         self._caller = caller
 
+        # only pass what the other invoker knows
+        options = dict() if priority is None else dict(priority=priority)
+
         if invocation is None:
             invocation = Invocation()
 
@@ -79,24 +134,75 @@ class PluggableInvoker(BaseInvoker, BaseCaller):
 
         invocation.tries += 1
 
+        self._hold_outcomes([invocation])
         try:
-            invocation.current_task = \
-                self._invoker.invoke(caller=self, fargs=fargs,
-                                     invocation=invocation)
+            task = self._invoker.invoke(caller=self, fargs=fargs,
+                                        invocation=invocation, **options)
         except StoppedError:
             return invocation.current_task
+        else:
+            self._hand_over(invocation, task)
+            return task
+        finally:
+            # the outcomes of calls failing to be invoked, if any
+            self._release_outcomes(invocation)
 
-        # FIXME: This should not be required somehow
-        if not invocation.current_task:
-            return
+    @stoppable
+    def invoke_many(self, caller, fargs_list, kwargs_list=None,
+                    priorities=None):
+        """
+        Implementation of the inherited invoke_many method.
 
-        for plugin in self._plugins:
-            plugin.on_invoke(invocation)
+        Passes given priorities on to invokers supporting priorities.
+        """
+        self._caller = caller
+
+        # only pass what the other invoker knows
+        options = dict() if priorities is None else \
+            dict(priorities=priorities)
+
+        if kwargs_list is None:
+            kwargs_list = [dict() for _ in fargs_list]
+
+        invocations = []
+        for fargs, kwargs in zip(fargs_list, kwargs_list):
+            invocation = Invocation()
+
+            invocation.function = self.f
+            invocation.fargs = fargs
+            invocation.kwargs = kwargs
+
+            for plugin in self._plugins:
+                plugin.setup(self.f, self.param_spec, self.return_spec)
+
+            for plugin in self._plugins:
+                plugin.before_invoke(invocation)
+
+            invocation.tries += 1
+            invocations.append(invocation)
 
-        return invocation.current_task
+        self._hold_outcomes(invocations)
+        try:
+            tasks = self._invoker.invoke_many(
+                caller=self, fargs_list=fargs_list,
+                kwargs_list=[dict(invocation=invocation)
+                             for invocation in invocations], **options)
+        except StoppedError:
+            return [invocation.current_task for invocation in invocations]
+        else:
+            for invocation, task in zip(invocations, tasks):
+                self._hand_over(invocation, task)
+            return tasks
+        finally:
+            # the outcomes of calls failing to be invoked, if any
+            for invocation in invocations:
+                self._release_outcomes(invocation)
 
     def on_result(self, value, fargs, invocation, **kwargs):
         """Implementation of the inherited abstract on_result method."""
+        if self._hold_outcome(self.on_result, invocation=invocation,
+                              value=value, fargs=fargs, **kwargs):
+            return
         del kwargs
         # TODO an invocation=None default makes no sense if the following fails
         invocation.current_result = value
@@ -114,6 +220,9 @@ class PluggableInvoker(BaseInvoker, BaseCaller):
 
     def on_error(self, value, fargs, invocation, **kwargs):
         """Implementation of the inherited abstract on_error method."""
+        if self._hold_outcome(self.on_error, invocation=invocation,
+                              value=value, fargs=fargs, **kwargs):
+            return
         del kwargs
         invocation.error = value
 
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Invoker that queues calls in a task database on a shared filesystem.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import itertools
+from collections import deque
+from threading import Condition, Lock, RLock, Thread, current_thread
+
+# First Party
+from metaopt.concurrent.employer.util.exception import LayoffError
+from metaopt.concurrent.invoker.invoker import Invoker
+from metaopt.concurrent.invoker.util.call_callbacks import CallCallbacks
+from metaopt.concurrent.invoker.util.call_handle import CallHandle
+from metaopt.concurrent.invoker.util.function_registry import \
+    FunctionRegistry, encode_args
+from metaopt.concurrent.invoker.util.task_db import TaskDB
+from metaopt.concurrent.model.call_lifecycle import Call, Layoff, Result, \
+    Start
+from metaopt.core.returnspec.util.wrap_return_values import wrap_return_values
+from metaopt.core.stoppable.util.decorator import stoppable, stopping
+
+
+class SharedQueueInvoker(Invoker):
+    """
+    Invoker that queues calls in a task database on a shared filesystem.
+
+    Needs neither a daemon nor open ports: Workers started by ``metaopt worker
+    --queue PATH`` on any machine mounting the database file claim the calls
+    one at a time, with a lease they renew while executing a call. Calls of
+    workers that died get claimed by others once their lease expired.
+
+    Stopping a call drops its task. A worker executing it notices when
+    renewing its lease and exits, its node starts a new one. Stopping the
+    invoker closes the queue, which makes all workers exit.
+
+    The objective function and its arguments must be importable and picklable
+    on all machines.
+    """
+
+    # seconds a worker leases a call for at a time
+    LEASE = 30.0
+
+    # seconds between polls for the starts and outcomes of calls
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, path, lease=None, poll_interval=None):
+        """
+        :param path: Path of the task database on the shared filesystem. Any
+                     previous tasks in it are dropped.
+        :param lease: Seconds after which the call of a silent worker is
+                      claimed by another worker.
+        :param poll_interval: Seconds between polls for outcomes.
+        """
+        super(SharedQueueInvoker, self).__init__()
+
+        self._poll_interval = poll_interval or self.POLL_INTERVAL
+
+        self._task_db = TaskDB(path)
+        self._task_db.open(lease=lease or self.LEASE)
+
+        # small integers identifying calls
+        self._call_ids = itertools.count()
+
+        # functions of the queued calls by short id and the ids of the ones
+        # put into the database
+        self._function_registry = FunctionRegistry()
+        self._functions_put = set()
+
+        # calls not completed yet, by call id
+        self._calls = dict()
+
+        # callbacks to call as soon as calls started and with their outcomes,
+        # which get reported after them
+        self._callbacks = CallCallbacks(report=self._report)
+
+        # outcomes fetched from the database, handed to the caller in wait()
+        self._outcomes = deque()
+        self._outcomes_awaited = 0
+
+        # errors raised while polling, re-raised in the waiting threads
+        self._errors = deque()
+
+        # We can not prohibit others to use us in parallel, so make this
+        # invoker thread-safe. Callbacks may invoke again, so be reentrant.
+        self._lock = RLock()
+
+        # lock for the state shared with the polling thread
+        self._condition = Condition(Lock())
+
+        self._thread = Thread(target=self._poll)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def path(self):
+        """Property for the path of the task database."""
+        return self._task_db.path
+
+    def _poll(self):
+        """Fetches the starts and outcomes recorded by workers till stopped."""
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                self._condition.wait(self._poll_interval)
+                if self._stopped:
+                    return
+
+            try:
+                events = self._task_db.fetch_events()
+            except Exception as error:
+                with self._condition:
+                    # Nobody is going to poll anymore.
+                    # So let the waiting threads know why.
+                    self._errors.append(error)
+                    self._condition.notify_all()
+                return
+
+            for call_id, kind, worker_id, value in events:
+                self._handle_event(call_id, kind, worker_id, value)
+
+    def _handle_event(self, call_id, kind, worker_id, value):
+        """Handles a start or an outcome fetched from the database."""
+        with self._condition:
+            call = self._calls.get(call_id)
+            if call is None:
+                # The call was stopped right before the worker recorded this.
+                # Its layoff was reported already, so drop the event.
+                return
+
+            if kind is Start:
+                callbacks = self._callbacks.start(call_id)
+            else:
+                callbacks = []
+                if kind is Result:
+                    # workers record the raw values without the return spec
+                    value = wrap_return_values(value, call.return_spec)
+                self._complete(kind(worker_id=worker_id, call=call,
+                                    value=value))
+
+        # call back without holding the lock, callbacks may use us
+        for callback in callbacks:
+            callback()
+        self._call_outcome_callbacks()
+
+    def _complete(self, outcome):
+        """
+        Completes the call of the given outcome, holding the condition. Its
+        outcome gets reported once its callbacks were called.
+        """
+        del self._calls[outcome.call.id]
+        self._callbacks.complete(outcome)
+
+    def _report(self, outcome):
+        """Hands the given outcome over to wait()."""
+        with self._condition:
+            self._outcomes.append(outcome)
+            self._condition.notify_all()
+
+    def _call_outcome_callbacks(self):
+        """
+        Calls the outcome callbacks that are due, without the condition, and
+        reports their outcomes.
+        """
+        self._callbacks.call_outcome_callbacks()
+
+    def _register_function(self, call):
+        """
+        Returns the short id of the function and specs of the given call,
+        putting them into the database once.
+        """
+        function_id = self._function_registry.register(call)
+        if function_id not in self._functions_put:
+            self._task_db.put_function(function_id,
+                                       self._function_registry[function_id])
+            self._functions_put.add(function_id)
+        return function_id
+
+    def _queue(self, calls):
+        """Puts tasks for the given calls into the database."""
+        tasks = [(call.id, self._register_function(call), encode_args(call))
+                 for call in calls]
+        with self._condition:
+            for call in calls:
+                self._calls[call.id] = call
+            self._outcomes_awaited += len(calls)
+        self._task_db.put_tasks(tasks)
+
+    def _handle_outcome(self, outcome):
+        """Hands the given outcome over to the caller."""
+        if isinstance(outcome, Result):
+            callback = self._caller.on_result
+        else:
+            callback = self._caller.on_error
+        callback(value=outcome.value, fargs=outcome.call.args,
+                 **(outcome.call.kwargs or dict()))
+
+    def _create_call(self, fargs, kwargs):
+        """Returns a new call of the objective function for the arguments."""
+        return Call(id=next(self._call_ids), function=self._f, args=fargs,
+                    kwargs=kwargs, param_spec=self._param_spec,
+                    return_spec=self._return_spec)
+
+    @stoppable
+    def invoke(self, caller, fargs, **kwargs):
+        """
+        Invokes call(f, fargs) with the given function and the given arguments.
+
+        Returns right away, the call waits in the queue for a worker.
+        """
+        with self._lock:
+            self._caller = caller
+
+            call = self._create_call(fargs, kwargs)
+            call_handle = CallHandle(invoker=self, call_id=call.id)
+            self._queue([call])
+            return call_handle
+
+    @stoppable
+    def invoke_many(self, caller, fargs_list, kwargs_list=None):
+        """
+        Invokes call(f, fargs) for each of the given arguments at once.
+
+        Puts all tasks into the database in a single transaction.
+        """
+        if kwargs_list is None:
+            kwargs_list = [dict() for _ in fargs_list]
+
+        with self._lock:
+            self._caller = caller
+
+            calls = [self._create_call(fargs, kwargs)
+                     for fargs, kwargs in zip(fargs_list, kwargs_list)]
+            call_handles = [CallHandle(invoker=self, call_id=call.id)
+                            for call in calls]
+            self._queue(calls)
+            return call_handles
+
+    def wait(self):
+        """Blocks till all currently invoked calls were reported."""
+        while True:
+            with self._condition:
+                while not self._outcomes:
+                    if self._errors:
+                        raise self._errors.popleft()
+                    if self._stopped or self._outcomes_awaited == 0:
+                        # When stopped, the layoffs were handed over there.
+                        return
+                    self._condition.wait()
+                self._outcomes_awaited -= 1
+                outcome = self._outcomes.popleft()
+
+            # The callbacks may invoke again, so do not block the polling.
+            with self._lock:
+                self._handle_outcome(outcome=outcome)
+
+    def add_start_callback(self, call_id, callback):
+        """Calls the given callback as soon as a worker claimed the call."""
+        if not self._callbacks.add_start_callback(call_id, callback):
+            callback()
+
+    def add_outcome_callback(self, call_id, callback):
+        """Calls the given callback with the outcome of the given call."""
+        self._callbacks.add_outcome_callback(call_id, callback)
+
+    @stoppable
+    def stop_call(self, call_id, reason):
+        """
+        Stops a call given by its id, by dropping its task from the database.
+
+        Gets called by a timer in an individual thread.
+        """
+        if not self._task_db.cancel(call_id):
+            # The call was completed already.
+            # So there is nothing to stop.
+            return
+
+        with self._condition:
+            call = self._calls.get(call_id)
+            if call is not None:
+                self._complete(Layoff(worker_id=None, call=call,
+                                      value=reason))
+        self._call_outcome_callbacks()
+
+    @stoppable
+    @stopping
+    def stop(self, reason=None):
+        """
+        Closes the queue, making all workers exit.
+
+        Gets called by a timer in an individual thread.
+        """
+        if reason is None:
+            reason = LayoffError("The invoker was stopped.")
+
+        try:
+            self._task_db.close()
+        finally:
+            with self._condition:
+                # report all calls nobody will complete anymore
+                for call in list(self._calls.values()):
+                    self._complete(Layoff(worker_id=None, call=call,
+                                          value=reason))
+            self._call_outcome_callbacks()
+
+            with self._condition:
+                outcomes = list(self._outcomes)
+                self._outcomes.clear()
+                self._outcomes_awaited = 0
+                self._condition.notify_all()
+
+            # report the outcomes nobody waits for anymore
+            with self._lock:
+                for outcome in outcomes:
+                    self._handle_outcome(outcome=outcome)
+
+            # start callbacks may stop us from within the polling thread
+            if current_thread() is not self._thread:
+                self._thread.join()
+            self._task_db.close_connection()
@@ -6,28 +6,100 @@ Invoker that uses a single core or CPU respectively.
 from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
+# Standard Library
+import itertools
+
 # First Party
 from metaopt.concurrent.invoker.invoker import Invoker
+from metaopt.concurrent.invoker.util.call_handle import CallHandle
+from metaopt.concurrent.model.call_lifecycle import Call, Error, Result
 from metaopt.core.call.call import call
 from metaopt.core.stoppable.stoppable import stoppable
 
 
 class SingleProcessInvoker(Invoker):
-    """Invoker that does the work on its own."""
+    """
+    Invoker that does the work on its own.
+
+    Calls are done by the time their call handles are returned.
+    """
 
     def __init__(self):
         super(SingleProcessInvoker, self).__init__()
 
+        # small integers identifying calls
+        self._call_ids = itertools.count()
+
+        # id of the call being invoked and its callbacks
+        self._call_id = None
+        self._start_callbacks = dict()
+        self._outcome_callbacks = dict()
+
+    def _report(self, outcome):
+        """Calls the outcome callbacks of the call of the given outcome."""
+        for callback in self._outcome_callbacks.pop(outcome.call.id, []):
+            callback(outcome)
+
     @stoppable
     def invoke(self, caller, fargs, **kwargs):
-        """Calls back to self._caller.on_result() for call(f, fargs)."""
+        """
+        Calls back to self._caller.on_result() for call(f, fargs).
+
+        Returns the call handle of the call, done already.
+        """
         self._caller = caller
         del caller
+
+        call_ = Call(id=next(self._call_ids), function=self.f, args=fargs,
+                     kwargs=kwargs, param_spec=self.param_spec,
+                     return_spec=self.return_spec)
+        self._call_id = call_.id
         try:
-            value = call(self.f, fargs)
-            self._caller.on_result(value=value, fargs=fargs, **kwargs)
-        except Exception as value:
-            self._caller.on_error(value=value, fargs=fargs, **kwargs)
+            call_handle = CallHandle(invoker=self, call_id=call_.id)
+            for callback in self._start_callbacks.pop(call_.id, []):
+                callback()
+
+            try:
+                value = call(self.f, fargs, self.param_spec, self.return_spec)
+                self._report(Result(worker_id=None, call=call_, value=value))
+                self._caller.on_result(value=value, fargs=fargs, **kwargs)
+            except Exception as value:
+                self._report(Error(worker_id=None, call=call_, value=value))
+                self._caller.on_error(value=value, fargs=fargs, **kwargs)
+        finally:
+            self._call_id = None
+            self._start_callbacks.clear()
+            self._outcome_callbacks.clear()
+        return call_handle
+
+    @stoppable
+    def invoke_many(self, caller, fargs_list, kwargs_list=None):
+        """Calls back to self._caller for each call(f, fargs) in turn."""
+        if kwargs_list is None:
+            kwargs_list = [dict() for _ in fargs_list]
+
+        return [self.invoke(caller, fargs, **kwargs)
+                for fargs, kwargs in zip(fargs_list, kwargs_list)]
+
+    def add_start_callback(self, call_id, callback):
+        """
+        Calls the given callback as soon as the given call started. Never
+        calls it for calls done already.
+        """
+        if call_id == self._call_id:
+            self._start_callbacks.setdefault(call_id, []).append(callback)
+
+    def add_outcome_callback(self, call_id, callback):
+        """
+        Calls the given callback with the outcome of the given call. Never
+        calls it for calls done already.
+        """
+        if call_id == self._call_id:
+            self._outcome_callbacks.setdefault(call_id, []).append(callback)
+
+    def stop_call(self, call_id, reason):
+        """Does nothing, calls are done before they could be stopped."""
+        del call_id, reason
 
     def wait(self):
         """Blocks till all invoke, on_error or on_result calls are done."""
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Invoker that invokes objective functions in parallel using threads.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# First Party
+from metaopt.concurrent.employer.thread import ThreadWorkerEmployer
+from metaopt.concurrent.invoker.multiprocess import MultiProcessInvoker
+from metaopt.concurrent.transport.thread import ThreadTransport
+
+
+class ThreadPoolInvoker(MultiProcessInvoker):
+    """
+    Invoker that invokes objective functions in parallel using threads.
+
+    Works like the multiprocess invoker, but its workers are threads of our
+    own process. They start instantly and share our memory, so nothing gets
+    pickled. Only objective functions that release the GIL, e.g. in NumPy,
+    BLAS or scikit-learn code, run in parallel, though.
+
+    Stopping a call abandons the worker thread executing it, since threads can
+    not be terminated. The thread finishes the call in the background, but its
+    outcome gets dropped.
+    """
+
+    def __init__(self, resources=None, prefetch=None):
+        """
+        :param  resources: Number of threads to use at most. Will
+                           automatically configure itself, if None.
+        :param  prefetch: Number of tasks issued to each worker at most,
+                          including the one it executes. Will automatically
+                          configure itself by the duration of calls, if None.
+        """
+        super(ThreadPoolInvoker, self).__init__(resources=resources,
+                                                prefetch=prefetch)
+
+    def _create_transport(self):
+        """Returns the transport connecting us to our workers."""
+        return ThreadTransport()
+
+    def _create_employer(self, resources, initializer, initargs):
+        """Returns the employer of our workers."""
+        del initializer, initargs
+        return ThreadWorkerEmployer(resources=resources,
+                                    transport=self._transport,
+                                    status_db=self._status_db)
+
+    def _share_param_spec(self):
+        """Returns the parameter specification, threads share our memory."""
+        return self._param_spec
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Callbacks invokers call as soon as calls started and with their outcomes.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+from collections import deque
+from threading import Lock
+
+
+class CallCallbacks(object):
+    """
+    Callbacks to call as soon as calls started and with their outcomes.
+
+    Invokers record starts and outcomes while holding their locks, but call
+    back without, since callbacks may use them. So starts return their
+    callbacks and outcomes queue theirs till :meth:`call_outcome_callbacks`,
+    and callbacks for running calls are left to call right away. Calls may
+    get callbacks before they are issued.
+
+    Outcomes get reported only after their callbacks were called. So call
+    handles are resolved by the time the caller learns of their outcomes.
+    """
+
+    def __init__(self, report):
+        """
+        :param report: Function handing an outcome over to the threads
+                       waiting for outcomes, called after its callbacks.
+        """
+        self._report = report
+
+        # ids of the running calls and the callbacks for calls not started
+        self._started = set()
+        self._start_callbacks = dict()
+
+        # callbacks for the outcomes of calls not completed, and the outcomes
+        # due to be reported along with their callbacks
+        self._outcome_callbacks = dict()
+        self._outcomes_due = deque()
+
+        # only held briefly, never while calling back
+        self._lock = Lock()
+
+    def add_start_callback(self, call_id, callback):
+        """
+        Keeps the given callback for the start of the call given by id.
+
+        Returns False without keeping it, if the call is running already. The
+        callback is to be called right away then.
+        """
+        with self._lock:
+            if call_id in self._started:
+                return False
+            self._start_callbacks.setdefault(call_id, []).append(callback)
+            return True
+
+    def add_outcome_callback(self, call_id, callback):
+        """Keeps the given callback for the outcome of the given call."""
+        with self._lock:
+            self._outcome_callbacks.setdefault(call_id, []).append(callback)
+
+    def start(self, call_id):
+        """
+        Marks the call given by id as running.
+
+        Returns its start callbacks for calling them.
+        """
+        with self._lock:
+            self._started.add(call_id)
+            return self._start_callbacks.pop(call_id, [])
+
+    def unstart(self, call_id):
+        """Marks the call given by id as waiting again, e.g. to be reissued."""
+        with self._lock:
+            self._started.discard(call_id)
+
+    def complete(self, outcome):
+        """
+        Forgets the start callbacks of the call of the given outcome and
+        queues the outcome for :meth:`call_outcome_callbacks`.
+        """
+        call_id = outcome.call.id
+        with self._lock:
+            self._started.discard(call_id)
+            self._start_callbacks.pop(call_id, None)
+            self._outcomes_due.append(
+                (outcome, self._outcome_callbacks.pop(call_id, [])))
+
+    def call_outcome_callbacks(self):
+        """
+        Calls the outcome callbacks that are due, reporting each outcome
+        after its callbacks.
+        """
+        while True:
+            with self._lock:
+                if not self._outcomes_due:
+                    return
+                outcome, callbacks = self._outcomes_due.popleft()
+            try:
+                for callback in callbacks:
+                    callback(outcome)
+            finally:
+                self._report(outcome)
@@ -6,21 +6,133 @@ Means to stop tasks for invokers.
 from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
+# Standard Library
+import time
+from concurrent.futures import Future
+
 # First Party
 from metaopt.concurrent.employer.util.exception import LayoffError
+from metaopt.concurrent.model.call_lifecycle import Layoff, Result
 from metaopt.core.stoppable.stoppable import Stoppable
 from metaopt.core.stoppable.util.decorator import stoppable, stopping
 from metaopt.core.stoppable.util.exception import StoppedError
 
 
-class CallHandle(Stoppable):
-    """A means to stopped a task."""
+class CallHandle(Stoppable, Future):
+    """
+    A means to stopped a task.
+
+    Also a :class:`concurrent.futures.Future` of the call's outcome, so it
+    works with :func:`concurrent.futures.wait` and
+    :func:`concurrent.futures.as_completed`. The invoker resolves it in a
+    thread of its own as soon as the outcome arrives, independently of
+    handing the outcome to the caller. So done callbacks run in that thread
+    and must not invoke again.
+
+    Unlike other futures, running calls can be cancelled, too.
+    """
+
+    def __init__(self, invoker, call_id, index=None):
+        """
+        Gets created before the call is issued, so that no start and no
+        outcome gets missed.
 
-    def __init__(self, invoker, call_id):
+        :param index: Index of the candidate in the call of a batch function,
+                      whose return value to resolve this future by.
+        """
         super(CallHandle, self).__init__()
 
         self._invoker = invoker
         self._call_id = call_id
+        self._index = index
+
+        # times the call was invoked, started and done at
+        self.time_invoked = time.time()
+        self.time_started = None
+        self.time_done = None
+
+        # seconds the invoker predicted the call to take, if it did
+        self.duration_predicted = None
+
+        invoker.add_start_callback(call_id=call_id,
+                                   callback=self._handle_start)
+        invoker.add_outcome_callback(call_id=call_id,
+                                     callback=self._handle_outcome)
+
+    @property
+    def duration(self):
+        """Returns the seconds the call was executed for, None if unknown."""
+        if self.time_started is None or self.time_done is None:
+            return None
+        return self.time_done - self.time_started
+
+    @property
+    def memory_peak(self):
+        """
+        Returns the peak resident memory sampled while executing this call, in
+        bytes. Returns None if the invoker did not sample any memory.
+        """
+        get_memory_peak = getattr(self._invoker, "get_memory_peak", None)
+        if get_memory_peak is None:
+            return None
+        return get_memory_peak(call_id=self._call_id)
+
+    def _handle_start(self):
+        """Records the time a worker started this call."""
+        self.time_started = time.time()
+
+    def _handle_outcome(self, outcome):
+        """Resolves this future by the given outcome."""
+        with self._condition:
+            if self.done():
+                # This future was cancelled already.
+                return
+            self.time_done = time.time()
+
+            if isinstance(outcome, Result):
+                if self._index is None:
+                    self.set_result(outcome.value)
+                else:
+                    self.set_result(outcome.value[self._index])
+                return
+
+            error = outcome.value
+            if not isinstance(error, BaseException):
+                if isinstance(outcome, Layoff):
+                    error = LayoffError(error or "The call was laid off.")
+                else:
+                    error = Exception(error)
+            self.set_exception(error)
+
+    def running(self):
+        """Indicates whether a worker is executing this call."""
+        return self.time_started is not None and not self.done()
+
+    def cancel(self):
+        """
+        Cancels this future and stops the call.
+
+        Returns False if the call is done already, True otherwise.
+        """
+        if not super(CallHandle, self).cancel():
+            return False
+
+        try:
+            self.stop(reason=LayoffError("Cancelling a call via its future."))
+        except StoppedError:
+            # The call was already stopped.
+            pass
+        return True
+
+    def add_start_callback(self, callback):
+        """
+        Calls the given callback as soon as a worker started this call.
+
+        The invoker may issue calls ahead of time, so use this for measuring
+        the time the call is executed.
+        """
+        self._invoker.add_start_callback(call_id=self._call_id,
+                                         callback=callback)
 
     @stoppable
     @stopping
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Queue of the calls waiting for a worker with room, by priority.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import heapq
+import itertools
+import time
+from collections import namedtuple
+from threading import Lock
+
+# metrics of the calls of one priority, waits in seconds
+PriorityStats = namedtuple("PriorityStats",
+                           ["queued", "issued", "wait_mean", "wait_max"])
+
+
+class CallQueue(object):
+    """
+    Heap of the calls waiting for a worker with room, by priority.
+
+    Calls of higher priority leave first, calls of the same priority in the
+    order they came. Waiting ages calls: every given number of seconds a call
+    waited counts as one level of priority more, so that a stream of urgent
+    calls does not starve the others. Keeps metrics for each priority.
+    """
+
+    # seconds of waiting worth one level of priority
+    AGING = 1.0
+
+    def __init__(self, aging=AGING):
+        """
+        :param aging: Seconds of waiting worth one level of priority, None
+                      for strict priorities that may starve calls.
+        """
+        super(CallQueue, self).__init__()
+
+        self._aging = aging
+
+        # heap of the waiting calls by rank and by the order they came in
+        self._heap = []
+        self._sequence = itertools.count()
+
+        # priorities and times queued of the waiting calls, by call id
+        self._queued = dict()
+
+        # numbers of calls left, total and longest waits, by priority
+        self._issued = dict()
+        self._wait_totals = dict()
+        self._wait_maxima = dict()
+
+        # invokers queue and issue in different threads
+        self._lock = Lock()
+
+    def _rank(self, priority, time_queued):
+        """Returns the key calls leave the heap in ascending order of."""
+        if self._aging is None:
+            return -priority
+        # the time a call becomes as urgent as new calls of priority 0
+        return time_queued - priority * self._aging
+
+    def __len__(self):
+        """Returns the number of calls waiting."""
+        return len(self._queued)
+
+    def push(self, calls, priorities=None):
+        """
+        Queues the given calls with the given priorities, 0 for each if None.
+        """
+        if priorities is None:
+            priorities = [0] * len(calls)
+        now = time.time()
+        with self._lock:
+            for call, priority in zip(calls, priorities):
+                self._queued[call.id] = (priority, now)
+                heapq.heappush(self._heap, (self._rank(priority, now),
+                                            next(self._sequence), call))
+
+    def pop(self, count):
+        """Returns up to the given number of calls, dequeuing them."""
+        now = time.time()
+        calls = []
+        with self._lock:
+            while self._heap and len(calls) < count:
+                _, _, call = heapq.heappop(self._heap)
+                queued = self._queued.pop(call.id, None)
+                if queued is None:
+                    # discarded meanwhile
+                    continue
+
+                priority, time_queued = queued
+                wait = now - time_queued
+                self._issued[priority] = self._issued.get(priority, 0) + 1
+                self._wait_totals[priority] = \
+                    self._wait_totals.get(priority, 0) + wait
+                self._wait_maxima[priority] = \
+                    max(self._wait_maxima.get(priority, 0), wait)
+                calls.append(call)
+        return calls
+
+    def queued(self, call_ids):
+        """Returns the ones of the given call ids that are still waiting."""
+        with self._lock:
+            return set(call_id for call_id in call_ids
+                       if call_id in self._queued)
+
+    def discard(self, call_ids):
+        """Dequeues the calls given by id, without issuing them."""
+        with self._lock:
+            for call_id in call_ids:
+                self._queued.pop(call_id, None)
+            if not self._queued:
+                del self._heap[:]
+
+    def clear(self):
+        """Dequeues all calls, without issuing them."""
+        with self._lock:
+            self._queued.clear()
+            del self._heap[:]
+
+    @property
+    def stats(self):
+        """Returns the PriorityStats of each priority seen, by priority."""
+        with self._lock:
+            counts_queued = dict()
+            for priority, _ in self._queued.values():
+                counts_queued[priority] = counts_queued.get(priority, 0) + 1
+
+            stats = dict()
+            for priority in set(counts_queued) | set(self._issued):
+                issued = self._issued.get(priority, 0)
+                stats[priority] = PriorityStats(
+                    queued=counts_queued.get(priority, 0), issued=issued,
+                    wait_mean=self._wait_totals[priority] / issued
+                    if issued else None,
+                    wait_max=self._wait_maxima.get(priority))
+            return stats
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Online model predicting the durations of calls from their args.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import heapq
+from collections import deque
+from threading import Lock
+
+
+class DurationModel(object):
+    """
+    Online model predicting the durations of calls from their args.
+
+    Predicts the mean duration of the k recently completed calls with the
+    nearest args (k-NN). Each arg is scaled by the range of its values seen,
+    so that all parameters weigh the same. Calls whose args are not numbers
+    can not be predicted.
+    """
+
+    # number of nearest calls to average and of recent calls to remember
+    K = 5
+    HISTORY = 1000
+
+    def __init__(self, k=K, history=HISTORY):
+        """
+        :param k: Number of nearest calls to average the durations of.
+        :param history: Number of recently completed calls to remember.
+        """
+        super(DurationModel, self).__init__()
+
+        self._k = k
+
+        # args values and durations of the calls completed recently
+        self._samples = deque(maxlen=history)
+
+        # the invoker records and predicts in different threads
+        self._lock = Lock()
+
+    @staticmethod
+    def _encode(fargs):
+        """Returns the values of the given args as floats, None if not all."""
+        try:
+            return tuple(float(arg.value) for arg in fargs)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def __len__(self):
+        """Returns the number of calls remembered."""
+        return len(self._samples)
+
+    def record(self, fargs, duration):
+        """Records the duration in seconds of a call with the given args."""
+        values = self._encode(fargs)
+        if values is None:
+            return
+        with self._lock:
+            self._samples.append((values, duration))
+
+    def predict(self, fargs):
+        """Returns the predicted duration of a call, None if unknown."""
+        return self.predict_many([fargs])[0]
+
+    def predict_many(self, fargs_list):
+        """Returns the predicted durations of calls, None for unknown ones."""
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return [None] * len(fargs_list)
+
+        dimensions = len(samples[0][0])
+        scales = []
+        for dimension in range(dimensions):
+            column = [values[dimension] for values, _ in samples]
+            scales.append(max(column) - min(column) or 1.0)
+
+        predictions = []
+        for fargs in fargs_list:
+            values = self._encode(fargs)
+            if values is None or len(values) != dimensions:
+                predictions.append(None)
+                continue
+
+            nearest = heapq.nsmallest(self._k, (
+                (sum(((value - value_sample) / scale) ** 2 for
+                     value, value_sample, scale in
+                     zip(values, values_sample, scales)), duration)
+                for values_sample, duration in samples))
+            predictions.append(sum(duration for _, duration in nearest) /
+                               len(nearest))
+        return predictions
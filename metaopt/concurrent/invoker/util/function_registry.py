@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of the functions of calls by short ids, for sending calls cheaply.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# First Party
+from metaopt.concurrent.model.call_lifecycle import Function
+from metaopt.core.call.util.batch import BatchArgs
+
+
+class FunctionRegistry(object):
+    """
+    Registry of the functions of calls along with their specs, by short ids.
+
+    Workers get each function once, afterwards calls refer to it by its id.
+    """
+
+    def __init__(self):
+        # functions by short id and the ids by the identities of function and
+        # specs
+        self._functions = dict()
+        self._function_ids = dict()
+
+    def register(self, call):
+        """Returns the short id of the function and specs of the given call."""
+        key = (id(call.function), id(call.param_spec), id(call.return_spec))
+        function_id = self._function_ids.get(key)
+        if function_id is None:
+            function_id = len(self._functions)
+            self._function_ids[key] = function_id
+            # Keep the function, so that its identity is not reused.
+            self._functions[function_id] = Function(
+                id=function_id, function=call.function,
+                param_spec=call.param_spec, return_spec=call.return_spec)
+        return function_id
+
+    def __getitem__(self, function_id):
+        """Returns the Function registered by the given short id."""
+        return self._functions[function_id]
+
+
+def encode_args(call):
+    """
+    Returns the raw values of the args of the given call as a tuple.
+
+    Returns other arguments than args as they are. Returns a BatchArgs of
+    such tuples for the args of a batch call.
+    """
+    if isinstance(call.args, BatchArgs):
+        return BatchArgs(encode_args(call._replace(args=fargs))
+                         for fargs in call.args)
+    try:
+        return tuple(arg.value for arg in call.args)
+    except (AttributeError, TypeError):
+        return call.args
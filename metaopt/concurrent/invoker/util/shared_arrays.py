@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Utility that shares NumPy arrays with worker processes via memory maps.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import itertools
+import os
+import shutil
+import tempfile
+import zlib
+
+try:
+    # Numpy
+    import numpy
+except ImportError:
+    # Without NumPy, there are no arrays to share.
+    numpy = None
+
+
+def load_shared_array(filename):
+    """Maps the array stored in the given file into memory, read-only."""
+    return numpy.load(filename, mmap_mode="r")
+
+
+class SharedArray(object):
+    """
+    Reference to an array stored in a file.
+
+    Unpickling it maps the array into memory read-only. So all processes
+    share the same memory pages instead of getting copies of the array.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def __reduce__(self):
+        return load_shared_array, (self.filename,)
+
+    def __repr__(self):
+        return "SharedArray(%r)" % self.filename
+
+
+class SharedArrays(object):
+    """
+    Files holding NumPy arrays, which worker processes map into memory.
+
+    Each array is written once. All references to it get pickled as the name
+    of its file. Closing removes the files, processes that mapped them before
+    keep their mappings.
+
+    Arrays changed in place get written again. Changes are detected by the
+    memory, shape and type of an array and a checksum of a sample of its
+    elements, so changing only elements left out of the sample goes unnoticed.
+    """
+
+    # number of elements of an array to checksum at most
+    SAMPLE = 1024
+
+    def __init__(self):
+        # directory holding the files, created for the first array, and the
+        # numbers naming them
+        self._directory = None
+        self._numbers = itertools.count()
+
+        # the shared arrays, their fingerprints and their references, by id
+        # of the array
+        self._arrays = dict()
+
+    @classmethod
+    def _fingerprint(cls, array):
+        """Returns a value that changes if the given array is changed."""
+        step = max(1, array.size // cls.SAMPLE)
+        sample = array.flat[::step]
+        return (array.__array_interface__["data"][0], array.shape,
+                array.strides, array.dtype.str, zlib.crc32(sample.tobytes()))
+
+    @staticmethod
+    def _is_shareable(value):
+        """Indicates whether the given value is an array to share."""
+        return isinstance(value, numpy.ndarray) and not value.dtype.hasobject
+
+    def _share_array(self, array):
+        """Returns a reference to the given array, writing it if needed."""
+        fingerprint = self._fingerprint(array)
+        try:
+            _, fingerprint_shared, shared_array = \
+                self._arrays[id(array)]
+        except KeyError:
+            pass
+        else:
+            if fingerprint_shared == fingerprint:
+                return shared_array
+
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="metaopt-")
+        # a new file, workers may have mapped the previous one
+        filename = os.path.join(self._directory,
+                                "%d.npy" % next(self._numbers))
+        numpy.save(filename, array)
+
+        # Keep the array, so that its id does not get reused.
+        shared_array = SharedArray(filename)
+        self._arrays[id(array)] = (array, fingerprint, shared_array)
+        return shared_array
+
+    def changed(self, kwargs):
+        """
+        Indicates whether arrays of the given keyword arguments were not
+        shared yet or changed since.
+        """
+        if numpy is None or not kwargs:
+            return False
+
+        for value in kwargs.values():
+            if not self._is_shareable(value):
+                continue
+            try:
+                _, fingerprint, _ = self._arrays[id(value)]
+            except KeyError:
+                return True
+            if fingerprint != self._fingerprint(value):
+                return True
+        return False
+
+    def share(self, kwargs):
+        """
+        Returns the given keyword arguments with their arrays shared.
+
+        Arrays of Python objects are left alone, they need pickling anyway.
+        """
+        if numpy is None or not kwargs:
+            return kwargs
+
+        kwargs_shared = dict()
+        for name, value in kwargs.items():
+            if self._is_shareable(value):
+                value = self._share_array(value)
+            kwargs_shared[name] = value
+        return kwargs_shared
+
+    def close(self):
+        """Removes the files of all shared arrays."""
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+        self._directory = None
+        self._arrays = dict()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Utility that splits the outcome of a batch call into those of its candidates.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# First Party
+from metaopt.concurrent.model.call_lifecycle import Result
+
+
+def split_batch_outcome(outcome):
+    """
+    Returns an outcome for each candidate of the given outcome of a batch call.
+
+    Each gets the call with the args and kwargs of its candidate. Results get
+    the return value of their candidate, errors and layoffs are shared by all
+    candidates.
+    """
+    outcomes = []
+    for index, (fargs, kwargs) in enumerate(zip(outcome.call.args,
+                                                outcome.call.kwargs)):
+        call = outcome.call._replace(args=fargs, kwargs=kwargs)
+        value = outcome.value
+        if isinstance(outcome, Result):
+            value = value[index]
+        outcomes.append(outcome._replace(call=call, value=value))
+    return outcomes
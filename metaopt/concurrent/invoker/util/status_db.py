@@ -8,315 +8,729 @@ from __future__ import absolute_import, division, print_function, \
 
 # Standard Library
 import time
-from multiprocessing.synchronize import Lock
+from collections import OrderedDict, deque
+from threading import Condition, RLock, Thread, current_thread
 
 # First Party
+from metaopt.concurrent.invoker.util.call_callbacks import CallCallbacks
+from metaopt.concurrent.invoker.util.function_registry import \
+    FunctionRegistry, encode_args
 from metaopt.concurrent.model.call_lifecycle import Error, Layoff, Result, \
     Start, Task
+from metaopt.core.call.util.batch import BatchArgs
+from metaopt.core.returnspec.util.wrap_return_values import \
+    wrap_return_values
 from metaopt.core.stoppable.stoppable import Stoppable
 from metaopt.core.stoppable.util.decorator import stoppable, stopping
 from metaopt.core.stoppable.util.exception import StoppedError
 
 
-try:
-    from Queue import Empty
-except ImportError:
-    # Queue was renamed to queue in Python 3
-    from queue import Empty
+class _Wakeup(object):
+    """Message posted to wake up the thread receiving from the transport."""
 
 
 class StatusDB(Stoppable):
-    """Database that keeps track of worker task relations."""
+    """
+    Database that keeps track of worker task relations.
 
-    def __init__(self, queue_start, queue_task, queue_outcome):
+    A thread of its own receives starts and outcomes from the transport as
+    soon as they arrive. So starts get recorded while the invoker is busy
+    elsewhere, and waiting for outcomes never polls.
+    """
+
+    # weight of the latest call in the mean call duration
+    DURATION_WEIGHT = 0.2
+
+    def __init__(self, transport, retention=1000):
+        """
+        :param transport: Transport for communicating with workers.
+        :param retention: Number of completed calls to remember at most.
+        """
         super(StatusDB, self).__init__()
 
-        # queues for communicating with workers
-        self._queue_start = queue_start
-        self._queue_task = queue_task
-        self._queue_outcome = queue_outcome
+        # transport for communicating with workers
+        self._transport = transport
 
-        # central data structure this class takes care of
+        # statuses of the calls awaiting an outcome, by call id
         self._call_status_dict = dict()
 
+        # indexes into the above: tasks not started yet per worker in FIFO
+        # order and the call each worker is currently executing
+        self._idle_tasks = dict()
+        self._running_calls = dict()
+
+        # calls of laid off workers that are to be issued to other workers
+        self._orphaned_calls = OrderedDict()
+
+        # workers by the ids of the running calls they were asked to abort
+        self._cancelling_calls = dict()
+
+        # Workers by the ids of the calls cancelled while issued to them.
+        # Their late start and outcome get dropped. Kept till the outcome
+        # arrives, which acknowledges the cancellation, or the worker is gone.
+        self._cancelled_calls = dict()
+
+        # Outcomes of completed calls, by call id, oldest first.
+        # Late messages of laid off workers are checked against them.
+        # Bounded, so that long runs do not pile up memory.
+        self._completed_statuses = OrderedDict()
+        self._workers_laid_off = OrderedDict()
+        self._retention = retention
+
+        # callbacks to call as soon as calls started and with their outcomes,
+        # which get reported after them
+        self._callbacks = CallCallbacks(report=self._report)
+
+        # times the running calls started at and the mean call duration
+        self._start_times = dict()
+        self._duration_mean = None
+
+        # times each worker was last heard of, for timing chunked reports
+        self._times_heard = dict()
+
+        # peak resident memory sampled while executing a call, by call id,
+        # for the running and the completed calls
+        self._memory_peaks = dict()
+        self._memory_peaks_completed = OrderedDict()
+
+        # durations of the completed calls, by call id
+        self._durations_completed = OrderedDict()
+
+        # functions of the issued calls by short id and the ids of the
+        # functions each worker knows
+        self._function_registry = FunctionRegistry()
+        self._functions_registered = dict()
+
+        # outcomes received, but not returned by wait_for_one_outcome, yet
+        self._outcomes = deque()
+
+        # errors raised while receiving, re-raised in the waiting threads
+        self._errors = deque()
+
+        # whether a thread waiting for an outcome is to return without one
+        self._woken_up = False
+
         # counter for messages passed through this class
         self._count_task = 0
         self._count_start = 0
+        self._count_start_waited = 0
         self._count_outcome = 0
 
-        # lock for public methods
-        self._lock = Lock()
+        # lock for public methods, notified whenever a message was handled
+        self._lock = RLock()
+        self._condition = Condition(self._lock)
 
-    def _handle_task(self, idle):
+        self._thread = Thread(target=self._receive_all)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _remember(self, statuses, key, value):
+        """Remembers the given value, forgetting the oldest ones if needed."""
+        statuses[key] = value
+        while len(statuses) > self._retention:
+            statuses.popitem(last=False)
+
+    def _discard_idle_task(self, worker_id, call_id):
+        """Removes the task for the given call from the worker's FIFO."""
+        tasks = self._idle_tasks.get(worker_id)
+        if tasks is None:
+            return
+        tasks.pop(call_id, None)
+        if not tasks:
+            del self._idle_tasks[worker_id]
+
+    def _discard_running_call(self, worker_id, call_id):
+        """Unmarks the given call as the one the worker is executing."""
+        call = self._running_calls.get(worker_id)
+        if call is not None and call.id == call_id:
+            del self._running_calls[worker_id]
+
+    def _complete(self, outcome):
+        """
+        Moves the call of the given outcome out of the active calls. Reports
+        the outcome once its callbacks were called.
+        """
+        call_id = outcome.call.id
+        status = self._call_status_dict.pop(call_id, None)
+        if status is not None:
+            self._discard_idle_task(status.worker_id, call_id)
+            self._discard_running_call(status.worker_id, call_id)
+        self._callbacks.complete(outcome)
+
+        memory_peak = self._memory_peaks.pop(call_id, None)
+        if memory_peak is not None:
+            self._remember(self._memory_peaks_completed, call_id, memory_peak)
+
+        time_start = self._start_times.pop(call_id, None)
+        if time_start is not None and not isinstance(outcome, Layoff):
+            duration = time.time() - time_start
+            self._remember(self._durations_completed, call_id, duration)
+            if self._duration_mean is None:
+                self._duration_mean = duration
+            else:
+                self._duration_mean += self.DURATION_WEIGHT * \
+                    (duration - self._duration_mean)
+
+        self._remember(self._completed_statuses, call_id, outcome)
+
+    def _lay_off(self, worker_id, call, reason):
+        """Completes the given call by a layoff and reports it."""
+        layoff = Layoff(worker_id=worker_id, call=call, value=reason)
+        self._complete(layoff)
+
+    def _report(self, outcome):
+        """Hands the given outcome over to the waiting threads."""
+        with self._condition:
+            self._outcomes.append(outcome)
+            self._condition.notify_all()
+
+    def _call_outcome_callbacks(self):
+        """
+        Calls the outcome callbacks that are due, without the lock, and
+        reports their outcomes. So call handles are resolved before their
+        outcomes get returned by :meth:`wait_for_one_outcome`.
+        """
+        self._callbacks.call_outcome_callbacks()
+
+    def _forget_cancelling_calls(self, worker_id):
+        """Forgets the calls the given worker was asked to abort or drop."""
+        for cancelling_calls in (self._cancelling_calls,
+                                 self._cancelled_calls):
+            for call_id, worker_id_cancelling in \
+                    list(cancelling_calls.items()):
+                if worker_id_cancelling == worker_id:
+                    del cancelling_calls[call_id]
+
+    def _handle_task(self, task):
         """Handles an initially idle task issued by the invoker."""
-        self._call_status_dict[idle.call.id] = idle
+        self._call_status_dict[task.call.id] = task
+        self._idle_tasks.setdefault(task.worker_id, OrderedDict())[
+            task.call.id] = task
 
-    def _handle_start(self, start):
-        """Handles a start received from the worker via the status queue."""
+    def _handle_start(self, start, time_start=None):
+        """
+        Handles a start received from the worker via the transport.
+
+        Returns the callbacks to call for this start.
+        """
         if not isinstance(start, Start):
-            raise TypeError("%s objects are not allowed in the start queue" %
+            raise TypeError("%s objects are not allowed as start" %
                             type(start))
 
-        try:
-            if isinstance(self._call_status_dict[start.call.id], Start):
-                raise KeyError("Got duplicate start for task %s" % \
-                               start.call.id +
-                               "Make sure IDs are unique.")
-        except KeyError:
-            # There was no entry for this task's uuid in the status database.
-            # That is OK, moving on to create one.
-            pass
+        status = self._call_status_dict.get(start.call.id)
+        if isinstance(status, Task):
+            self._discard_idle_task(status.worker_id, start.call.id)
 
         self._call_status_dict[start.call.id] = start
+        self._running_calls[start.worker_id] = start.call
+        self._start_times[start.call.id] = time_start or time.time()
+        return self._callbacks.start(start.call.id)
 
     def _handle_result(self, result):
-        """Handles a result received from the worker via the result queue."""
-
-        if result.call.id not in self._call_status_dict.keys():
-            raise KeyError("No task to be stopped for ID %s" % result.call.id)
-
-        status = self._call_status_dict[result.call.id]
-        if status == result:
-            # nothing to do here
-            return
-
+        """Handles a result received from the worker via the transport."""
+        status = self._completed_statuses.get(result.call.id)
         if isinstance(status, Result):
+            if status == result:
+                # nothing to do here, but report it again
+                self._callbacks.complete(result)
+                return
+
             raise ValueError("Got duplicate unequal result for call." +
                              "Make sure the call ids are unique:" +
                              "\n    " + repr(result) + "\n    " + repr(status))
 
-        self._call_status_dict[result.call.id] = result
+        if result.call.id not in self._call_status_dict:
+            raise KeyError("No task to be stopped for ID %s" % result.call.id)
 
-    def _handle_error(self, error):
-        """Handles an error received from the worker via the result queue."""
-        self._call_status_dict[error.call.id] = error
+        self._complete(result)
 
-    def _handle_layoff(self, layoff):
-        for (task_id, status) in self._call_status_dict.items():
-            try:
-                if layoff.worker_id == status.worker_id:
-                    self._call_status_dict[task_id] = layoff
-            except AttributeError:
-                # The status is idle.
-                # We do not know the worker, yet.
-                # So just check the next status
-                continue
+    def _handle_error(self, error):
+        """Handles an error received from the worker via the transport."""
+        self._complete(error)
 
     def _handle_outcome(self, outcome):
-        """"""
+        """Handles an outcome received from the worker via the transport."""
         if isinstance(outcome, Result):
             self._handle_result(result=outcome)
-            return outcome
-
-        if isinstance(outcome, Error):
+        elif isinstance(outcome, Error):
             self._handle_error(error=outcome)
-            return outcome
+        else:
+            raise TypeError("%s objects are not allowed as outcome" %
+                            type(outcome))
+
+    def _restore_call(self, message):
+        """Returns the message with the call as issued, if known."""
+        call_id = message.call.id
+        status = self._call_status_dict.get(call_id) or \
+            self._completed_statuses.get(call_id)
+        if status is None:
+            return message
+        return message._replace(call=status.call)
+
+    def _handle_message(self, message, time_start=None):
+        """
+        Handles a start or an outcome received via the transport.
 
-        if isinstance(outcome, Layoff):
-            self._handle_layoff(layoff=outcome)
-            return outcome
+        Returns the callbacks to call for this message.
+        """
+        if message.worker_id in self._workers_laid_off:
+            # The worker sent this message right before it got laid off.
+            # Its calls were reported with the layoff, so drop the message.
+            return []
+        self._times_heard[message.worker_id] = time.time()
+
+        if not isinstance(message, Start):
+            # The worker is done with the call, it may have been asked to
+            # abort it. Its outcome was reported as layoff then.
+            self._cancelling_calls.pop(message.call.id, None)
+            if self._cancelled_calls.pop(message.call.id, None) is not None:
+                return []
+        elif message.call.id in self._cancelled_calls:
+            # The call got cancelled right before the worker started it.
+            # We already know the outcome, so this start is outdated.
+            return []
+
+        # workers get the calls without the function and keyword arguments
+        message = self._restore_call(message)
+        if isinstance(message, Result):
+            # workers send the raw return values without the return spec
+            return_spec = message.call.return_spec
+            if isinstance(message.call.args, BatchArgs):
+                value = [wrap_return_values(value, return_spec)
+                         for value in message.value]
+            else:
+                value = wrap_return_values(message.value, return_spec)
+            message = message._replace(value=value)
+
+        if isinstance(message, Start):
+            self._count_start += 1
+            return self._handle_start(message, time_start=time_start)
+
+        self._handle_outcome(message)
+        return []
+
+    def _handle_reports(self, reports):
+        """
+        Handles the starts and outcomes a worker sent together in a list.
 
-        raise TypeError("%s objects are not allowed in the result queue" %
-                        type(outcome))
+        The worker executed these calls one after the other since its previous
+        message. So each call done gets an even share of that time as its
+        duration. Calls still running started just now.
 
-    @stoppable
-    def wait_for_one_task(self):
-        """
-        Blocks till one task was gotten from the task queue and processed.
+        Returns the callbacks to call for these reports.
         """
-        with self._lock:
-            task = self._queue_task.get()
-            self._handle_task(task)
-            self._count_task += 1
-            self._queue_task.task_done()
-            return task
+        call_ids_done = set(report.call.id for report in reports
+                            if not isinstance(report, Start))
+        time_now = time.time()
+        time_heard = self._times_heard.get(reports[0].worker_id, time_now)
+        duration = (time_now - time_heard) / max(1, len(call_ids_done))
+
+        callbacks = []
+        for report in reports:
+            # outcomes complete their calls now, so start them a share ago
+            time_start = time_now - duration \
+                if report.call.id in call_ids_done else time_now
+            callbacks.extend(self._handle_message(report,
+                                                  time_start=time_start))
+        return callbacks
+
+    def _receive_all(self):
+        """Receives and handles messages from the transport till stopped."""
+        while True:
+            try:
+                message = self._transport.receive()
+            except Exception as error:
+                with self._condition:
+                    if not self._stopped:
+                        # Nobody is going to receive anymore.
+                        # So let the waiting threads know why.
+                        self._errors.append(error)
+                    self._condition.notify_all()
+                return
+
+            if isinstance(message, _Wakeup):
+                if self._stopped:
+                    return
+                continue
+
+            with self._condition:
+                try:
+                    if isinstance(message, list):
+                        callbacks = self._handle_reports(message)
+                    else:
+                        callbacks = self._handle_message(message)
+                except Exception as error:
+                    self._errors.append(error)
+                    callbacks = []
+                self._condition.notify_all()
+
+            # call back without holding the lock, callbacks may use us
+            for callback in callbacks:
+                callback()
+            self._call_outcome_callbacks()
+
+    def _raise_error(self):
+        """Raises the oldest error of the receiving thread, if any."""
+        if self._errors:
+            raise self._errors.popleft()
 
     @stoppable
     def wait_for_one_start(self):
         """
-        Blocks till one start was gotten from the start queue and processed.
+        Blocks till one more start was received via the transport and
+        processed.
         """
-        try:
-            # TODO this is polling which is bad.
-            # Unfortunately this is necessary because of the concurrent stop.
-            while True:
-                try:
-                    start = self._queue_start.get(timeout=1)
-                    break
-                except Empty:
-                    pass
+        with self._condition:
+            while self._count_start <= self._count_start_waited:
+                self._raise_error()
                 if self._stopped:
                     raise StoppedError()
-        except IOError:
-            # The queue was closed before we could read a start.
-            # This may happen with fast terminations.
-            # The invoker expects an outcome.
-            # So send back a manually constructed outcome.
-            return Start(worker_id=None, call=None)
-        self._handle_start(start)
-        self._count_start += 1
-        self._queue_start.task_done()
-        return start
+                self._condition.wait()
+            self._count_start_waited += 1
 
     @stoppable
     def wait_for_one_outcome(self):
         """
-        Blocks till an outcome was gotten from the outcome queue and processed.
-        """
-        try:
-            #outcome = self._queue_outcome.get()
+        Blocks till an outcome was received via the transport and processed.
 
-            # TODO this is polling which is bad.
-            # Unfortunately this is necessary because of the concurrent stop.
-            while True:
-                try:
-                    outcome = self._queue_outcome.get(timeout=1)
-                    break
-                except Empty:
-                    pass
+        Returns None if woken up by :meth:`wake_up` before.
+        """
+        with self._condition:
+            while not self._outcomes:
+                self._raise_error()
                 if self._stopped:
                     raise StoppedError()
+                if self._woken_up:
+                    self._woken_up = False
+                    return None
+                self._condition.wait()
+            self._count_outcome += 1
+            return self._outcomes.popleft()
+
+    def wake_up(self):
+        """
+        Makes a thread waiting for an outcome return without one.
 
-        except EOFError:
-            # The outcome queue was closed on the other end.
-            # That must have been the queue's manager
-            # This means that the invoker tries to stop.
-            # So get out of the way.
-            return Layoff(worker_id=None, call=None, value=None)
+        Employers call this when workers became available, so that the waiting
+        invoker issues the orphaned calls to them.
+        """
+        with self._condition:
+            self._woken_up = True
+            self._condition.notify_all()
 
-        self._handle_outcome(outcome)
-        self._count_outcome += 1
-        self._queue_outcome.task_done()
-        return outcome
+    def add_start_callback(self, call_id, callback):
+        """
+        Calls the given callback as soon as the call given by id started.
+
+        Calls it right away, if the call is running already. Never calls it, if
+        the call gets completed before it starts. Calls may be given before
+        they are issued.
+        """
+        with self._lock:
+            if call_id in self._completed_statuses or \
+                    self._callbacks.add_start_callback(call_id, callback):
+                return
+        callback()
+
+    def add_outcome_callback(self, call_id, callback):
+        """
+        Calls the given callback with the outcome of the call given by id.
+
+        Calls it as soon as the outcome was received, even before it gets
+        returned by :meth:`wait_for_one_outcome`. Calls it right away, if the
+        call was completed already. Calls may be given before they are issued.
+        """
+        with self._lock:
+            outcome = self._completed_statuses.get(call_id)
+            if outcome is None:
+                self._callbacks.add_outcome_callback(call_id, callback)
+                return
+        callback(outcome)
 
     @stoppable
     def count_running_tasks(self):
         """Returns the number of tasks currently executed by workers."""
-        # alternate formulation
-        # while len([f for f in self._call_status_dict.values() if t]) > 0:
         with self._lock:
-            count = 0
-            for status in self._call_status_dict.values():
-                if isinstance(status, Start):
-                    count += 1
+            return len(self._running_calls)
+
+    def count_idle_tasks(self):
+        """Returns the number of tasks issued, but not started, yet."""
+        with self._lock:
+            return len(self._call_status_dict) - len(self._running_calls)
+
+    def count_tasks(self, worker_id):
+        """Returns the number of tasks the given worker has not finished."""
+        with self._lock:
+            count = len(self._idle_tasks.get(worker_id, ()))
+            if worker_id in self._running_calls:
+                count += 1
             return count
 
+    @property
+    def duration_mean(self):
+        """Returns the mean duration of recent calls, None if unknown."""
+        with self._lock:
+            return self._duration_mean
+
+    def report_memory(self, worker_id, rss):
+        """
+        Records the resident memory sampled of the worker given by id.
+
+        Keeps the peak for the call the worker is executing, if any.
+        """
+        with self._lock:
+            call = self._running_calls.get(worker_id)
+            if call is not None:
+                self._memory_peaks[call.id] = max(
+                    rss, self._memory_peaks.get(call.id, 0))
+
+    def get_memory_peak(self, call_id):
+        """
+        Returns the peak resident memory sampled while executing the call
+        given by id, in bytes. Returns None if there were no samples.
+        """
+        with self._lock:
+            return self._memory_peaks.get(call_id) or \
+                self._memory_peaks_completed.get(call_id)
+
+    def get_duration(self, call_id):
+        """
+        Returns the seconds the completed call given by id was executed for,
+        None if unknown.
+        """
+        with self._lock:
+            return self._durations_completed.get(call_id)
+
     def get_worker_id(self, call_id):
         """
         Returns the worker id for a given task id.
 
         Raises KeyError if there was no worker for that task id. That means,
         all workers were killed before one could start working on the task.
+        Also raises KeyError if the call was completed already, since then no
+        worker is working on it anymore.
         """
         with self._lock:
             status = self._call_status_dict[call_id]
             return status.worker_id
 
     def get_running_call(self, worker_id):
-        task_found = False
-        for status in self._call_status_dict.values():
-            try:
-                if not status.worker_id == worker_id:
-                    continue
-            except AttributeError:
-                # The status is idle.
-                # We do not know the worker, yet.
-                # So just check the next status
-                continue
-            if not isinstance(status, Start):
-                continue
-            task_found = True
-            break
-
-        if not task_found:
-            raise KeyError("No status for the worker with id: %s" % worker_id)
-
-        return status.call
-
-    def pop_idle_call(self):
-        for [call_id, status] in self._call_status_dict.items():
-            if isinstance(status, Task):
-                del self._call_status_dict[call_id]
-                return status.call
+        """
+        Returns the call the worker given by id has started.
 
-        raise ValueError("No call idling at the moment.")
+        Raises KeyError if the worker is not executing any call.
+        """
+        with self._lock:
+            try:
+                return self._running_calls[worker_id]
+            except KeyError:
+                raise KeyError("No status for the worker with id: %s" %
+                               worker_id)
 
     def get_idle_call(self, worker_id):
+        """
+        Returns the oldest call issued to the worker given by id, but not
+        started.
+
+        Raises KeyError if no such call was issued to the worker.
+        """
+        with self._lock:
+            try:
+                tasks = self._idle_tasks[worker_id]
+            except KeyError:
+                raise KeyError("No call idling for the worker with id: %s" %
+                               worker_id)
+            return next(iter(tasks.values())).call
+
+    def is_busy(self, worker_id):
+        """Indicates whether the worker given by id awaits an outcome."""
         with self._lock:
-            for status in self._call_status_dict.values():
-                if not status.worker_id == worker_id:
-                    return status  # TODO
+            return worker_id in self._running_calls or \
+                worker_id in self._idle_tasks
 
     @stoppable
     def issue_task(self, task):
-        """"""
-        self._queue_task.put(task)
-        self._handle_task(task)
-        self._count_task += 1
-
-    def _empty_queue_task(self):
-        """"""
-        # *One* task may got issued after all workers were terminated.
-        # So try to get this last task.
-        while not self._queue_task.empty():
-            task = self.wait_for_one_task()
-            self._handle_task(task)
-
-    def _empty_queue_start(self):
-        """Empties the start queue, handling all starts."""
-        while not self._queue_start.empty():
-            start = self.wait_for_one_start()
-            self._handle_start(start)
-
-    def _empty_queue_outcome(self):
-        """Empties the outcome queue, handling all outcomes."""
-        while not self._queue_outcome.empty():
-            outcome = self.wait_for_one_outcome()
-            self._handle_outcome(outcome)
-            #try:
-            #
-            #except ValueError:
-            #    # Duplicate result. Should not happen. TODO
-            #    raise ValueError("Got a duplicate outcome. " +
-            #                     "Make sure IDs are unique.")
+        """Sends the given task to the worker it is issued to."""
+        self.issue_tasks([task])
 
-    @stopping
     @stoppable
-    def stop(self, reason=None):
-        """Stops this status database."""
+    def issue_tasks(self, tasks):
+        """
+        Sends the given tasks to the workers they are issued to.
 
-        # TODO This loop should not be necessary.
-        while not self._queue_task.empty():
-            self._empty_queue_task()
-            time.sleep(0.001)
-        assert self._queue_task.empty()
+        The tasks for each worker travel in a single message. Each worker
+        gets the function and specs of the calls once. Afterwards the calls
+        refer to them by a short id only and carry the raw values of their
+        args. The args themselves stay here, just like the keyword arguments.
+        """
+        tasks_by_worker = OrderedDict()
+        with self._lock:
+            for task in tasks:
+                self._handle_task(task)
+                if self._orphaned_calls.pop(task.call.id, None) is None:
+                    # orphaned calls were counted when issued the first time
+                    self._count_task += 1
+
+                messages = tasks_by_worker.setdefault(task.worker_id, [])
+                function_id = self._function_registry.register(task.call)
+                registered = self._functions_registered.setdefault(
+                    task.worker_id, set())
+                if function_id not in registered:
+                    registered.add(function_id)
+                    messages.append(self._function_registry[function_id])
+
+                # The keyword arguments are data for the caller, not the
+                # function. So keep them here, they may not even be picklable.
+                # Of the args, the worker only needs the values.
+                call = task.call._replace(function=function_id,
+                                          args=encode_args(task.call),
+                                          kwargs=None, param_spec=None,
+                                          return_spec=None)
+                messages.append(task._replace(call=call))
+
+        for worker_id, tasks_worker in tasks_by_worker.items():
+            self._transport.send(worker_id, tasks_worker)
+
+    def cancel_idle_call(self, call_id, reason=None):
+        """
+        Reports a layoff for the call given by id, if it was not started, yet.
 
-        # issue task done for all unchecked messages of the task queue
-        # TODO this should not be necessary
-        while True:
-            try:
-                self._queue_task.task_done()
-            except ValueError:
-                # no more task done allowed, we are done here
-                break
-        self._queue_task.join()
-
-        self._empty_queue_start()
-        assert self._queue_start.empty()
-        self._queue_start.join()
-
-        # We may have recorded a task in this database that was never started.
-        # This happens when all workers get stopped before one starts the task.
-        # So send back a layoff to the caller for all not yet started tasks.
-        for task in self._call_status_dict.values():
-            if not isinstance(task, Task):
-                continue
-            # layoff = Layoff(worker_id=None, call=task.call, value=reason)
-            # self._queue_outcome.put(layoff)
+        The worker the call was issued to is kept, but its start and outcome
+        of the call get dropped.
 
-        self._empty_queue_outcome()
-        assert self._queue_outcome.empty()
-        self._queue_outcome.join()
+        Returns whether the call was cancelled.
+        """
+        with self._condition:
+            status = self._call_status_dict.get(call_id)
+            if not isinstance(status, Task):
+                return False
+            self._cancelled_calls[call_id] = status.worker_id
+            self._lay_off(worker_id=status.worker_id, call=status.call,
+                          reason=reason)
+            self._condition.notify_all()
+        self._call_outcome_callbacks()
+        return True
+
+    def cancel_running_call(self, call_id, reason=None):
+        """
+        Reports a layoff for the call given by id, if a worker is executing it.
+
+        The worker is kept and asked to abort the call by its employer. Its
+        outcome of the call gets dropped, see :meth:`is_cancelling`.
+
+        Returns the id of the worker executing the call, if any.
+        """
+        with self._condition:
+            status = self._call_status_dict.get(call_id)
+            if not isinstance(status, Start):
+                return None
+            self._cancelling_calls[call_id] = status.worker_id
+            self._cancelled_calls[call_id] = status.worker_id
+            self._lay_off(worker_id=status.worker_id, call=status.call,
+                          reason=reason)
+            self._condition.notify_all()
+        self._call_outcome_callbacks()
+        return status.worker_id
+
+    def is_cancelling(self, call_id):
+        """
+        Returns whether the call given by id was cancelled while running and
+        its worker did not finish it since.
+        """
+        with self._lock:
+            return call_id in self._cancelling_calls
+
+    def report_layoff(self, worker_id, reason=None, orphan=False):
+        """
+        Reports layoffs for the calls issued to the given terminated worker.
+
+        The running call gets a layoff. The calls the worker did not start get
+        a layoff, too, unless told to orphan them for issuing them to other
+        workers.
+        """
+        with self._condition:
+            self._remember(self._workers_laid_off, worker_id, True)
+            self._functions_registered.pop(worker_id, None)
+            self._times_heard.pop(worker_id, None)
+            self._forget_cancelling_calls(worker_id)
+
+            calls = []
+            if worker_id in self._running_calls:
+                calls.append(self._running_calls[worker_id])
+            tasks = list(self._idle_tasks.get(worker_id, dict()).values())
+            if orphan:
+                for task in tasks:
+                    self._discard_idle_task(worker_id, task.call.id)
+                    del self._call_status_dict[task.call.id]
+                    self._orphaned_calls[task.call.id] = task.call
+            else:
+                calls.extend(task.call for task in tasks)
+
+            for call in calls:
+                self._lay_off(worker_id=worker_id, call=call, reason=reason)
+            self._condition.notify_all()
+        self._call_outcome_callbacks()
+
+    def report_loss(self, worker_id):
+        """
+        Reports the worker given by id as lost, e.g. along with its machine.
+
+        Unlike a layoff, the worker's calls did not fail. So all of them get
+        orphaned for issuing them to other workers, including the running one.
+        """
+        with self._condition:
+            self._remember(self._workers_laid_off, worker_id, True)
+            self._functions_registered.pop(worker_id, None)
+            self._times_heard.pop(worker_id, None)
+            self._forget_cancelling_calls(worker_id)
+
+            calls = [task.call for task in
+                     self._idle_tasks.pop(worker_id, dict()).values()]
+            call = self._running_calls.pop(worker_id, None)
+            if call is not None:
+                self._callbacks.unstart(call.id)
+                self._start_times.pop(call.id, None)
+                self._memory_peaks.pop(call.id, None)
+                calls.insert(0, call)
+
+            for call in calls:
+                del self._call_status_dict[call.id]
+                self._orphaned_calls[call.id] = call
+            self._condition.notify_all()
+
+    def get_orphaned_calls(self):
+        """Returns the calls that are to be issued to other workers."""
+        with self._lock:
+            return list(self._orphaned_calls.values())
+
+    def flush_outcomes(self):
+        """
+        Returns all outcomes that were processed, but not returned, yet.
+
+        This is meant for delivering the outcomes that remain after a stop.
+        """
+        with self._lock:
+            outcomes = list(self._outcomes)
+            self._outcomes.clear()
+            self._count_outcome += len(outcomes)
+            return outcomes
+
+    @stoppable
+    @stopping
+    def stop(self, reason=None):
+        """Stops this status database, waking up all waiting threads."""
+        # let the receiving thread finish what it is doing
+        self._transport.post(_Wakeup())
+        if self._thread is not current_thread():
+            self._thread.join()
+
+        with self._condition:
+            # orphaned calls will not be issued to any worker anymore
+            for call in self._orphaned_calls.values():
+                self._lay_off(worker_id=None, call=call, reason=reason)
+            self._orphaned_calls.clear()
+            self._condition.notify_all()
+        self._call_outcome_callbacks()
 
     @property
     def outcomes_awaited(self):
@@ -329,8 +743,8 @@ class StatusDB(Stoppable):
             if self._stopped:
                 return 0
 
-            # Note that we use the start count instead of the the task count.
-            # Some issued tasks might never get started if a stop occurs.
-            # In that case, no worker will start them.
-            # Thus await only started tasks to have a result.
-            return self._count_start - self._count_outcome
+            # Note that we use the task count instead of the the start count.
+            # Each issued task was sent to a worker of its own.
+            # If that worker gets laid off, the layoff reports the task.
+            # Thus await an outcome for every issued task.
+            return self._count_task - self._count_outcome
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+Database of tasks on a shared filesystem that any number of workers claim.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import pickle
+import sqlite3
+import time
+import uuid
+from threading import Lock
+
+# First Party
+from metaopt.concurrent.model.call_lifecycle import Error, Result, Start
+
+# states of the tasks in the database
+IDLE = 0
+RUNNING = 1
+
+# kinds of the events workers record for the invoker
+KIND_START = 0
+KIND_RESULT = 1
+KIND_ERROR = 2
+
+_KINDS = {KIND_START: Start, KIND_RESULT: Result, KIND_ERROR: Error}
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value)",
+    "CREATE TABLE IF NOT EXISTS functions (id INTEGER PRIMARY KEY, "
+    "function BLOB)",
+    "CREATE TABLE IF NOT EXISTS tasks (id INTEGER PRIMARY KEY, "
+    "function INTEGER, args BLOB, state INTEGER, worker TEXT, expiry REAL)",
+    "CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, expiry)",
+    "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "task INTEGER, kind INTEGER, worker TEXT, value BLOB)",
+]
+
+
+class Closed(object):
+    """Returned by claims once the invoker closed the queue."""
+
+
+def _dumps(value):
+    """Returns the given value pickled for a BLOB column."""
+    return sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def _loads(blob):
+    """Returns the value pickled into the given BLOB column."""
+    if blob is None:
+        return None
+    return pickle.loads(bytes(blob))
+
+
+class TaskDB(object):
+    """
+    Database of tasks on a shared filesystem that any number of workers claim.
+
+    Stores the tasks, starts and outcomes of the call life cycle in an SQLite
+    file. The invoker opens the queue and puts tasks into it. Workers on any
+    machine mounting the file claim one task at a time with a lease, which
+    they renew while executing it. The tasks of workers whose lease expired
+    get claimed by others. Starts and outcomes go into a log of events the
+    invoker fetches.
+
+    All access takes SQLite's file lock. So the filesystem has to support
+    POSIX locks and the clocks of the machines should agree within a small
+    fraction of the lease.
+
+    Leases cover workers that die or stall while executing a call, i.e.
+    between transactions. A process suspended in the middle of a transaction
+    keeps holding the lock, though, e.g. a stopped process or a frozen
+    machine. Then every other access waits for it, for up to TIMEOUT
+    seconds each, and fails with sqlite3.OperationalError after that. Kill
+    such processes rather than suspending them.
+    """
+
+    # seconds to wait for the file lock of other processes
+    TIMEOUT = 60.0
+
+    def __init__(self, path):
+        """
+        :param path: Path of the database file, created if needed.
+        """
+        super(TaskDB, self).__init__()
+
+        self._path = path
+
+        # Invokers use the connection from several threads.
+        # So serialize the access by a lock.
+        self._connection = sqlite3.connect(path, timeout=self.TIMEOUT,
+                                           isolation_level=None,
+                                           check_same_thread=False)
+        self._lock = Lock()
+
+        with self._transaction() as cursor:
+            for statement in _SCHEMA:
+                cursor.execute(statement)
+
+    @property
+    def path(self):
+        """Property for the path of the database file."""
+        return self._path
+
+    def _transaction(self):
+        """Returns a context manager for a transaction taking the lock."""
+        return _Transaction(self._connection, self._lock)
+
+    @staticmethod
+    def _get_setting(cursor, key):
+        """Returns the value of the given setting, if any."""
+        row = cursor.execute("SELECT value FROM settings WHERE key = ?",
+                             (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def open(self, lease):
+        """
+        Opens the queue for a new optimization, dropping all previous tasks.
+
+        :param lease: Seconds a claimed task is leased for at a time.
+        """
+        with self._transaction() as cursor:
+            for table in ["functions", "tasks", "events"]:
+                cursor.execute("DELETE FROM %s" % table)
+            cursor.executemany("INSERT OR REPLACE INTO settings VALUES (?, ?)",
+                               [("open", 1), ("lease", lease),
+                                ("session", uuid.uuid4().hex)])
+
+    def close(self):
+        """Closes the queue, dropping all tasks. Workers stop claiming."""
+        with self._transaction() as cursor:
+            cursor.execute("INSERT OR REPLACE INTO settings VALUES (?, ?)",
+                           ("open", 0))
+            cursor.execute("DELETE FROM tasks")
+
+    def is_closed(self):
+        """Returns whether the queue was opened and closed again."""
+        with self._transaction() as cursor:
+            return self._get_setting(cursor, "open") == 0
+
+    def put_function(self, function_id, function):
+        """Stores the given registration of a function by its short id."""
+        with self._transaction() as cursor:
+            cursor.execute("INSERT INTO functions VALUES (?, ?)",
+                           (function_id, _dumps(function)))
+
+    def put_tasks(self, tasks):
+        """
+        Puts the given tasks into the queue.
+
+        :param tasks: Triples of call id, function id and the raw arguments.
+        """
+        with self._transaction() as cursor:
+            cursor.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?, NULL, NULL)",
+                [(call_id, function_id, _dumps(args), IDLE)
+                 for call_id, function_id, args in tasks])
+
+    def cancel(self, call_id):
+        """Drops the task of the given call, returns whether there was one."""
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM tasks WHERE id = ?", (call_id,))
+            return cursor.rowcount > 0
+
+    def fetch_events(self):
+        """Returns and forgets the starts and outcomes recorded by workers."""
+        with self._transaction() as cursor:
+            rows = cursor.execute("SELECT id, task, kind, worker, value "
+                                  "FROM events ORDER BY id").fetchall()
+            if rows:
+                cursor.execute("DELETE FROM events WHERE id <= ?",
+                               (rows[-1][0],))
+        return [(call_id, _KINDS[kind], worker_id, _loads(value))
+                for _, call_id, kind, worker_id, value in rows]
+
+    def claim(self, worker_id):
+        """
+        Claims the oldest task whose lease expired or the next idle one.
+
+        Returns the session of the queue, its lease and the id, function id
+        and raw arguments of the claimed task. Returns None if there is no
+        task and :class:`Closed` if the queue is closed.
+        """
+        now = time.time()
+        with self._transaction() as cursor:
+            is_open = self._get_setting(cursor, "open")
+            if is_open == 0:
+                return Closed
+            if is_open is None:
+                # The invoker did not open the queue, yet.
+                return None
+            lease = self._get_setting(cursor, "lease")
+            session = self._get_setting(cursor, "session")
+
+            row = cursor.execute(
+                "SELECT id, function, args FROM tasks "
+                "WHERE state = ? AND expiry < ? ORDER BY expiry LIMIT 1",
+                (RUNNING, now)).fetchone()
+            if row is None:
+                row = cursor.execute(
+                    "SELECT id, function, args FROM tasks "
+                    "WHERE state = ? ORDER BY id LIMIT 1",
+                    (IDLE,)).fetchone()
+            if row is None:
+                return None
+
+            call_id, function_id, args = row
+            cursor.execute("UPDATE tasks SET state = ?, worker = ?, "
+                           "expiry = ? WHERE id = ?",
+                           (RUNNING, worker_id, now + lease, call_id))
+            cursor.execute("INSERT INTO events (task, kind, worker, value) "
+                           "VALUES (?, ?, ?, NULL)",
+                           (call_id, KIND_START, worker_id))
+        return session, lease, call_id, function_id, _loads(args)
+
+    def get_function(self, function_id):
+        """Returns the registration of the function given by short id."""
+        with self._transaction() as cursor:
+            row = cursor.execute("SELECT function FROM functions "
+                                 "WHERE id = ?", (function_id,)).fetchone()
+        if row is None:
+            raise KeyError("No function registered for ID %s" % function_id)
+        return _loads(row[0])
+
+    def renew(self, worker_id, call_id, lease):
+        """
+        Renews the lease of the given worker on the given call.
+
+        Returns False if the worker lost the call, i.e. it was cancelled or
+        claimed by another worker after the lease expired.
+        """
+        with self._transaction() as cursor:
+            cursor.execute("UPDATE tasks SET expiry = ? "
+                           "WHERE id = ? AND worker = ?",
+                           (time.time() + lease, call_id, worker_id))
+            return cursor.rowcount > 0
+
+    def report(self, outcome):
+        """
+        Records the given result or error of a call for the invoker.
+
+        Drops the outcome if the worker lost the call meanwhile.
+        """
+        kind = KIND_RESULT if isinstance(outcome, Result) else KIND_ERROR
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM tasks WHERE id = ? AND worker = ?",
+                           (outcome.call.id, outcome.worker_id))
+            if cursor.rowcount == 0:
+                return False
+            cursor.execute("INSERT INTO events (task, kind, worker, value) "
+                           "VALUES (?, ?, ?, ?)",
+                           (outcome.call.id, kind, outcome.worker_id,
+                            _dumps(outcome.value)))
+            return True
+
+    def close_connection(self):
+        """Closes our connection to the database file."""
+        with self._lock:
+            self._connection.close()
+
+
+class _Transaction(object):
+    """Context manager for a transaction holding the database's file lock."""
+
+    def __init__(self, connection, lock):
+        self._connection = connection
+        self._lock = lock
+        self._cursor = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            self._cursor = self._connection.cursor()
+            # take the write lock right away, so that claims do not race
+            self._cursor.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._cursor
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self._cursor.execute("COMMIT")
+            else:
+                self._cursor.execute("ROLLBACK")
+        finally:
+            self._cursor.close()
+            self._lock.release()
@@ -13,8 +13,14 @@ from collections import namedtuple
 # data structure for tasks given to the workers
 Call = namedtuple("Call", ["id", "function", "args", "kwargs", "param_spec", "return_spec"])
 
+# data structure for registering a function with a worker once
+# calls issued to the worker afterwards refer to it by its short id
+Function = namedtuple("Function", ["id", "function", "param_spec",
+                                   "return_spec"])
+
 # data structure for declaring a task is idle before being executed by a worker
-Task = namedtuple("Task", ["call"])
+# the worker given by id is the one the task was issued to
+Task = namedtuple("Task", ["worker_id", "call"])
 
 # data structure for declaring the start of an execution by the workers
 Start = namedtuple("Start", ["worker_id", "call"])
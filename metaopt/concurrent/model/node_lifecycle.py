@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Models for message exchanges between coordinators and worker nodes.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+from collections import namedtuple
+
+
+# data structure for a node offering workers to the coordinator
+Offer = namedtuple("Offer", ["node_id", "worker_ids"])
+
+# data structure for dismissing a worker, its node replaces it by a new one
+Dismiss = namedtuple("Dismiss", ["worker_id"])
+
+# data structure for a message to a worker, relayed by the worker's node
+Parcel = namedtuple("Parcel", ["worker_id", "message"])
+
+# data structure for declaring the sender is alive, even if it is idle
+Heartbeat = namedtuple("Heartbeat", ["node_id"])
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+Package of transports between invokers and their workers.
+"""
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Abstract transport defining the API of transport implementations.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import abc
+
+
+class BaseTransport(object):
+    """
+    Abstract transport defining the API of transport implementations.
+
+    Transports carry messages between an invoker and its workers. Each worker
+    is connected by a channel of its own, so the invoker decides which worker
+    gets which task. Messages from all workers arrive at a single point, where
+    the invoker may also post messages to itself, e.g. for layoffs.
+    """
+
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    def __init__(self):
+        super(BaseTransport, self).__init__()
+
+    @abc.abstractmethod
+    def connect(self, worker_id):
+        """
+        Opens a channel to the worker given by id.
+
+        A concurrently blocking receive also receives from the new channel.
+
+        :param worker_id: ID of the worker to connect.
+
+        :rtype: The worker's end of the channel.
+        """
+        del worker_id
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def disconnect(self, worker_id):
+        """
+        Closes the channel to the worker given by id, if any.
+
+        :param worker_id: ID of the worker to disconnect.
+
+        :rtype: None
+        """
+        del worker_id
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def send(self, worker_id, message):
+        """
+        Sends a message to the worker given by id.
+
+        Raises KeyError if the worker is not connected.
+
+        :param worker_id: ID of the receiving worker.
+        :param message: Message to send.
+
+        :rtype: None
+        """
+        del worker_id
+        del message
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def post(self, message):
+        """
+        Posts a message to the receiving end of this transport.
+
+        :param message: Message to post.
+
+        :rtype: None
+        """
+        del message
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def receive(self, timeout=None):
+        """
+        Blocks till a message from any worker or a posted message arrives.
+
+        :param timeout: Seconds to wait at most, waits forever if None.
+
+        :rtype: The message or None if none arrived in time.
+        """
+        del timeout
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def close(self):
+        """
+        Closes all channels of this transport.
+
+        :rtype: None
+        """
+        raise NotImplementedError()
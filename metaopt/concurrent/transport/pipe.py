@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Transport that connects each worker by a pipe of its own.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import time
+from multiprocessing import Pipe
+from threading import Lock
+
+# First Party
+from metaopt.concurrent.transport.base import BaseTransport
+from metaopt.concurrent.transport.util.wait import wait_for_connections
+
+
+class _Refresh(object):
+    """Message making a concurrent receive wait for new connections, too."""
+
+
+class PipeTransport(BaseTransport):
+    """
+    Transport that connects each worker by a pipe of its own.
+
+    Messages travel directly between the invoker's and the worker's process,
+    without a manager process in between. Since every worker writes to its own
+    pipe, terminating a worker never corrupts the channel of another worker.
+    """
+
+    def __init__(self):
+        super(PipeTransport, self).__init__()
+
+        # the invoker's ends of the pipes to all connected workers
+        self._connections = dict()
+
+        # Connections of disconnected workers.
+        # Only the receiving thread closes them, so that it never waits for a
+        # connection that got closed by another thread in the meantime.
+        self._connections_disconnected = []
+
+        # pipe for messages the invoker posts to itself
+        self._receiver_posted, self._sender_posted = Pipe(duplex=False)
+
+        # we may get used by timers in other threads, so be thread-safe
+        self._lock = Lock()
+
+        # Reading a connection from two threads at once may garble messages.
+        # So receive in one thread at a time.
+        self._lock_receive = Lock()
+
+    def connect(self, worker_id):
+        connection, worker_connection = Pipe()
+        with self._lock:
+            self._connections[worker_id] = connection
+            # a concurrent receive does not wait for this connection, yet
+            self._sender_posted.send(_Refresh())
+        return worker_connection
+
+    def disconnect(self, worker_id):
+        with self._lock:
+            try:
+                connection = self._connections.pop(worker_id)
+            except KeyError:
+                # The worker was disconnected already.
+                # That is OK, there is nothing left to do.
+                return
+            self._connections_disconnected.append(connection)
+
+    def send(self, worker_id, message):
+        with self._lock:
+            connection = self._connections[worker_id]
+        connection.send(message)
+
+    def post(self, message):
+        with self._lock:
+            self._sender_posted.send(message)
+
+    def receive(self, timeout=None):
+        with self._lock_receive:
+            return self._receive(timeout=timeout)
+
+    def _receive(self, timeout):
+        """Receives one message, assuming no other thread is receiving."""
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        while True:
+            with self._lock:
+                for connection in self._connections_disconnected:
+                    connection.close()
+                self._connections_disconnected = []
+                connections = list(self._connections.values())
+
+            # posted messages come first, they stem from terminated workers
+            connections.insert(0, self._receiver_posted)
+
+            if timeout is not None:
+                timeout = max(0, deadline - time.time())
+            connections_readable = wait_for_connections(connections, timeout)
+            if not connections_readable:
+                return None
+
+            for connection in connections_readable:
+                try:
+                    message = connection.recv()
+                except (EOFError, IOError):
+                    # The worker at the other end terminated.
+                    # Its layoff gets reported by whoever terminated it.
+                    self._forget(connection)
+                    continue
+                if isinstance(message, _Refresh):
+                    # the connections changed, so wait for the new ones
+                    break
+                return message
+
+    def _forget(self, connection):
+        """Drops a connection whose other end is gone."""
+        with self._lock:
+            for worker_id, candidate in list(self._connections.items()):
+                if candidate is connection:
+                    del self._connections[worker_id]
+        connection.close()
+
+    def close(self):
+        with self._lock:
+            connections = list(self._connections.values()) + \
+                self._connections_disconnected
+            self._connections = dict()
+            self._connections_disconnected = []
+        for connection in connections:
+            connection.close()
+        self._receiver_posted.close()
+        self._sender_posted.close()
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+Transport that connects workers on other machines via TCP.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+import socket
+import time
+from multiprocessing import AuthenticationError, Pipe
+from multiprocessing.connection import answer_challenge, deliver_challenge
+from threading import Lock, Thread
+
+try:
+    from multiprocessing.connection import Connection  # Python 3
+except ImportError:
+    from _multiprocessing import Connection  # Python 2
+
+# First Party
+from metaopt.concurrent.model.node_lifecycle import Dismiss, Heartbeat, \
+    Offer, Parcel
+from metaopt.concurrent.transport.base import BaseTransport
+from metaopt.concurrent.transport.util.authkey import determine_authkey
+from metaopt.concurrent.transport.util.wait import wait_for_connections
+
+
+class _Refresh(object):
+    """Message making a concurrent receive wait for new connections, too."""
+
+
+class _Node(object):
+    """A worker node connected to us and the workers it offered."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.node_id = None
+        self.worker_ids = set()
+
+        # time of the latest message from the node
+        self.seen = time.time()
+
+
+def _to_connection(sock):
+    """Returns a connection for pickled messages over the given socket."""
+    try:
+        return Connection(sock.detach())
+    except AttributeError:
+        # Sockets of Python 2 can not be detached, so use a duplicate.
+        connection = Connection(os.dup(sock.fileno()))
+        sock.close()
+        return connection
+
+
+class TCPTransport(BaseTransport):
+    """
+    Transport that connects workers on other machines via TCP.
+
+    Worker nodes connect to us, authenticated by a key we share with them.
+    Each node offers a number of workers, which get connected as the employer
+    employs them. All messages to and from the workers of a node travel
+    through the node's connection.
+
+    Nodes send heartbeats while idle, which we answer. A node that went
+    silent for too long is lost, just like one whose connection broke. The
+    employer learns of both by the handlers it sets.
+    """
+
+    # seconds of silence after which a node is considered lost
+    HEARTBEAT_TIMEOUT = 10.0
+
+    def __init__(self, address=("localhost", 0), authkey=None,
+                 heartbeat_timeout=None):
+        """
+        :param address: Host and port to listen on for nodes. Listens on an
+                        arbitrary free port of the local host, by default.
+        :param authkey: Key shared with the nodes. Defaults to the value of
+                        the environment variable METAOPT_AUTHKEY.
+        :param heartbeat_timeout: Seconds of silence after which a node is
+                                  considered lost.
+        """
+        super(TCPTransport, self).__init__()
+
+        self._authkey = determine_authkey(authkey)
+        self._heartbeat_timeout = heartbeat_timeout or self.HEARTBEAT_TIMEOUT
+
+        # called with the ids of the workers offered by or lost with a node
+        self._offer_handler = None
+        self._loss_handler = None
+
+        # connected nodes, the nodes of offered workers and connected workers
+        self._nodes = []
+        self._offers = dict()
+        self._routes = dict()
+
+        # connections of lost nodes, only closed by the receiving thread
+        self._connections_lost = []
+
+        # pipe for messages the invoker posts to itself
+        self._receiver_posted, self._sender_posted = Pipe(duplex=False)
+
+        # we may get used by timers in other threads, so be thread-safe
+        self._lock = Lock()
+
+        # Messages to a node come from several threads, do not interleave them.
+        self._lock_send = Lock()
+
+        # Reading a connection from two threads at once may garble messages.
+        # So receive in one thread at a time.
+        self._lock_receive = Lock()
+
+        self._closed = False
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(address)
+        self._socket.listen(16)
+
+        self._thread = Thread(target=self._accept_all)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def address(self):
+        """Property for the host and port nodes connect to."""
+        return self._socket.getsockname()
+
+    def set_handlers(self, offer_handler, loss_handler):
+        """
+        Sets the functions to call with the ids of the workers offered by a
+        node and of the workers lost with a node.
+
+        Calls the offer handler right away for the workers offered so far.
+        """
+        with self._lock:
+            self._offer_handler = offer_handler
+            self._loss_handler = loss_handler
+            worker_ids = list(self._offers)
+
+        if worker_ids:
+            offer_handler(worker_ids)
+
+    def _accept_all(self):
+        """Accepts nodes till closed."""
+        while True:
+            try:
+                sock, _ = self._socket.accept()
+            except (IOError, OSError):
+                # The socket got closed.
+                # So there are no more nodes to accept.
+                return
+
+            # A peer that does not answer must not keep others from joining.
+            # So authenticate each in a thread of its own.
+            thread = Thread(target=self._admit, args=(_to_connection(sock),))
+            thread.daemon = True
+            thread.start()
+
+    def _admit(self, connection):
+        """Authenticates the given connection and adds its node."""
+        try:
+            deliver_challenge(connection, self._authkey)
+            answer_challenge(connection, self._authkey)
+        except (AuthenticationError, EOFError, IOError, OSError):
+            # The peer does not know the key or hung up.
+            # So do not let it in.
+            connection.close()
+            return
+
+        with self._lock:
+            if self._closed:
+                connection.close()
+                return
+            self._nodes.append(_Node(connection))
+            # a concurrent receive does not wait for this connection, yet
+            self._sender_posted.send(_Refresh())
+
+    def _send(self, node, message):
+        """Sends the given message to the given node."""
+        try:
+            with self._lock_send:
+                node.connection.send(message)
+        except (IOError, OSError):
+            # The node is gone.
+            # The receiving thread notices and reports its loss.
+            pass
+
+    def connect(self, worker_id):
+        """
+        Routes the messages for the offered worker given by id to its node.
+
+        Raises KeyError if the worker's node was lost in the meantime.
+
+        :rtype: None, the worker's end of the channel is on its node.
+        """
+        with self._lock:
+            node = self._offers.pop(worker_id)
+            self._routes[worker_id] = node
+
+    def disconnect(self, worker_id):
+        """Dismisses the worker given by id, its node replaces it."""
+        with self._lock:
+            node = self._routes.pop(worker_id, None)
+            if node is None:
+                # The worker was disconnected already.
+                # That is OK, there is nothing left to do.
+                return
+            node.worker_ids.discard(worker_id)
+        self._send(node, Dismiss(worker_id=worker_id))
+
+    def send(self, worker_id, message):
+        with self._lock:
+            node = self._routes[worker_id]
+        self._send(node, Parcel(worker_id=worker_id, message=message))
+
+    def post(self, message):
+        with self._lock:
+            self._sender_posted.send(message)
+
+    def receive(self, timeout=None):
+        with self._lock_receive:
+            return self._receive(timeout=timeout)
+
+    def _receive(self, timeout):
+        """Receives one message, assuming no other thread is receiving."""
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        while True:
+            with self._lock:
+                for connection in self._connections_lost:
+                    connection.close()
+                self._connections_lost = []
+                nodes = list(self._nodes)
+
+            now = time.time()
+            nodes_silent = [node for node in nodes
+                            if now - node.seen > self._heartbeat_timeout]
+            for node in nodes_silent:
+                self._lose(node)
+            nodes = [node for node in nodes if node not in nodes_silent]
+
+            # wake up in time for the next node to become silent
+            timeout_wait = None
+            if nodes:
+                timeout_wait = max(0, min(node.seen for node in nodes) +
+                                   self._heartbeat_timeout - now)
+            if timeout is not None:
+                timeout_remaining = max(0, deadline - now)
+                if timeout_wait is None or timeout_remaining < timeout_wait:
+                    timeout_wait = timeout_remaining
+
+            # posted messages come first, they stem from terminated workers
+            connections = [self._receiver_posted] + \
+                [node.connection for node in nodes]
+            connections_readable = wait_for_connections(connections,
+                                                        timeout_wait)
+            if not connections_readable:
+                if timeout is not None and time.time() >= deadline:
+                    return None
+                continue
+
+            for connection in connections_readable:
+                if connection is self._receiver_posted:
+                    message = connection.recv()
+                    if isinstance(message, _Refresh):
+                        # the connections changed, so wait for the new ones
+                        break
+                    return message
+
+                node = nodes[connections.index(connection) - 1]
+                try:
+                    message = connection.recv()
+                except (EOFError, IOError, OSError):
+                    # The node terminated or its machine went away.
+                    self._lose(node)
+                    continue
+
+                node.seen = time.time()
+                if isinstance(message, Heartbeat):
+                    self._send(node, Heartbeat(node_id=None))
+                elif isinstance(message, Offer):
+                    self._offer(node, message)
+                else:
+                    return message
+
+    def _offer(self, node, offer):
+        """Takes note of the workers the given node offered."""
+        with self._lock:
+            node.node_id = offer.node_id
+            node.worker_ids.update(offer.worker_ids)
+            for worker_id in offer.worker_ids:
+                self._offers[worker_id] = node
+            handler = self._offer_handler
+
+        if handler is not None:
+            handler(list(offer.worker_ids))
+
+    def _lose(self, node):
+        """Drops the given node and reports its workers as lost."""
+        with self._lock:
+            if node not in self._nodes:
+                return
+            self._nodes.remove(node)
+            for worker_id in node.worker_ids:
+                self._offers.pop(worker_id, None)
+                self._routes.pop(worker_id, None)
+            self._connections_lost.append(node.connection)
+            handler = self._loss_handler
+
+        if handler is not None:
+            handler(list(node.worker_ids))
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            connections = [node.connection for node in self._nodes] + \
+                self._connections_lost
+            self._nodes = []
+            self._offers = dict()
+            self._routes = dict()
+            self._connections_lost = []
+
+        # wakes up the accepting thread, closing alone does not on Linux
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except (IOError, OSError):
+            pass
+        self._socket.close()
+
+        for connection in connections:
+            connection.close()
+        self._receiver_posted.close()
+        self._sender_posted.close()
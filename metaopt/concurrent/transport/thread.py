@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Transport that connects workers running in threads of the invoker's process.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+from threading import Lock
+
+try:
+    from queue import Empty, Queue  # Python 3
+except ImportError:
+    from Queue import Empty, Queue  # Python 2
+
+# First Party
+from metaopt.concurrent.transport.base import BaseTransport
+
+
+class _Closed(object):
+    """Message making the worker's end of a closed channel raise EOFError."""
+
+
+class ThreadConnection(object):
+    """
+    The worker's end of a channel between threads.
+
+    Behaves like the end of a pipe. Sending raises IOError and receiving
+    raises EOFError, once the channel got closed.
+    """
+
+    def __init__(self, queue_invoker):
+        """
+        :param queue_invoker: Queue of the messages to the invoker
+        """
+        self._queue = Queue()
+        self._queue_invoker = queue_invoker
+        self._closed = False
+
+    def send(self, message):
+        """Sends the given message to the invoker."""
+        if self._closed:
+            raise IOError("The connection was closed.")
+        self._queue_invoker.put(message)
+
+    def recv(self):
+        """Blocks till a message from the invoker arrives and returns it."""
+        message = self._queue.get()
+        if isinstance(message, _Closed):
+            # wake up any other receiver, too
+            self._queue.put(message)
+            raise EOFError("The connection was closed.")
+        return message
+
+    def deliver(self, message):
+        """Delivers the given message from the invoker to the worker."""
+        self._queue.put(message)
+
+    def close(self):
+        """Closes this channel for both ends."""
+        self._closed = True
+        self._queue.put(_Closed())
+
+
+class ThreadTransport(BaseTransport):
+    """
+    Transport that connects workers running in threads of the invoker's
+    process.
+
+    Messages are passed by reference through queues, so nothing gets pickled
+    or copied.
+    """
+
+    def __init__(self):
+        super(ThreadTransport, self).__init__()
+
+        # the connections to all connected workers
+        self._connections = dict()
+
+        # queue of the messages from the workers and the ones posted
+        self._queue = Queue()
+
+        # we may get used by timers in other threads, so be thread-safe
+        self._lock = Lock()
+
+    def connect(self, worker_id):
+        connection = ThreadConnection(queue_invoker=self._queue)
+        with self._lock:
+            self._connections[worker_id] = connection
+        return connection
+
+    def disconnect(self, worker_id):
+        with self._lock:
+            try:
+                connection = self._connections.pop(worker_id)
+            except KeyError:
+                # The worker was disconnected already.
+                # That is OK, there is nothing left to do.
+                return
+        connection.close()
+
+    def send(self, worker_id, message):
+        with self._lock:
+            connection = self._connections[worker_id]
+        connection.deliver(message)
+
+    def post(self, message):
+        self._queue.put(message)
+
+    def receive(self, timeout=None):
+        try:
+            return self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def close(self):
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections = dict()
+        for connection in connections:
+            connection.close()
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Utility to determine the key authenticating nodes and coordinators.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+
+# environment variable holding the key, if it is not given explicitly
+AUTHKEY_VARIABLE = "METAOPT_AUTHKEY"
+
+
+def determine_authkey(authkey=None):
+    """
+    Determines the key shared by a coordinator and its worker nodes.
+
+    Falls back to the environment variable METAOPT_AUTHKEY, which keeps the
+    key out of process listings. Raises ValueError if there is no key.
+
+    :rtype: The key as bytes.
+    """
+    if authkey is None:
+        authkey = os.environ.get(AUTHKEY_VARIABLE)
+    if not authkey:
+        raise ValueError("Connecting nodes requires an authentication key. "
+                         "Pass one or set %s." % AUTHKEY_VARIABLE)
+    if not isinstance(authkey, bytes):
+        authkey = authkey.encode("utf-8")
+    return authkey
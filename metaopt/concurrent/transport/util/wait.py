@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Utility to wait for any of multiple connections to become readable.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import select
+
+
+try:
+    from multiprocessing.connection import wait
+except ImportError:
+    # multiprocessing.connection.wait was added in Python 3.3
+    wait = None
+
+
+def wait_for_connections(connections, timeout=None):
+    """
+    Blocks till at least one of the given connections is readable.
+
+    :param connections: Connections to wait for.
+    :param timeout: Seconds to wait at most, waits forever if None.
+
+    :rtype: List of the connections that are readable, empty on timeout.
+    """
+    if wait is not None:
+        return wait(connections, timeout)
+
+    # Connections are backed by file descriptors on POSIX systems.
+    readable, _, _ = select.select(connections, [], [], timeout)
+    return readable
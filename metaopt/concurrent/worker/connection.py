@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Worker implementation that executes the tasks it receives from a connection.
+"""
+
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import pickle
+import time
+import traceback
+from pickle import PicklingError
+from tempfile import TemporaryFile
+from threading import Condition, Thread
+
+# First Party
+from metaopt.concurrent.model.call_lifecycle import Error, Function, Result, \
+    Start
+from metaopt.concurrent.worker.util.context import set_context
+from metaopt.concurrent.worker.util.exception import CallCancelledError
+from metaopt.concurrent.worker.worker import Worker
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.call.call import call, call_batch
+from metaopt.core.call.util.batch import BatchArgs
+
+
+class ConnectionWorker(Worker):
+    """
+    Worker implementation that executes the tasks it receives from a
+    connection.
+
+    It calls functions with arguments, both of which it gets from a connection.
+    The connection carries lists of tasks, which get executed in order. The
+    functions of the calls arrive once, ahead of the first task calling them.
+    Calls carry the raw values of their args, results carry raw values, too.
+    Before executing any task, the worker runs the initializer, if given, and
+    makes its return value the context of the process.
+
+    Starts and outcomes get reported per call. Once calls turn out to take
+    less than CHUNK_SECONDS on average, the reports of all tasks of a list
+    but the first travel together in a single list, too. No report is held
+    back for longer than CHUNK_SECONDS, so that the start of a slow call
+    among fast ones still arrives while it runs.
+    """
+
+    # mean seconds per call below which reports get sent in chunks
+    CHUNK_SECONDS = 0.002
+
+    # weight of the latest call in the mean call duration
+    DURATION_WEIGHT = 0.2
+
+    def __init__(self, worker_id, connection, initializer=None, initargs=()):
+        """
+        :param worker_id: ID of this worker
+        :param connection: The worker's end of a transport channel
+        :param initializer: Function to call once before executing tasks
+        :param initargs: Arguments to call the initializer with
+        """
+        super(ConnectionWorker, self).__init__()
+        self._worker_id = worker_id
+        self._connection = connection
+        self._initializer = initializer
+        self._initargs = initargs
+
+        # exception raised by the initializer, raised for every call then
+        self._error_initializer = None
+
+        # functions registered with this worker by their short ids
+        self._functions = dict()
+
+        # id of the call being executed, if any
+        self._call_id = None
+
+        # mean duration of the calls executed so far, None if none
+        self._duration_mean = None
+
+        # reports held back to send as one list, the time the first of them
+        # was held back at, and the thread sending them when they get late
+        self._reports = []
+        self._time_held = None
+        self._condition_reports = Condition()
+        self._running = False
+
+    @property
+    def worker_id(self):
+        """Property for the worker_id attribute of this class."""
+        return self._worker_id
+
+    def run(self):
+        """Makes this worker execute all tasks incoming from the connection."""
+
+        self._initialize()
+
+        self._running = True
+        thread_reports = Thread(target=self._send_late_reports)
+        thread_reports.daemon = True
+        thread_reports.start()
+
+        try:
+            while True:
+                try:
+                    # get tasks from the connection, execute calls and report
+                    messages = self._connection.recv()
+                    self._execute_all(messages)
+                except (EOFError, IOError):
+                    # the connection was closed by the invoker, so terminate
+                    break
+        finally:
+            with self._condition_reports:
+                self._running = False
+                self._condition_reports.notify()
+
+    def _execute_all(self, messages):
+        """
+        Registers the functions and executes the tasks of the given messages.
+
+        Reports each start and outcome right away, unless calls are fast.
+        Then the reports of the tasks after the first are held back and sent
+        as one list when all are done, or when they get late.
+        """
+        holding = False
+        for message in messages:
+            if isinstance(message, Function):
+                self._functions[message.id] = message
+                continue
+            task = message
+
+            start = Start(worker_id=self._worker_id, call=task.call)
+            if holding:
+                self._hold(start)
+            else:
+                self._connection.send(start)
+
+            time_start = time.time()
+            outcome = self._execute(task)
+            self._measure(time.time() - time_start)
+
+            if holding:
+                self._hold(outcome)
+            else:
+                self._connection.send(outcome)
+                holding = self._duration_mean < self.CHUNK_SECONDS
+
+        with self._condition_reports:
+            self._send_held()
+
+    def _hold(self, report):
+        """Holds back the given report, to send it along with others."""
+        with self._condition_reports:
+            if not self._reports:
+                self._time_held = time.time()
+                # let the thread sending late reports know when they get late
+                self._condition_reports.notify()
+            self._reports.append(report)
+
+    def _send_held(self):
+        """Sends the reports held back as one list, if any."""
+        if self._reports:
+            reports, self._reports = self._reports, []
+            self._connection.send(reports)
+
+    def _send_late_reports(self):
+        """
+        Sends the reports held back as soon as the first of them was held back
+        for CHUNK_SECONDS, e.g. the start of a call that turned out slow.
+        """
+        with self._condition_reports:
+            while self._running:
+                if not self._reports:
+                    self._condition_reports.wait()
+                    continue
+
+                time_left = self._time_held + self.CHUNK_SECONDS - time.time()
+                if time_left > 0:
+                    self._condition_reports.wait(time_left)
+                    continue
+
+                try:
+                    self._send_held()
+                except (EOFError, IOError):
+                    # the connection was closed by the invoker
+                    return
+
+    def _measure(self, duration):
+        """Updates the mean call duration by the given one."""
+        if self._duration_mean is None:
+            self._duration_mean = duration
+        else:
+            self._duration_mean += self.DURATION_WEIGHT * \
+                (duration - self._duration_mean)
+
+    def _initialize(self):
+        """Sets the context of this process by calling the initializer."""
+        if self._initializer is None:
+            return
+
+        try:
+            set_context(self._initializer(*self._initargs))
+        except Exception as error:
+            # Without the context, calls would fail in obscure ways.
+            # So fail them all with the initializer's error.
+            self._error_initializer = error
+
+    @staticmethod
+    def _decode_args(registration, values):
+        """Returns args of the registered function for the given values."""
+        if not isinstance(values, tuple):
+            # the invoker sent other arguments than args as they are
+            return values
+        param_spec = registration.param_spec or \
+            registration.function.param_spec
+        return ArgsCreator(param_spec).args(values)
+
+    def _call(self, registration, args):
+        """
+        Calls the registered function with the given encoded args.
+
+        Returns the raw return values, a list of them for a batch call.
+        """
+        function = registration.function
+        if isinstance(args, BatchArgs):
+            fargs_list = [self._decode_args(registration, values)
+                          for values in args]
+            values = call_batch(f=function, fargs_list=fargs_list,
+                                param_spec=registration.param_spec or
+                                function.param_spec,
+                                return_spec=registration.return_spec)
+            return [value.raw_values for value in values]
+
+        fargs = self._decode_args(registration, args)
+        try:
+            value = call(f=function, fargs=fargs,
+                         param_spec=registration.param_spec,
+                         return_spec=registration.return_spec)
+        except AttributeError:
+            # function had no return type specification
+            value = call(f=function, fargs=fargs,
+                         param_spec=function.param_spec)
+        return value.raw_values
+
+    def _execute(self, task):
+        """Executes the given task and returns its outcome."""
+
+        # make the actual call
+        registration = self._functions[task.call.function]
+        try:
+            # from now on the call may get cancelled
+            self._call_id = task.call.id
+            if self._error_initializer is not None:
+                raise self._error_initializer
+            value = self._call(registration, task.call.args)
+            self._call_id = None
+            # the invoker wraps the values in the return spec again
+            return Result(worker_id=self._worker_id, call=task.call,
+                          value=value)
+        except (Exception, CallCancelledError) as value:
+            self._call_id = None
+
+            # the objective function may raise any exception
+            # we can not do anything more helpful than propagate the exception
+            # we need to send the exception to the main process via a pipe
+            # we need to make sure the exception is pickleable for the pipe
+            # so test pickleability and fall back to sending the exception
+
+            with TemporaryFile() as tmp_file:
+                try:
+                    pickle.dump(value, tmp_file)
+                except PicklingError:
+                    value = traceback.format_exc()
+
+            return Error(worker_id=self._worker_id, call=task.call,
+                         value=value)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Node that runs worker processes for a coordinator on another machine.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import time
+import uuid
+from multiprocessing.connection import Client
+from threading import Lock, Thread
+
+# First Party
+from metaopt.concurrent.employer.process import ProcessWorkerEmployer
+from metaopt.concurrent.employer.util.exception import LayoffError
+from metaopt.concurrent.model.node_lifecycle import Dismiss, Heartbeat, \
+    Offer, Parcel
+from metaopt.concurrent.transport.pipe import PipeTransport
+from metaopt.concurrent.transport.util.authkey import determine_authkey
+
+
+class _Hangup(object):
+    """Message posted to stop relaying the messages of our workers."""
+
+
+class WorkerNode(object):
+    """
+    Node that runs worker processes for a coordinator on another machine.
+
+    Connects to the coordinator and offers it one worker process per CPU or
+    as many as given. Relays the tasks from the coordinator to the workers and
+    their messages back. Sends heartbeats while idle and hangs up as soon as
+    the coordinator hung up or went silent.
+    """
+
+    # seconds between heartbeats and of silence after which we hang up
+    HEARTBEAT_INTERVAL = 1.0
+    HEARTBEAT_TIMEOUT = 10.0
+
+    # seconds to retry connecting to a coordinator that is not listening yet
+    CONNECT_TIMEOUT = 60.0
+
+    def __init__(self, address, authkey=None, resources=None,
+                 heartbeat_interval=None, heartbeat_timeout=None,
+                 connect_timeout=None):
+        """
+        :param address: Host and port of the coordinator.
+        :param authkey: Key shared with the coordinator. Defaults to the value
+                        of the environment variable METAOPT_AUTHKEY.
+        :param resources: Number of worker processes to offer. Defaults to the
+                          number of CPUs.
+        :param heartbeat_interval: Seconds between heartbeats.
+        :param heartbeat_timeout: Seconds of silence of the coordinator after
+                                  which we hang up.
+        :param connect_timeout: Seconds to retry connecting for.
+        """
+        super(WorkerNode, self).__init__()
+
+        self._address = tuple(address)
+        self._authkey = determine_authkey(authkey)
+        self._resources = resources
+        self._heartbeat_interval = heartbeat_interval or \
+            self.HEARTBEAT_INTERVAL
+        self._heartbeat_timeout = heartbeat_timeout or self.HEARTBEAT_TIMEOUT
+        self._connect_timeout = connect_timeout or self.CONNECT_TIMEOUT
+
+        self._node_id = uuid.uuid4()
+
+        self._connection = None
+        self._transport = None
+        self._employer = None
+
+        # whether to stop relaying messages
+        self._hung_up = False
+
+        # Messages to the coordinator come from two threads.
+        # So do not interleave them.
+        self._lock_send = Lock()
+
+    def _connect(self):
+        """Connects to the coordinator, retrying till it listens."""
+        deadline = time.time() + self._connect_timeout
+        while True:
+            try:
+                return Client(self._address, authkey=self._authkey)
+            except (IOError, OSError):
+                # The coordinator is not listening, yet.
+                if time.time() >= deadline:
+                    raise
+                time.sleep(0.1)
+
+    def _send(self, message):
+        """Sends the given message to the coordinator."""
+        with self._lock_send:
+            self._connection.send(message)
+
+    def _offer(self, worker_ids):
+        """Offers the given workers to the coordinator."""
+        self._send(Offer(node_id=self._node_id, worker_ids=worker_ids))
+
+    def _dismiss(self, worker_id):
+        """Replaces the worker given by id by a new one."""
+        worker_ids = set(self._employer.worker_ids)
+        self._employer.lay_off_worker(worker_id=worker_id,
+                                      reason=LayoffError("Dismissed."))
+        try:
+            self._employer.employ(number_of_workers=1)
+        except IndexError:
+            # The worker was replaced already.
+            return
+        self._offer([worker_id_new for worker_id_new in
+                     self._employer.worker_ids
+                     if worker_id_new not in worker_ids])
+
+    def _relay_tasks(self):
+        """Relays the coordinator's messages to our workers till hung up."""
+        time_heard = time.time()
+        try:
+            while not self._hung_up:
+                if not self._connection.poll(self._heartbeat_interval):
+                    if time.time() - time_heard > self._heartbeat_timeout:
+                        # The coordinator went silent.
+                        break
+                    continue
+
+                time_heard = time.time()
+                message = self._connection.recv()
+                if isinstance(message, Parcel):
+                    try:
+                        self._transport.send(message.worker_id,
+                                             message.message)
+                    except KeyError:
+                        # The worker was dismissed.
+                        # Its tasks get issued to others.
+                        pass
+                elif isinstance(message, Dismiss):
+                    self._dismiss(message.worker_id)
+        except (EOFError, IOError, OSError):
+            # The coordinator hung up.
+            pass
+        finally:
+            self._hung_up = True
+            self._transport.post(_Hangup())
+
+    def run(self):
+        """Runs the workers till the coordinator hangs up."""
+        self._connection = self._connect()
+        self._transport = PipeTransport()
+        self._employer = ProcessWorkerEmployer(transport=self._transport,
+                                               status_db=None,
+                                               resources=self._resources)
+        thread = Thread(target=self._relay_tasks)
+        thread.daemon = True
+        try:
+            self._employer.employ(
+                number_of_workers=self._employer.worker_count_max)
+            self._offer(self._employer.worker_ids)
+
+            thread.start()
+            self._relay_messages()
+        finally:
+            # let the relaying thread finish before terminating the workers
+            self._hung_up = True
+            if thread.is_alive():
+                thread.join()
+
+            self._employer.abandon()
+            self._transport.close()
+            self._connection.close()
+
+    def _relay_messages(self):
+        """Relays our workers' messages to the coordinator till hung up."""
+        time_heartbeat = time.time()
+        while True:
+            message = self._transport.receive(timeout=self._heartbeat_interval)
+            if isinstance(message, _Hangup):
+                return
+
+            try:
+                if message is not None:
+                    self._send(message)
+                if time.time() - time_heartbeat >= self._heartbeat_interval:
+                    self._send(Heartbeat(node_id=self._node_id))
+                    time_heartbeat = time.time()
+            except (IOError, OSError):
+                # The coordinator hung up.
+                return
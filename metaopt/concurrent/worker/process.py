@@ -2,7 +2,7 @@
 """
 Worker implementation that that runs in an own Python Process.
 
-It calls functions with arguments, both of which it gets from a queue.
+It calls functions with arguments, both of which it gets from a connection.
 """
 
 # Future
@@ -10,93 +10,87 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
-import pickle
-import traceback
-import uuid
-from multiprocessing import Process
-from pickle import PicklingError
-from tempfile import TemporaryFile
+import os
+import signal
+from multiprocessing import Process, RawValue
 
 # First Party
-from metaopt.concurrent.model.call_lifecycle import Error, Result, Start
-from metaopt.concurrent.worker.util.import_function import import_function
-from metaopt.concurrent.worker.worker import Worker
-from metaopt.core.call.call import call
+from metaopt.concurrent.employer.util.placement import place_process
+from metaopt.concurrent.worker.connection import ConnectionWorker
+from metaopt.concurrent.worker.util.exception import CallCancelledError
 
 
-class ProcessWorker(Process, Worker):
+class ProcessWorker(ConnectionWorker, Process):
     """
     Worker implementation that that runs in an own Python Process.
 
-    It calls functions with arguments, both of which it gets from a queue.
+    It calls functions with arguments, both of which it gets from a connection.
+    The initializer's return value becomes the context of the process.
+
+    Cancelling a call raises :class:`CallCancelledError` in the objective
+    function, so that the process survives for the next task.
     """
 
-    def __init__(self, queue_outcome, queue_start, queue_tasks):
-        super(ProcessWorker, self).__init__()
-        self._worker_id = uuid.uuid4()
-        self._queue_outcome = queue_outcome
-        self._queue_start = queue_start
-        self._queue_task = queue_tasks
+    # signal asking the process to abort the call it executes
+    SIGNAL_CANCEL = signal.SIGUSR1
+
+    def __init__(self, worker_id, connection, initializer=None, initargs=(),
+                 cpus=None, threads=None):
+        """
+        :param worker_id: ID of this worker
+        :param connection: The worker's end of a transport channel
+        :param initializer: Function to call once in the worker process
+        :param initargs: Arguments to call the initializer with
+        :param cpus: CPUs to pin the process to, any if None
+        :param threads: Number of threads native thread pools of the process
+                        may use, unlimited if None
+        """
+        super(ProcessWorker, self).__init__(worker_id=worker_id,
+                                            connection=connection,
+                                            initializer=initializer,
+                                            initargs=initargs)
+
+        # placement of the process, applied before anything gets imported
+        self._cpus = cpus
+        self._threads = threads
+
+        # id of the call to abort, shared with the process
+        self._call_id_cancelled = RawValue("l", -1)
 
         self.daemon = True  # workers don't spawn processes
         self.start()
 
-    @property
-    def worker_id(self):
-        """Property for the worker_id attribute of this class."""
-        return self._worker_id
+        # The started process owns its copy of the connection.
+        # So close ours, for the invoker to notice when the process dies.
+        self._connection.close()
 
     def run(self):
-        """Makes this worker execute all tasks incoming from the call queue."""
-
-        while True:
-            try:
-                self._queue_task.qsize()
-            except Exception:
-                # call_handle queue seems closed, so terminate
-                break
-            try:
-                # get call_handle from the queue, execute call and report back
-                task = self._queue_task.get()
-                self._queue_start.put(Start(worker_id=self._worker_id,
-                                            call=task.call))
-                self._execute(task)
-                self._queue_task.task_done()
-            except (EOFError, IOError):
-                # the queue was closed by the invoker, so terminate
-                # call_handle queue seems closed, so terminate
-                break
-
-    def _execute(self, task):
-        """Executes the given call_handle."""
-
-        # make the actual call
-        function = task.call.function
-        try:
-            try:
-                value = call(f=function, fargs=task.call.args,
-                             param_spec=task.call.param_spec,
-                             return_spec=task.call.return_spec)
-            except AttributeError:
-                # function had no return type specification
-                value = call(f=function, fargs=task.call.args,
-                             param_spec=function.param_spec)
-            self._queue_outcome.put(Result(worker_id=self._worker_id,
-                                           call=task.call,
-                                           value=value))
-        except Exception as value:
-            # the objective function may raise any exception
-            # we can not do anything more helpful than propagate the exception
-            # we need to send the exception to the main process via a queue
-            # we need to make sure the exception is pickleable for the queue
-            # so test pickleability and fall back to sending the exception
-
-            with TemporaryFile() as tmp_file:
-                try:
-                    pickle.dump(value, tmp_file)
-                except PicklingError:
-                    value = traceback.format_exc()
-
-            self._queue_outcome.put(Error(worker_id=self._worker_id,
-                                          call=task.call,
-                                          value=value))
+        """Executes the incoming tasks, aborting the cancelled ones."""
+        # Do not inherit handlers of the parent, e.g. of `metaopt worker`.
+        # Terminating the process has to end it right away.
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        place_process(cpus=self._cpus, threads=self._threads)
+
+        signal.signal(self.SIGNAL_CANCEL, self._handle_cancel)
+        # do not interrupt waiting for the next task
+        signal.siginterrupt(self.SIGNAL_CANCEL, False)
+
+        super(ProcessWorker, self).run()
+
+    def _handle_cancel(self, signum, frame):
+        """Aborts the executing call, if it is the one to cancel."""
+        del signum, frame
+        if self._call_id is not None and \
+                self._call_id == self._call_id_cancelled.value:
+            raise CallCancelledError("The call was cancelled.")
+
+    def cancel(self, call_id):
+        """
+        Asks the process to abort the call given by id, if it executes it.
+
+        Returns right away. Objective functions, e.g. blocked in C code, may
+        not respond at all.
+        """
+        self._call_id_cancelled.value = call_id
+        os.kill(self.pid, self.SIGNAL_CANCEL)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Node that runs worker processes claiming tasks from a shared task database.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import time
+import uuid
+
+# First Party
+from metaopt.concurrent.employer.util.determine_worker_count import \
+    determine_worker_count
+from metaopt.concurrent.invoker.util.task_db import TaskDB
+from metaopt.concurrent.worker.process import ProcessWorker
+from metaopt.concurrent.worker.util.queue_connection import QueueConnection
+
+
+class QueueWorkerNode(object):
+    """
+    Node that runs worker processes claiming tasks from a shared task database.
+
+    Runs one worker process per CPU or as many as given, each claiming one
+    task at a time. Replaces workers that exited because they lost their
+    task, e.g. as the invoker stopped it. Returns as soon as the invoker
+    closed the queue and all workers exited.
+    """
+
+    # seconds between checks of the workers
+    INTERVAL = 0.1
+
+    def __init__(self, path, resources=None):
+        """
+        :param path: Path of the task database on the shared filesystem.
+        :param resources: Number of worker processes to run. Defaults to the
+                          number of CPUs.
+        """
+        super(QueueWorkerNode, self).__init__()
+
+        self._path = path
+        self._worker_count = determine_worker_count(resources)
+
+    def _start_worker(self):
+        """Starts a new worker process and returns it."""
+        worker_id = uuid.uuid4()
+        return ProcessWorker(worker_id=worker_id,
+                             connection=QueueConnection(self._path, worker_id))
+
+    def run(self):
+        """Runs the workers till the queue gets closed."""
+        task_db = TaskDB(self._path)
+        workers = []
+        try:
+            workers = [self._start_worker()
+                       for _ in range(self._worker_count)]
+            while workers:
+                time.sleep(self.INTERVAL)
+                for worker in workers[:]:
+                    if worker.is_alive():
+                        continue
+                    workers.remove(worker)
+                    if worker.exitcode != 0 and not task_db.is_closed():
+                        # The worker lost its task, so replace it.
+                        workers.append(self._start_worker())
+        finally:
+            for worker in workers:
+                worker.terminate()
+                worker.join()
+            task_db.close_connection()
@@ -10,13 +10,25 @@ from __future__ import absolute_import, division, print_function, \
 from threading import Thread
 
 # First Party
-from metaopt.worker.worker import Worker
+from metaopt.concurrent.worker.connection import ConnectionWorker
 
 
-class ThreadWorker(Thread, Worker):
+class ThreadWorker(ConnectionWorker, Thread):
     """
     Worker implementation that executes objective functions in Python threads.
+
+    It calls functions with arguments, both of which it gets from a connection.
+    Threads share the memory of the invoker's process. So this pays off for
+    objective functions that release the GIL, e.g. in NumPy code.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, worker_id, connection):
+        """
+        :param worker_id: ID of this worker
+        :param connection: The worker's end of a transport channel
+        """
+        super(ThreadWorker, self).__init__(worker_id=worker_id,
+                                           connection=connection)
+
+        self.daemon = True  # abandoned workers must not keep us alive
+        self.start()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+Utility that holds the context of the current worker process.
+
+The context is whatever the worker initializer returned. Objective functions
+get it by calling get_context().
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# context of this process, set once by the worker
+_context = None
+
+
+def get_context():
+    """Returns the context of this worker process, None if there is none."""
+    return _context
+
+
+def set_context(context):
+    """Sets the context of this worker process."""
+    global _context
+    _context = context
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+Exceptions raised within workers.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+
+class CallCancelledError(BaseException):
+    """
+    Raised in the objective function when the invoker cancelled its call.
+
+    Derives from BaseException, like KeyboardInterrupt, so that objective
+    functions catching any Exception do not swallow it by accident.
+    """
+
+    def __init__(self, message=None):
+        super(CallCancelledError, self).__init__(message)
@@ -7,12 +7,49 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 
+def _import_module(name):
+    """Imports the module given by its qualified name."""
+    return __import__(name, globals(), locals(), ['function'], 0)
+
+
 def import_function(function):
-    """Imports function given by qualified package name"""
-    function = __import__(function, globals(), locals(), ['function'], 0).f
-    # function = getattr(__import__(function["module"], globals(), locals(), ['function'], 0), function["name"]) TODO
+    """
+    Imports function given by qualified name.
+
+    The name is either that of a module, which imports its function "f", or
+    the module's name followed by the function's qualified name, e.g.
+    "package.module:Class.method" or "package.module.Class.method". Also
+    accepts a dictionary holding both names by the keys "module" and "name".
+    """
+    if isinstance(function, dict):
+        module_name, name = function["module"], function["name"]
+    elif ":" in function:
+        module_name, name = function.split(":", 1)
+    else:
+        module_name, name = function, None
+
+    if name is None:
+        # The name may end with attributes of the module, so try the longest
+        # prefix that is a module and treat the rest as attributes.
+        parts = module_name.split(".")
+        for index in range(len(parts), 0, -1):
+            try:
+                module = _import_module(".".join(parts[:index]))
+            except ImportError:
+                if index == 1:
+                    raise
+                continue
+            name = ".".join(parts[index:])
+            break
+    else:
+        module = _import_module(module_name)
+
+    if not name:
+        # Note that this is equivalent to:
+        #     from MyPackage.MyModule import f as function
+        name = "f"
 
-    # Note that the following is equivalent:
-    #     from MyPackage.MyModule import f as function
-    # Also note this always imports the function "f" as "function".
+    function = module
+    for attribute in name.split("."):
+        function = getattr(function, attribute)
     return function
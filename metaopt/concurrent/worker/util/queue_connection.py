@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Connection of a worker to a task database on a shared filesystem.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+import time
+from threading import Event, Lock, Thread
+
+# First Party
+from metaopt.concurrent.invoker.util.task_db import Closed, TaskDB
+from metaopt.concurrent.model.call_lifecycle import Call, Error, Result, \
+    Task
+
+
+class QueueConnection(object):
+    """
+    Connection of a worker to a task database on a shared filesystem.
+
+    Works like the worker's end of a pipe: Receiving claims the next task from
+    the database, sending records its outcome there. While the worker
+    executes a task, a thread renews its lease. If the lease is lost, e.g.
+    because the invoker stopped the call, the process exits right away.
+
+    Connects to the database lazily, so that it belongs to the process the
+    worker runs in.
+    """
+
+    # bounds for the seconds between polls of an empty queue
+    POLL_MIN = 0.05
+    POLL_MAX = 1.0
+
+    # exit status of a worker process that lost the lease on its call
+    EXIT_LEASE_LOST = 75
+
+    def __init__(self, path, worker_id):
+        """
+        :param path: Path of the task database.
+        :param worker_id: ID of the worker recorded with its claims.
+        """
+        super(QueueConnection, self).__init__()
+
+        self._path = path
+        self._worker_id = str(worker_id)
+
+        self._task_db = None
+
+        # session of the queue and the functions sent to the worker for it
+        self._session = None
+        self._function_ids = set()
+
+        # call id and lease of the claimed task, shared with the lease thread
+        self._claim = None
+        self._lock = Lock()
+        self._closed = Event()
+
+    def _connect(self):
+        """Connects to the database and starts renewing leases."""
+        self._task_db = TaskDB(self._path)
+
+        thread = Thread(target=self._renew_leases)
+        thread.daemon = True
+        thread.start()
+
+    def _renew_leases(self):
+        """Renews the lease on the claimed task till closed."""
+        interval = self.POLL_MAX
+        while not self._closed.wait(interval):
+            with self._lock:
+                if self._claim is None:
+                    interval = self.POLL_MAX
+                    continue
+                call_id, lease = self._claim
+                interval = lease / 3
+
+                if not self._task_db.renew(self._worker_id, call_id, lease):
+                    # The call was stopped or another worker took it over.
+                    # Its outcome is of no use anymore, so do not finish it.
+                    os._exit(self.EXIT_LEASE_LOST)
+
+    def recv(self):
+        """
+        Blocks till a task was claimed and returns it as a list of messages.
+
+        Raises EOFError once the queue was closed.
+        """
+        if self._task_db is None:
+            self._connect()
+
+        interval = self.POLL_MIN
+        while True:
+            claim = self._task_db.claim(self._worker_id)
+            if claim is Closed:
+                raise EOFError("The queue was closed.")
+            if claim is not None:
+                break
+            time.sleep(interval)
+            interval = min(2 * interval, self.POLL_MAX)
+
+        session, lease, call_id, function_id, args = claim
+        with self._lock:
+            self._claim = (call_id, lease)
+
+        messages = []
+        if session != self._session:
+            # The function ids of other sessions refer to other functions.
+            self._session = session
+            self._function_ids = set()
+        if function_id not in self._function_ids:
+            self._function_ids.add(function_id)
+            messages.append(self._task_db.get_function(function_id))
+
+        call = Call(id=call_id, function=function_id, args=args, kwargs=None,
+                    param_spec=None, return_spec=None)
+        messages.append(Task(worker_id=self._worker_id, call=call))
+        return messages
+
+    def send(self, message):
+        """Records the outcome of the claimed task given by the message."""
+        if not isinstance(message, (Result, Error)):
+            # starts were recorded along with the claim
+            return
+
+        with self._lock:
+            self._claim = None
+        self._task_db.report(message._replace(worker_id=self._worker_id))
+
+    def close(self):
+        """Stops renewing leases and closes the database connection."""
+        self._closed.set()
+        if self._task_db is not None:
+            with self._lock:
+                self._task_db.close_connection()
+            self._task_db = None
@@ -11,9 +11,17 @@ from __future__ import absolute_import, division, print_function, \
 from inspect import getargspec
 
 # First Party
+from metaopt.core.call.util.batch import is_batch
 from metaopt.core.call.util.exception import CallNotPossibleError
 from metaopt.core.returnspec.util.wrap_return_values import wrap_return_values
 
+try:
+    # Numpy
+    import numpy
+except ImportError:
+    # Without NumPy, batch functions get lists of lists.
+    numpy = None
+
 
 def call(f, fargs, param_spec, return_spec=None):
     """Call a function using a list of args"""
@@ -21,6 +29,10 @@ def call(f, fargs, param_spec, return_spec=None):
     if fargs is None:
         fargs = []
 
+    if is_batch(f):
+        # a batch of one
+        return call_batch(f, [fargs], param_spec, return_spec)[0]
+
     extra_kwargs = param_spec.extra_kwargs or {}
 
     args, vargs, kwargs, _ = getargspec(f)
@@ -48,3 +60,29 @@ def call(f, fargs, param_spec, return_spec=None):
             raise CallNotPossibleError(
                 "Function expects %s arguments but %s were given."
                 % (len(args), len(fargs)))
+
+
+def call_batch(f, fargs_list, param_spec, return_spec=None):
+    """
+    Call a batch function once for a list of args.
+
+    Returns the wrapped return values, one for each args.
+    """
+    extra_kwargs = param_spec.extra_kwargs or {}
+
+    candidates = [[farg.value for farg in fargs] for fargs in fargs_list]
+    if numpy is not None:
+        candidates = numpy.array(candidates)
+
+    values = f(candidates, **extra_kwargs)
+    if hasattr(values, "tolist"):
+        # plain numbers are cheaper to send than NumPy scalars
+        values = values.tolist()
+    values = list(values)
+
+    if len(values) != len(fargs_list):
+        raise CallNotPossibleError(
+            "Batch function returned %s values for %s candidates."
+            % (len(values), len(fargs_list)))
+
+    return [wrap_return_values(value, return_spec) for value in values]
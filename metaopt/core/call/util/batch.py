@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Decorator and helpers for batch objective functions.
+
+A batch objective function scores many candidates in one call. Instead of the
+args of one candidate, it takes a 2-D array with a row of arg values per
+candidate, in the order of its parameter specification. It returns a sequence
+of return values, one per row. For example::
+
+    from metaopt.core.call.util.batch import batch
+    from metaopt.core.paramspec.util import param
+
+    @batch
+    @param.float("a", interval=(-1, 1))
+    @param.float("b", interval=(-1, 1))
+    def f(candidates):
+        return (candidates ** 2).sum(axis=1)
+
+The array is a NumPy array if NumPy is installed, a list of lists otherwise.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+
+def batch(f):
+    """A decorator that marks an objective function as batch function."""
+    f.batch = True
+    return f
+
+
+def is_batch(f):
+    """Indicates whether the given objective function is a batch function."""
+    return getattr(f, "batch", False) is True
+
+
+class BatchArgs(list):
+    """
+    Args of the candidates a batch function is called for at once.
+
+    Invokers create calls with these as args for batch functions, see
+    :func:`metaopt.core.call.call.call_batch`.
+    """
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Optimization of coroutine objective functions, awaitable from a coroutine.
+
+Requires Python 3.5 or later.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import asyncio
+from functools import partial
+
+# First Party
+from metaopt.concurrent.invoker.asynchronous import AsyncInvoker
+from metaopt.concurrent.invoker.pluggable import PluggableInvoker
+from metaopt.core.optimize.optimize import custom_optimize
+from metaopt.core.stoppable.util.exception import StoppedError
+from metaopt.optimizer.saes import SAESOptimizer
+
+
+async def optimize_async(f, param_spec=None, return_spec=None,
+                         extra_kwargs=None, timeout=None, plugins=[],
+                         optimizer=SAESOptimizer(), concurrency=1000):
+    """
+    Optimizes the given coroutine objective function.
+
+    Awaits the calls on the running event loop, while the optimizer runs in
+    the loop's default executor. Cancelling the optimization cancels all of
+    its calls.
+
+    :param f: Objective function
+    :param timeout: Available time for optimization (in seconds)
+    :param plugins: List of plugins
+    :param optimizer: Optimizer
+    :param concurrency: Number of calls awaited at once at most
+    """
+    loop = asyncio.get_event_loop()
+
+    invoker = PluggableInvoker(invoker=AsyncInvoker(concurrency=concurrency,
+                                                    loop=loop),
+                               plugins=plugins)
+
+    optimization = partial(custom_optimize, f, invoker=invoker,
+                           param_spec=param_spec, return_spec=return_spec,
+                           extra_kwargs=extra_kwargs, timeout=timeout,
+                           optimizer=optimizer)
+    try:
+        return await loop.run_in_executor(None, optimization)
+    except asyncio.CancelledError:
+        # The optimizer keeps running in its thread till its calls are gone.
+        try:
+            invoker.stop()
+        except StoppedError:
+            pass
+        raise
@@ -66,6 +66,12 @@ def custom_optimize(f, invoker, param_spec=None, return_spec=None,
         if timeout is not None:
             timer.cancel()
 
+        # release the workers, a worker pool would be kept in use otherwise
+        try:
+            invoker.stop()
+        except StoppedError:
+            pass
+
         raise OptimizerError(e)
 
     try:
@@ -83,7 +89,9 @@ def custom_optimize(f, invoker, param_spec=None, return_spec=None,
 
 
 def optimize(f, param_spec=None, return_spec=None, extra_kwargs=None,
-             timeout=None, plugins=[], optimizer=SAESOptimizer()):
+             timeout=None, plugins=[], optimizer=SAESOptimizer(), pool=None,
+             initializer=None, initargs=(), placement=None,
+             memory_limit=None):
     """
     Optimizes the given objective function.
 
@@ -91,10 +99,22 @@ def optimize(f, param_spec=None, return_spec=None, extra_kwargs=None,
     :param timeout: Available time for optimization (in seconds)
     :param plugins: List of plugins
     :param optimizer: Optimizer
+    :param pool: Worker pool to reuse across optimizations (optional)
+    :param initializer: Function each worker process calls once, its return
+                        value is available by get_context() (optional)
+    :param initargs: Arguments to call the initializer with
+    :param placement: WorkerPlacement pinning the worker processes to disjoint
+                      CPUs and limiting their native threads (optional)
+    :param memory_limit: Bytes of resident memory each worker process may
+                         use, calls exceeding it fail with MemoryLimitError
+                         (optional)
 
     """
 
-    invoker = PluggableInvoker(invoker=MultiProcessInvoker(), plugins=plugins)
+    invoker = PluggableInvoker(invoker=MultiProcessInvoker(
+        pool=pool, initializer=initializer, initargs=initargs,
+        placement=placement, memory_limit=memory_limit),
+        plugins=plugins)
 
     return custom_optimize(f, invoker=invoker, param_spec=param_spec,
                            return_spec=return_spec, extra_kwargs=extra_kwargs,
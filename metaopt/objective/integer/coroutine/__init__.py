@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+Integer coroutine functions that state their optimization direction.
+
+These are ``async def`` functions, so they require Python 3.5 or later.
+"""
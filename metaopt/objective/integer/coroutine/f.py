@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+A coroutine function with an integer parameter for testing purposes.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+from asyncio import sleep
+
+# First Party
+from metaopt.core.paramspec.util import param
+from metaopt.core.returnspec.util.decorator import maximize
+
+
+@maximize("y")
+@param.int("x", interval=[0, 10])
+async def f(x):
+    await sleep(0.1)
+    return x
@@ -47,10 +47,13 @@ class CMAESOptimizer(Optimizer):
     LAMBDA = 100
     STEP_SIZE = 1.0
 
-    def __init__(self, mu=MU, lamb=LAMBDA, global_step_size=STEP_SIZE):
+    def __init__(self, mu=MU, lamb=LAMBDA, global_step_size=STEP_SIZE,
+                 quorum=None):
         """
         :param mu: Number of parent arguments
         :param lamb: Number of offspring arguments
+        :param quorum: Quorum finishing each generation without waiting for
+                       its stragglers
         """
         super(CMAESOptimizer, self).__init__()
 
@@ -64,6 +67,7 @@ class CMAESOptimizer(Optimizer):
         self._mu = mu
         self._lambd = lamb
         self._sigma = global_step_size
+        self._quorum = quorum
 
     def optimize(self, invoker, param_spec, return_spec=None, minimize=True):
         del return_spec
@@ -177,19 +181,20 @@ class CMAESOptimizer(Optimizer):
     def score_population(self):
         self.scored_population = []
 
-        for individual in self.population:
-            # metaoptify
-            args_creator = ArgsCreator(self.param_spec)
-            individual = individual.getA1().tolist()
-            individual = args_creator.args(individual)
-            args = individual
-
-            try:
-                self._invoker.invoke(caller=self, fargs=args,
-                                     individual=individual)
-            except StoppedError:
-                self.aborted = True
-                break
+        # metaoptify
+        args_creator = ArgsCreator(self.param_spec)
+        fargs_list = [args_creator.args(individual.getA1().tolist())
+                      for individual in self.population]
+        kwargs_list = [dict(individual=args) for args in fargs_list]
+
+        try:
+            call_handles = self._invoker.invoke_many(
+                caller=self, fargs_list=fargs_list, kwargs_list=kwargs_list)
+        except StoppedError:
+            self.aborted = True
+        else:
+            if self._quorum is not None:
+                self._quorum.wait(call_handles, minimum=self._mu)
 
         self._invoker.wait()
 
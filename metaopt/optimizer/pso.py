@@ -87,18 +87,18 @@ class PSOOptimizer(Optimizer):
     def score_population(self):
         self.scored_population = []
 
-        for particle in self.population:
-            # metaoptify
-            args_creator = ArgsCreator(self.param_spec)
-            pos = particle[0].tolist()
-            pos = args_creator.args(pos)
-
-            try:
-                self._invoker.invoke(caller=self, fargs=pos,
-                                     individual=particle)
-            except StoppedError:
-                self.aborted = True
-                break
+        # metaoptify
+        args_creator = ArgsCreator(self.param_spec)
+        fargs_list = [args_creator.args(particle[0].tolist())
+                      for particle in self.population]
+        kwargs_list = [dict(individual=particle)
+                       for particle in self.population]
+
+        try:
+            self._invoker.invoke_many(caller=self, fargs_list=fargs_list,
+                                      kwargs_list=kwargs_list)
+        except StoppedError:
+            self.aborted = True
 
         self._invoker.wait()
 
@@ -33,10 +33,12 @@ class RechenbergOptimizer(Optimizer):
     LAMBDA = 100
     A = 0.1
 
-    def __init__(self, mu=MU, lamb=LAMBDA, a=A):
+    def __init__(self, mu=MU, lamb=LAMBDA, a=A, quorum=None):
         """
         :param mu: Number of parent arguments
         :param lamb: Number of offspring arguments
+        :param quorum: Quorum finishing each generation without waiting for
+                       its stragglers
         """
         super(RechenbergOptimizer, self).__init__()
 
@@ -46,6 +48,7 @@ class RechenbergOptimizer(Optimizer):
         self.mu = mu
         self.lamb = lamb
         self.a = a
+        self.quorum = quorum
 
         self.param_spec = None
 
@@ -106,12 +109,13 @@ class RechenbergOptimizer(Optimizer):
     def score_population(self):
         self.scored_population = []
 
-        for individual in self.population:
-            try:
-                self._invoker.invoke(self, individual)
-            except StoppedError:
-                self.aborted = True
-                break
+        try:
+            call_handles = self._invoker.invoke_many(self, self.population)
+        except StoppedError:
+            self.aborted = True
+        else:
+            if self.quorum is not None:
+                self.quorum.wait(call_handles, minimum=self.mu)
 
         self._invoker.wait()
 
@@ -7,6 +7,7 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
+from collections import deque
 from math import exp, sqrt
 from random import gauss, sample
 
@@ -32,14 +33,24 @@ class SAESOptimizer(Optimizer):
     This optimizer should be combined with a global timeout, otherwise it will
     run indefinitely.
 
+    In steady-state mode, there are no generations to wait for. As soon as a
+    call is done, its individual competes for the parents and a new child
+    gets invoked in its place. So lamb calls keep running, however much the
+    durations of the calls vary.
     """
     MU = 15
     LAMBDA = 100
 
-    def __init__(self, mu=MU, lamb=LAMBDA, tau0=None, tau1=None):
+    def __init__(self, mu=MU, lamb=LAMBDA, tau0=None, tau1=None,
+                 steady_state=False, quorum=None):
         """
         :param mu: Number of parent arguments
         :param lamb: Number of offspring arguments
+        :param steady_state: Whether to replace each scored individual by a
+                             new child right away, instead of generation by
+                             generation
+        :param quorum: Quorum finishing each generation without waiting for
+                       its stragglers
         """
         super(SAESOptimizer, self).__init__()
 
@@ -62,6 +73,14 @@ class SAESOptimizer(Optimizer):
         self.aborted = False
         self.generation = 1
 
+        self.steady_state = steady_state
+        self.quorum = quorum
+        self.evaluations = 0
+
+        # children to invoke in steady-state mode and whether that happens
+        self._children = deque()
+        self._invoking = False
+
     def optimize(self, invoker, param_spec, return_spec=None, minimize=True):
         del return_spec
         del minimize
@@ -82,6 +101,9 @@ class SAESOptimizer(Optimizer):
             self.tau1 = 1 / sqrt(2 * sqrt(N))
 
         self.initalize_population()
+        if self.steady_state:
+            return self.optimize_steady_state()
+
         self.score_population()
 
         while not self.exit_condition():
@@ -97,6 +119,20 @@ class SAESOptimizer(Optimizer):
 
         return self.best_scored_individual[0][0]
 
+    def optimize_steady_state(self):
+        """
+        Optimizes without generations till the invoker gets stopped.
+
+        Starts with the initial population and children of it, lamb calls in
+        total. Afterwards each outcome makes room for another child.
+        """
+        children = [self.create_child(self.population)
+                    for _ in xrange(self.lamb - self.mu)]
+        self.invoke_children(self.population + children)
+        self._invoker.wait()
+
+        return self.best_scored_individual[0][0]
+
     def exit_condition(self):
         pass
 
@@ -110,49 +146,96 @@ class SAESOptimizer(Optimizer):
             individual = (args, args_sigma)
             self.population.append(individual)
 
-    def add_offspring(self):
-        for _ in xrange(self.lamb):
-            mother, father = sample(self.population, 2)
+    def create_child(self, parents):
+        """Returns a mutated child of two individuals of the given parents."""
+        mother, father = sample(parents, 2)
 
-            child_args = ArgsModifier.combine(mother[0], father[0])
+        child_args = ArgsModifier.combine(mother[0], father[0])
 
-            mean = lambda x1, x2: float((x1 + x2) / 2)
-            child_args_sigma = map(mean, mother[1], father[1])
+        mean = lambda x1, x2: float((x1 + x2) / 2)
+        child_args_sigma = list(map(mean, mother[1], father[1]))
 
-            child_args = ArgsModifier.mutate(child_args, child_args_sigma)
+        child_args = ArgsModifier.mutate(child_args, child_args_sigma)
 
-            self.tau0_random = gauss(0, 1)
+        self.tau0_random = gauss(0, 1)
 
-            def mutate_sigma(sigma):
-                tau0_mutated = self.tau0 * self.tau0_random
-                tau1_mutated = self.tau1 * gauss(0, 1)
-                return sigma * exp(tau0_mutated) * exp(tau1_mutated)
+        def mutate_sigma(sigma):
+            tau0_mutated = self.tau0 * self.tau0_random
+            tau1_mutated = self.tau1 * gauss(0, 1)
+            return sigma * exp(tau0_mutated) * exp(tau1_mutated)
 
-            child_args_sigma = map(mutate_sigma, child_args_sigma)
+        child_args_sigma = list(map(mutate_sigma, child_args_sigma))
 
-            child = (child_args, child_args_sigma)
+        return (child_args, child_args_sigma)
 
-            self.population.append(child)
+    def add_offspring(self):
+        for _ in xrange(self.lamb):
+            self.population.append(self.create_child(self.population))
 
     def score_population(self):
         self.scored_population = []
 
-        for individual in self.population:
-            args, _ = individual
+        fargs_list = [args for args, _ in self.population]
+        kwargs_list = [dict(individual=individual)
+                       for individual in self.population]
 
-            try:
-                self._invoker.invoke(caller=self, fargs=args,
-                                     individual=individual)
-            except StoppedError:
-                self.aborted = True
-                break
+        try:
+            call_handles = self._invoker.invoke_many(
+                caller=self, fargs_list=fargs_list, kwargs_list=kwargs_list)
+        except StoppedError:
+            self.aborted = True
+        else:
+            if self.quorum is not None:
+                self.quorum.wait(call_handles, minimum=self.mu)
 
         self._invoker.wait()
 
     def select_parents(self):
         self.scored_population.sort(key=lambda s: s[1])
         new_scored_population = self.scored_population[0:self.mu]
-        self.population = map(lambda s: s[0], new_scored_population)
+        self.population = [s[0] for s in new_scored_population]
+
+    def invoke_children(self, children):
+        """
+        Invokes the given children and the ones bred in the meantime.
+
+        Invokers may call back before invoke returns, and so breed further
+        children. These get queued and invoked here in turn, instead of
+        nesting invokes in callbacks.
+        """
+        self._children.extend(children)
+        if self._invoking:
+            return
+
+        self._invoking = True
+        try:
+            while self._children and not self.aborted:
+                child = self._children.popleft()
+                try:
+                    self._invoker.invoke(caller=self, fargs=child[0],
+                                         individual=child)
+                except StoppedError:
+                    self.aborted = True
+        finally:
+            self._invoking = False
+
+    def replace_individual(self):
+        """
+        Selects the best scored individuals as parents and invokes a child of
+        them in place of a finished call.
+        """
+        self.evaluations += 1
+        if self.evaluations % self.lamb == 0:
+            self.generation += 1
+
+        self.scored_population.sort(key=lambda s: s[1])
+        del self.scored_population[self.mu:]
+
+        parents = [individual for individual, _ in self.scored_population]
+        if len(parents) < 2:
+            # not enough scored yet, so breed from the initial population
+            parents = self.population
+        self.invoke_children([self.create_child(parents)])
 
     def on_result(self, value, fargs, individual, **kwargs):
         del fargs
@@ -167,8 +250,15 @@ class SAESOptimizer(Optimizer):
         if best_fitness is None or fitness < best_fitness:
             self.best_scored_individual = scored_individual
 
+        if self.steady_state:
+            self.replace_individual()
+
     def on_error(self, value, fargs, individual, **kwargs):
         del value  # TODO
         del fargs  # TODO
         del individual  # TODO
         del kwargs  # TODO
+
+        if self.steady_state and not self.aborted:
+            # keep the workers busy, the failed child just does not compete
+            self.replace_individual()
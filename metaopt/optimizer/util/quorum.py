@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Policy finishing a generation without waiting for its stragglers.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import math
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future
+from concurrent.futures import wait as wait_futures
+
+
+class Quorum(object):
+    """
+    Policy finishing a generation once enough of its calls are done.
+
+    The generation is complete as soon as the given fraction of its calls is
+    done, or as soon as all calls left have been running for longer than the
+    given percentile of the durations of previous calls. Either way, the calls
+    left get cancelled via their call handles. Comma-selection only keeps the
+    best mu of lambda offspring, so the results in hand are enough.
+    """
+
+    # number of recent call durations to take the percentile of
+    HISTORY = 1000
+
+    # number of call durations needed before taking their percentile
+    SAMPLES_MIN = 10
+
+    def __init__(self, fraction=0.9, percentile=95):
+        """
+        :param fraction: Fraction of the calls to wait for, None for all.
+        :param percentile: Percentile of the durations of previous calls after
+                           which running calls are stragglers, None for never.
+        """
+        super(Quorum, self).__init__()
+
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError("fraction needs to be in (0, 1].")
+        if percentile is not None and not 0 < percentile <= 100:
+            raise ValueError("percentile needs to be in (0, 100].")
+
+        self._fraction = fraction
+        self._percentile = percentile
+
+        # durations of the calls completed recently
+        self._durations = deque(maxlen=self.HISTORY)
+
+    @property
+    def duration_limit(self):
+        """
+        Returns the seconds after which running calls are stragglers, None if
+        unknown so far.
+        """
+        if self._percentile is None or \
+                len(self._durations) < self.SAMPLES_MIN:
+            return None
+        durations = sorted(self._durations)
+        rank = int(math.ceil(self._percentile / 100 * len(durations)))
+        return durations[max(0, rank - 1)]
+
+    def _time_left(self, call_handles_pending, duration_limit):
+        """
+        Returns the seconds till all pending calls are stragglers, None if
+        calls may not turn into stragglers.
+        """
+        if duration_limit is None:
+            return None
+
+        now = time.time()
+        time_left = 0
+        for call_handle in call_handles_pending:
+            time_started = getattr(call_handle, "time_started", None)
+            if time_started is None:
+                # Not started yet, so it takes at least that long.
+                time_left = max(time_left, duration_limit)
+            else:
+                time_left = max(time_left,
+                                duration_limit - (now - time_started))
+        return time_left
+
+    def wait(self, call_handles, minimum=0):
+        """
+        Blocks till the quorum of the given call handles is done and cancels
+        the calls left.
+
+        Waits for at least the given number of calls. Returns the call
+        handles that got cancelled. Returns right away if the call handles do
+        not support waiting, e.g. if the invoker returned none.
+
+        :param call_handles: Call handles of the calls of a generation
+        :param minimum: Number of calls to wait for in any case
+        """
+        if not call_handles or not all(isinstance(call_handle, Future)
+                                       for call_handle in call_handles):
+            return []
+
+        count = len(call_handles)
+        count_quorum = count
+        if self._fraction is not None:
+            count_quorum = int(math.ceil(self._fraction * count))
+        count_quorum = min(count, max(minimum, count_quorum))
+        duration_limit = self.duration_limit
+
+        pending = set(call_handles)
+        while pending:
+            count_done = count - len(pending)
+            if count_done >= count_quorum:
+                break
+
+            time_left = self._time_left(pending, duration_limit)
+            if time_left is not None and time_left <= 0:
+                if count_done >= minimum:
+                    # all calls left are stragglers
+                    break
+                # stragglers, but too few calls are done to do without them
+                time_left = None
+
+            _, pending = wait_futures(pending, timeout=time_left,
+                                      return_when=FIRST_COMPLETED)
+
+        for call_handle in call_handles:
+            duration = getattr(call_handle, "duration", None)
+            if call_handle not in pending and duration is not None and \
+                    not call_handle.cancelled():
+                self._durations.append(duration)
+
+        cancelled = []
+        for call_handle in pending:
+            if call_handle.cancel():
+                cancelled.append(call_handle)
+        return cancelled
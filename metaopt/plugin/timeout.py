@@ -46,7 +46,17 @@ class TimeoutPlugin(Plugin):
 
         stopper = Stopper(stoppee=current_task, reason=error)
 
-        Timer(self.timeout, stopper.stop).start()
+        def start_timer():
+            Timer(self.timeout, stopper.stop).start()
+
+        try:
+            add_start_callback = current_task.add_start_callback
+        except AttributeError:
+            # The invoker started the call right away.
+            start_timer()
+        else:
+            # The call may wait for its worker, so time its execution only.
+            add_start_callback(start_timer)
 
 
 class TimeoutError(Exception):
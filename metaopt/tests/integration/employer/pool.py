@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the worker process pool.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Third Party
+import nose
+from nose.tools.nontrivial import raises
+
+# First Party
+from metaopt.concurrent.employer.pool import ProcessWorkerPool
+from metaopt.concurrent.invoker.multiprocess import MultiProcessInvoker
+from metaopt.core.optimize.optimize import optimize
+from metaopt.objective.integer.fast.explicit.f import f as f_max_fast
+from metaopt.objective.integer.slow.explicit.f import f as f_max_slow
+from metaopt.optimizer.gridsearch import GridSearchOptimizer
+
+
+class TestProcessWorkerPool(object):
+    """Tests for the worker process pool."""
+
+    def __init__(self):
+        self._pool = None
+
+    def setup(self):
+        """Nose will run this method before every test method."""
+        self._pool = ProcessWorkerPool(resources=2)
+
+    def teardown(self):
+        """Nose will run this method after every test method."""
+        self._pool.close()
+
+    def test_spawns_all_workers(self):
+        """A pool spawns all of its workers up front."""
+        assert len(self._pool.worker_ids) == 2
+
+    def test_keeps_workers_across_optimizations(self):
+        """The workers of a pool survive the optimizations using them."""
+        worker_ids = set(self._pool.worker_ids)
+
+        for _ in range(2):
+            result = optimize(f_max_fast, optimizer=GridSearchOptimizer(),
+                              pool=self._pool)
+            assert result[0].value == 10
+            assert set(self._pool.worker_ids) == worker_ids
+
+    def test_leaves_cpus_to_optimizations_without_pool(self):
+        """Optimizations without the pool get workers of their own."""
+        self._pool.close()
+        self._pool = ProcessWorkerPool()  # as many workers as CPUs
+        worker_ids = set(self._pool.worker_ids)
+
+        result = optimize(f_max_fast, optimizer=GridSearchOptimizer(),
+                          timeout=30)
+        assert result[0].value == 10
+        assert set(self._pool.worker_ids) == worker_ids
+
+    def test_replaces_busy_workers(self):
+        """Workers still busy on stop get replaced for the next invoker."""
+        optimize(f_max_slow, optimizer=GridSearchOptimizer(), timeout=0.5,
+                 pool=self._pool)
+        assert len(self._pool.worker_ids) <= 2
+
+        result = optimize(f_max_fast, optimizer=GridSearchOptimizer(),
+                          pool=self._pool)
+        assert result[0].value == 10
+        assert len(self._pool.worker_ids) == 2
+
+    @raises(ValueError)
+    def test_used_by_one_invoker_at_a_time(self):
+        """Only one invoker at a time can use a pool."""
+        invoker = MultiProcessInvoker(pool=self._pool)
+        try:
+            MultiProcessInvoker(pool=self._pool)
+        finally:
+            invoker.stop()
+
+    @raises(ValueError)
+    def test_close(self):
+        """A closed pool has no workers and can not be used anymore."""
+        self._pool.close()
+        assert self._pool.closed
+        assert self._pool.worker_ids == []
+        MultiProcessInvoker(pool=self._pool)
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the asyncio invoker.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import sys
+
+# Third Party
+import nose
+from mock import Mock
+
+if sys.version_info < (3, 5):
+    raise nose.SkipTest("The asyncio invoker requires Python 3.5 or later.")
+
+# Standard Library
+import asyncio
+
+# First Party
+from metaopt.concurrent.invoker.asynchronous import AsyncInvoker
+from metaopt.concurrent.invoker.pluggable import PluggableInvoker
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.optimize.asynchronous import optimize_async
+from metaopt.core.optimize.optimize import custom_optimize
+from metaopt.core.returnspec.returnspec import ReturnSpec
+from metaopt.core.returnspec.util.wrapper import ReturnValuesWrapper
+from metaopt.core.stoppable.util.exception import StoppedError
+from metaopt.objective.integer.coroutine.f import f as f_coroutine
+from metaopt.objective.integer.coroutine.g import f as f_hanging
+from metaopt.objective.integer.failing.f import f as f_failing
+from metaopt.optimizer.gridsearch import GridSearchOptimizer
+from metaopt.plugin.timeout import TimeoutError, TimeoutPlugin
+
+
+class TestAsyncInvoker(object):
+    """
+    Integration tests for the asyncio invoker.
+    """
+
+    def __init__(self):
+        self._invoker = None
+
+    def setup(self):
+        self._invoker = AsyncInvoker(concurrency=10)
+
+    def teardown(self):
+        try:
+            self._invoker.stop()
+        except StoppedError:
+            pass
+
+    def _use(self, function):
+        self._invoker.f = function
+        self._invoker.param_spec = function.param_spec
+        self._invoker.return_spec = ReturnSpec(function)
+
+    def test_invoke_calls_on_result(self):
+        caller = Mock()
+        self._use(f_coroutine)
+
+        args = ArgsCreator(f_coroutine.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args, data=None)
+        self._invoker.wait()
+
+        caller.on_result.assert_called_once_with(
+            value=ReturnValuesWrapper(None, 0), fargs=args, data=None)
+        assert not caller.on_error.called
+
+    def test_invoke_not_successful_calls_on_error(self):
+        caller = Mock()
+        self._use(f_failing)
+
+        args = ArgsCreator(f_failing.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        assert not caller.on_result.called
+        assert caller.on_error.called
+
+    def test_invoke_many_awaits_calls_concurrently(self):
+        caller = Mock()
+        self._use(f_coroutine)
+
+        # 200 calls of 0.1 seconds each, 10 at a time
+        args = ArgsCreator(f_coroutine.param_spec).args()
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 200)
+        self._invoker.wait()
+
+        assert caller.on_result.call_count == 200
+        assert not caller.on_error.called
+
+    def test_stop_call_reports_layoff(self):
+        caller = Mock()
+        self._use(f_hanging)
+
+        args = ArgsCreator(f_hanging.param_spec).args()
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        reason = Exception()
+        call_handle.stop(reason=reason)
+        self._invoker.wait()
+
+        assert not caller.on_result.called
+        caller.on_error.assert_called_once_with(value=reason, fargs=args)
+
+    def test_futures_get_outcomes(self):
+        caller = Mock()
+        self._use(f_hanging)
+
+        args = ArgsCreator(f_hanging.param_spec).args()
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        reason = Exception()
+        call_handle.stop(reason=reason)
+        self._use(f_coroutine)
+        call_handle_other = self._invoker.invoke(caller=caller, fargs=args)
+
+        assert call_handle.exception(timeout=5) is reason
+        assert call_handle_other.result(timeout=5) == \
+            ReturnValuesWrapper(None, 0)
+        self._invoker.wait()
+
+    def test_stop_reports_layoffs(self):
+        caller = Mock()
+        self._use(f_hanging)
+
+        args = ArgsCreator(f_hanging.param_spec).args()
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 20)
+        self._invoker.stop()
+        self._invoker.wait()
+
+        assert not caller.on_result.called
+        assert caller.on_error.call_count == 20
+
+    def test_timeout_plugin_cancels_calls(self):
+        caller = Mock()
+        self._invoker = PluggableInvoker(self._invoker,
+                                         plugins=[TimeoutPlugin(0.2)])
+        self._use(f_hanging)
+
+        args = ArgsCreator(f_hanging.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        assert not caller.on_result.called
+        assert isinstance(caller.on_error.call_args[1]["value"],
+                          TimeoutError)
+
+    def test_custom_optimize(self):
+        result = custom_optimize(f_coroutine, invoker=self._invoker,
+                                 optimizer=GridSearchOptimizer())
+        assert result[0].value == 10
+
+    def test_optimize_async(self):
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            result = loop.run_until_complete(
+                optimize_async(f_coroutine, optimizer=GridSearchOptimizer()))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+        assert result[0].value == 10
+
+if __name__ == '__main__':
+    nose.runmodule()
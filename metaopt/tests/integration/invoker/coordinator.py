@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the coordinator invoker with worker nodes on localhost.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+import signal
+import subprocess
+import sys
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from threading import Timer
+
+# Third Party
+import nose
+from mock import Mock
+from nose.tools.nontrivial import raises
+
+# First Party
+import metaopt
+from metaopt.concurrent.invoker.coordinator import CoordinatorInvoker
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.optimize.optimize import custom_optimize
+from metaopt.core.returnspec.returnspec import ReturnSpec
+from metaopt.core.stoppable.util.exception import StoppedError
+from metaopt.objective.integer.fast.explicit.f import f as f_working
+from metaopt.objective.integer.slow.explicit.f import f as f_slow
+from metaopt.optimizer.gridsearch import GridSearchOptimizer
+
+AUTHKEY = "secret"
+
+# directory the nodes import metaopt from
+PATH = os.path.dirname(os.path.dirname(os.path.abspath(metaopt.__file__)))
+
+
+class TestCoordinatorInvoker(object):
+    """
+    Integration tests for the coordinator invoker with worker nodes on
+    localhost.
+    """
+
+    def __init__(self):
+        self._invoker = None
+        self._nodes = []
+
+    def setup(self):
+        self._invoker = CoordinatorInvoker(authkey=AUTHKEY,
+                                           heartbeat_timeout=2)
+        self._nodes = []
+
+    def teardown(self):
+        try:
+            self._invoker.stop()
+        except StoppedError:
+            pass
+
+        # nodes hang up along with the coordinator, unless they were stopped
+        deadline = time.time() + 5
+        for node in self._nodes:
+            node.send_signal(signal.SIGCONT)
+            while node.poll() is None and time.time() < deadline:
+                time.sleep(0.05)
+            if node.poll() is None:
+                node.terminate()
+            node.wait()
+
+    def _start_node(self, workers):
+        """Starts a node with the given number of workers."""
+        environment = dict(os.environ)
+        environment[str("METAOPT_AUTHKEY")] = str(AUTHKEY)
+        environment[str("PYTHONPATH")] = str(PATH)
+
+        host, port = self._invoker.address
+        node = subprocess.Popen([sys.executable, "-m", "metaopt", "worker",
+                                 "--connect", "%s:%d" % (host, port),
+                                 "--workers", str(workers)],
+                                env=environment)
+        self._nodes.append(node)
+        return node
+
+    def _wait_for_workers(self, count):
+        """Waits till the nodes offer the given number of workers in total."""
+        deadline = time.time() + 30
+        while self._invoker.worker_count_max < count:
+            assert time.time() < deadline
+            time.sleep(0.05)
+
+    def _use(self, function):
+        self._invoker.f = function
+        self._invoker.param_spec = function.param_spec
+        self._invoker.return_spec = ReturnSpec(function)
+
+    def test_nodes_offer_their_capacity(self):
+        self._start_node(workers=1)
+        self._start_node(workers=2)
+        self._wait_for_workers(3)
+        assert self._invoker.worker_count_max == 3
+
+    def test_custom_optimize(self):
+        self._start_node(workers=2)
+        result = custom_optimize(f_working, invoker=self._invoker,
+                                 optimizer=GridSearchOptimizer())
+        assert result[0].value == 10
+
+    def test_calls_wait_for_nodes(self):
+        caller = Mock()
+        self._use(f_working)
+
+        # invoking blocks till there are workers to issue the calls to
+        timer = Timer(0.5, self._start_node, kwargs=dict(workers=1))
+        timer.start()
+
+        args = ArgsCreator(f_working.param_spec).args()
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 3)
+        self._invoker.wait()
+        timer.join()
+
+        assert caller.on_result.call_count == 3
+
+    def test_requeues_calls_of_lost_node(self):
+        caller = Mock()
+        self._use(f_slow)
+        node = self._start_node(workers=1)
+        self._start_node(workers=1)
+        self._wait_for_workers(2)
+
+        args = ArgsCreator(f_slow.param_spec).args()
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 10)
+        time.sleep(0.15)
+        node.terminate()
+        self._invoker.wait()
+
+        assert caller.on_result.call_count == 10
+        assert not caller.on_error.called
+
+    def test_requeues_calls_of_silent_node(self):
+        caller = Mock()
+        self._use(f_slow)
+        node = self._start_node(workers=1)
+        self._start_node(workers=1)
+        self._wait_for_workers(2)
+
+        args = ArgsCreator(f_slow.param_spec).args()
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 10)
+        time.sleep(0.15)
+        node.send_signal(signal.SIGSTOP)
+        self._invoker.wait()
+
+        assert caller.on_result.call_count == 10
+        assert not caller.on_error.called
+
+    def test_stop_call_replaces_worker(self):
+        caller = Mock()
+        self._use(f_slow)
+        self._start_node(workers=1)
+
+        args = ArgsCreator(f_slow.param_spec).args()
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        reason = Exception()
+        call_handle.stop(reason=reason)
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        caller.on_error.assert_called_once_with(value=reason, fargs=args)
+        assert caller.on_result.call_count == 1
+
+    @raises(AuthenticationError)
+    def test_rejects_wrong_authkey(self):
+        Client(self._invoker.address, authkey=b"wrong")
+
+if __name__ == '__main__':
+    nose.runmodule()
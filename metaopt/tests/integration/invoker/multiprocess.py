@@ -6,18 +6,36 @@ Integration tests for the multiprocess invoker.
 from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
+# Standard Library
+import os
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+from copy import deepcopy
+from threading import Event, Thread
+
 # Third Party
 import nose
 from mock import Mock
+from nose.plugins.skip import SkipTest
 
 # First Party
+from metaopt.concurrent.employer.util.exception import MemoryLimitError, \
+    NoWorkerError
+from metaopt.concurrent.employer.util.placement import WorkerPlacement
 from metaopt.concurrent.invoker.multiprocess import MultiProcessInvoker
+from metaopt.concurrent.invoker.util.duration_model import DurationModel
+from metaopt.concurrent.worker.process import ProcessWorker
+from metaopt.concurrent.worker.util.context import get_context
 from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.call.util.batch import batch
+from metaopt.core.paramspec.util import param
 from metaopt.core.returnspec.returnspec import ReturnSpec
 from metaopt.core.returnspec.util.wrapper import ReturnValuesWrapper
 from metaopt.core.stoppable.util.exception import StoppedError
 from metaopt.objective.integer.failing.f import f as f_failing
 from metaopt.objective.integer.fast.explicit.f import f as f_working
+from metaopt.objective.integer.slow.explicit.f import f as f_slow
 from metaopt.optimizer.singleinvoke import SingleInvokeOptimizer
 
 
@@ -25,6 +43,61 @@ f_working = f_working
 f_failing = f_failing
 
 
+def initialize(offset):
+    """Stub initializer whose return value becomes the context."""
+    return offset
+
+
+@param.int("x", interval=[0, 10])
+def f_context(x):
+    """Stub objective function that uses the context of its process."""
+    return get_context() + x
+
+
+@param.int("x", interval=[0, 10])
+def f_data(x, data):
+    """Stub objective function that uses a read-only array."""
+    assert not data.flags.writeable
+    return x + int(data.sum())
+
+
+@param.int("x", interval=[0, 10])
+def f_threads(x):
+    """Stub objective function that returns its limit of OpenMP threads."""
+    return int(os.environ["OMP_NUM_THREADS"]) + x
+
+
+@param.int("x", interval=[0, 10])
+def f_greedy(x):
+    """Stub objective function that fills 200 MB of memory."""
+    memory = b"x" * (200 * 2 ** 20)
+    time.sleep(5)
+    return x + len(memory)
+
+
+@batch
+@param.int("x", interval=[0, 10])
+def f_batch(candidates):
+    """Stub batch objective function that returns its batch size per row."""
+    return [len(candidates) * 100 + int(row[0]) for row in candidates]
+
+
+@param.int("x", interval=[0, 10])
+def f_sleeping(x):
+    """Stub objective function that takes longer the greater its argument."""
+    time.sleep(x / 100)
+    return x
+
+
+@param.int("x", interval=[0, 10])
+def f_stubborn(x):
+    """Stub objective function that does not respond to cancellation."""
+    # like C code that does not return to the interpreter
+    signal.signal(ProcessWorker.SIGNAL_CANCEL, signal.SIG_IGN)
+    time.sleep(60)
+    return x
+
+
 class TestMultiProcessInvoker(object):
     """
     Integration tests for the multiprocess invoker.
@@ -73,6 +146,181 @@ class TestMultiProcessInvoker(object):
         )
         assert not caller.on_error.called
 
+    def test_invoke_with_initializer(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1,
+                                            initializer=initialize,
+                                            initargs=(5,))
+        caller = Mock()
+
+        self._invoker.f = f_context
+        self._invoker.param_spec = f_context.param_spec
+        self._invoker.return_spec = ReturnSpec(f_context)
+
+        args = ArgsCreator(f_context.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        caller.on_result.assert_called_once_with(
+            value=ReturnValuesWrapper(None, 5),
+            fargs=args,
+        )
+        assert not caller.on_error.called
+
+    def test_invoke_with_placement(self):
+        self._invoker.stop()
+        # a single worker gets two CPUs to run two threads on
+        self._invoker = MultiProcessInvoker(
+            resources=2, placement=WorkerPlacement(threads_per_worker=2))
+        caller = Mock()
+
+        self._invoker.f = f_threads
+        self._invoker.param_spec = f_threads.param_spec
+        self._invoker.return_spec = ReturnSpec(f_threads)
+
+        args = ArgsCreator(f_threads.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        assert self._invoker._employer.worker_count_max == 1
+        caller.on_result.assert_called_once_with(
+            value=ReturnValuesWrapper(None, 2),
+            fargs=args,
+        )
+
+    def test_memory_limit_replaces_worker(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1,
+                                            memory_limit=100 * 2 ** 20,
+                                            memory_interval=0.02)
+        self._invoker.param_spec = f_working.param_spec
+        self._invoker.return_spec = ReturnSpec(f_working)
+        caller = Mock()
+        args = ArgsCreator(f_working.param_spec).args()
+
+        self._invoker.f = f_greedy
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        assert isinstance(call_handle.exception(timeout=5), MemoryLimitError)
+        assert call_handle.memory_peak > 100 * 2 ** 20
+
+        # a new worker takes over
+        self._invoker.f = f_working
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        assert caller.on_result.call_count == 1
+        caller.on_error.assert_called_once_with(
+            value=call_handle.exception(), fargs=args)
+
+    def test_invoke_many_calls_batch_function_per_worker(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=2)
+        caller = Mock()
+
+        self._invoker.f = f_batch
+        self._invoker.param_spec = f_batch.param_spec
+        self._invoker.return_spec = ReturnSpec(f_batch)
+
+        fargs_list = [ArgsCreator(f_batch.param_spec).args((x,))
+                      for x in range(5)]
+        kwargs_list = [dict(index=x) for x in range(5)]
+        call_handles = self._invoker.invoke_many(
+            caller=caller, fargs_list=fargs_list, kwargs_list=kwargs_list)
+        self._invoker.wait()
+
+        # two batches of three and two candidates
+        values = [300, 301, 302, 203, 204]
+        assert [call_handle.result(timeout=5).raw_values
+                for call_handle in call_handles] == values
+        assert caller.on_result.call_count == 5
+        for fargs, value, x in zip(fargs_list, values, range(5)):
+            caller.on_result.assert_any_call(
+                value=ReturnValuesWrapper(None, value), fargs=fargs, index=x)
+        assert not caller.on_error.called
+
+    def test_invoke_calls_batch_function_with_batch_of_one(self):
+        caller = Mock()
+
+        self._invoker.f = f_batch
+        self._invoker.param_spec = f_batch.param_spec
+        self._invoker.return_spec = ReturnSpec(f_batch)
+
+        args = ArgsCreator(f_batch.param_spec).args((3,))
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        caller.on_result.assert_called_once_with(
+            value=ReturnValuesWrapper(None, 103), fargs=args)
+
+    def test_batch_candidates_get_even_shares_of_batch_duration(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1,
+                                            duration_model=DurationModel(k=1))
+        caller = Mock()
+
+        self._invoker.f = f_batch
+        self._invoker.param_spec = f_batch.param_spec
+        self._invoker.return_spec = ReturnSpec(f_batch)
+
+        fargs_list = [ArgsCreator(f_batch.param_spec).args((x,))
+                      for x in range(4)]
+        call_handles = self._invoker.invoke_many(caller=caller,
+                                                 fargs_list=fargs_list)
+        self._invoker.wait()
+
+        # one batch of four candidates, each recorded with a quarter of it
+        duration = self._invoker._status_db.get_duration(
+            call_id=call_handles[0]._call_id)
+        assert len(self._invoker.duration_model) == 4
+        assert self._invoker.duration_model.predict_many(fargs_list) == \
+            [duration / 4] * 4
+
+    def test_invoke_shares_extra_arrays(self):
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest("NumPy is not installed.")
+        caller = Mock()
+
+        self._invoker.f = f_data
+        self._invoker.param_spec = deepcopy(f_data.param_spec)
+        self._invoker.param_spec.extra_kwargs = {"data": numpy.ones(100)}
+        self._invoker.return_spec = ReturnSpec(f_data)
+
+        args = ArgsCreator(f_data.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        caller.on_result.assert_called_once_with(
+            value=ReturnValuesWrapper(None, 100),
+            fargs=args,
+        )
+
+    def test_invoke_shares_extra_arrays_changed_in_place_again(self):
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest("NumPy is not installed.")
+        caller = Mock()
+
+        data = numpy.ones(100)
+        self._invoker.f = f_data
+        self._invoker.param_spec = deepcopy(f_data.param_spec)
+        self._invoker.param_spec.extra_kwargs = {"data": data}
+        self._invoker.return_spec = ReturnSpec(f_data)
+
+        args = ArgsCreator(f_data.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+        data[:] = 2
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        values = [kwargs["value"] for _, kwargs
+                  in caller.on_result.call_args_list]
+        assert values == [ReturnValuesWrapper(None, 100),
+                          ReturnValuesWrapper(None, 200)]
+
     def test_optimizer_on_result(self):
         optimizer = SingleInvokeOptimizer()
         optimizer.on_result = Mock()
@@ -130,5 +378,358 @@ class TestMultiProcessInvoker(object):
         assert not caller.on_result.called
         assert caller.on_error.called
 
+    def test_invoke_many_calls_on_result_for_each_call(self):
+        caller = Mock()
+
+        self._invoker.f = f_working
+        self._invoker.param_spec = f_working.param_spec
+        self._invoker.return_spec = ReturnSpec(f_working)
+
+        args = ArgsCreator(f_working.param_spec).args()
+        fargs_list = [args] * 5
+        kwargs_list = [dict(data=i) for i in range(5)]
+        call_handles = self._invoker.invoke_many(caller=caller,
+                                                 fargs_list=fargs_list,
+                                                 kwargs_list=kwargs_list)
+        self._invoker.wait()
+
+        assert len(call_handles) == 5
+        assert not caller.on_error.called
+        datas = sorted(kwargs["data"] for _, kwargs
+                       in caller.on_result.call_args_list)
+        assert datas == list(range(5))
+
+    def test_call_handles_are_done_once_wait_returns(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1, chunk=4)
+        caller = Mock()
+
+        self._invoker.f = f_working
+        self._invoker.param_spec = f_working.param_spec
+        self._invoker.return_spec = ReturnSpec(f_working)
+
+        args = ArgsCreator(f_working.param_spec).args()
+        call_handles = self._invoker.invoke_many(caller=caller,
+                                                 fargs_list=[args] * 20)
+        self._invoker.wait()
+
+        assert all(call_handle.done() for call_handle in call_handles)
+        assert all(call_handle.time_started is not None
+                   for call_handle in call_handles)
+
+    def test_invoke_raises_without_workers(self):
+        # another invoker uses the only CPU we may use
+        invoker_other = MultiProcessInvoker(resources=1)
+        invoker_other._employer.employ()
+        caller = Mock()
+
+        self._invoker.f = f_working
+        self._invoker.param_spec = f_working.param_spec
+        self._invoker.return_spec = ReturnSpec(f_working)
+        args = ArgsCreator(f_working.param_spec).args()
+        try:
+            self._invoker.invoke(caller=caller, fargs=args)
+            assert False, "Invoking without workers did not raise."
+        except NoWorkerError:
+            pass
+        finally:
+            invoker_other.stop()
+
+    def test_invoke_many_in_chunks_reports_each_call(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1, chunk=4)
+        caller = Mock()
+
+        self._invoker.f = f_working
+        self._invoker.param_spec = f_working.param_spec
+        self._invoker.return_spec = ReturnSpec(f_working)
+
+        args = ArgsCreator(f_working.param_spec).args()
+        call_handles = self._invoker.invoke_many(
+            caller=caller, fargs_list=[args] * 20,
+            kwargs_list=[dict(data=i) for i in range(20)])
+        self._invoker.wait()
+
+        assert all(call_handle.time_started is not None
+                   for call_handle in call_handles)
+        assert not caller.on_error.called
+        datas = sorted(kwargs["data"] for _, kwargs
+                       in caller.on_result.call_args_list)
+        assert datas == list(range(20))
+
+    def test_chunk_adapts_to_call_duration(self):
+        caller = Mock()
+        self._invoker.param_spec = f_working.param_spec
+        self._invoker.return_spec = ReturnSpec(f_working)
+        args = ArgsCreator(f_working.param_spec).args()
+
+        self._invoker.f = f_working
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 50)
+        self._invoker.wait()
+        assert self._invoker.chunk > 1
+
+        self._invoker.f = f_slow
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 10)
+        self._invoker.wait()
+        assert self._invoker.chunk == 1
+
+    def test_invoke_many_issues_longest_predicted_calls_first(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1, chunk=1,
+                                            duration_model=DurationModel(k=1))
+        caller = Mock()
+
+        self._invoker.f = f_sleeping
+        self._invoker.param_spec = f_sleeping.param_spec
+        self._invoker.return_spec = ReturnSpec(f_sleeping)
+        creator = ArgsCreator(f_sleeping.param_spec)
+
+        # the model learns from the calls completed
+        self._invoker.invoke_many(caller=caller, fargs_list=[
+            creator.args((x,)) for x in (0, 5, 10)])
+        self._invoker.wait()
+        assert len(self._invoker.duration_model) == 3
+
+        xs = (1, 9, 5)
+        call_handles = self._invoker.invoke_many(caller=caller, fargs_list=[
+            creator.args((x,)) for x in xs])
+        self._invoker.wait()
+
+        assert all(call_handle.duration_predicted is not None
+                   for call_handle in call_handles)
+        times_started = dict(zip(xs, (call_handle.time_started
+                                      for call_handle in call_handles)))
+        assert times_started[9] < times_started[5] < times_started[1]
+
+    def test_invoke_many_issues_higher_priorities_first(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1, prefetch=1, chunk=1)
+        caller = Mock()
+
+        self._invoker.f = f_sleeping
+        self._invoker.param_spec = f_sleeping.param_spec
+        self._invoker.return_spec = ReturnSpec(f_sleeping)
+        creator = ArgsCreator(f_sleeping.param_spec)
+
+        call_handles = self._invoker.invoke_many(
+            caller=caller, fargs_list=[creator.args((1,))] * 4,
+            priorities=[0, 0, 5, 1])
+        self._invoker.wait()
+
+        times_started = [call_handle.time_started
+                         for call_handle in call_handles]
+        assert times_started[2] < times_started[3] < times_started[0] < \
+            times_started[1]
+        stats = self._invoker.queue_stats
+        assert [stats[priority].issued for priority in (0, 1, 5)] == [2, 1, 1]
+        assert all(stats[priority].queued == 0 for priority in (0, 1, 5))
+
+    def test_concurrent_invokes_issue_higher_priorities_first(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1, prefetch=1, chunk=1)
+        caller = Mock()
+
+        self._invoker.f = f_sleeping
+        self._invoker.param_spec = f_sleeping.param_spec
+        self._invoker.return_spec = ReturnSpec(f_sleeping)
+        creator = ArgsCreator(f_sleeping.param_spec)
+
+        # one thread keeps the only worker busy and waits for room
+        call_handles_low = []
+        thread_low = Thread(target=lambda: call_handles_low.extend(
+            self._invoker.invoke_many(caller=caller, fargs_list=[
+                creator.args((10,))] * 3)))
+        thread_low.start()
+        time_limit = time.time() + 5
+        while getattr(self._invoker.queue_stats.get(0), "queued", 0) < 2:
+            assert time.time() < time_limit
+            time.sleep(0.001)
+
+        # another thread invokes an urgent call meanwhile
+        call_handles_high = []
+        thread_high = Thread(target=lambda: call_handles_high.append(
+            self._invoker.invoke(caller=caller, fargs=creator.args((1,)),
+                                 priority=5)))
+        thread_high.start()
+        thread_low.join()
+        thread_high.join()
+        self._invoker.wait()
+
+        time_started_high = call_handles_high[0].time_started
+        times_started_low = [call_handle.time_started
+                             for call_handle in call_handles_low]
+        assert times_started_low[0] < time_started_high < \
+            times_started_low[1] < times_started_low[2]
+
+    def test_slow_call_among_fast_ones_starts_while_it_runs(self):
+        caller = Mock()
+        self._invoker.f = f_sleeping
+        self._invoker.param_spec = f_sleeping.param_spec
+        self._invoker.return_spec = ReturnSpec(f_sleeping)
+        creator = ArgsCreator(f_sleeping.param_spec)
+
+        # calls turn out to be fast, so that reports get chunked
+        self._invoker.invoke_many(caller=caller,
+                                  fargs_list=[creator.args((0,))] * 50)
+        self._invoker.wait()
+
+        call_handles = self._invoker.invoke_many(
+            caller=caller,
+            fargs_list=[creator.args((0,))] * 3 + [creator.args((10,))] +
+            [creator.args((0,))] * 3)
+        self._invoker.wait()
+
+        # the start callback fired long before the outcome arrived
+        call_handle = call_handles[3]
+        assert call_handle.time_done - call_handle.time_started > 0.05
+
+    def _use_slow_function_prefetching(self, prefetch):
+        """Replaces the invoker by one issuing that many calls per worker."""
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1, prefetch=prefetch)
+        self._invoker.f = f_slow
+        self._invoker.param_spec = f_slow.param_spec
+        self._invoker.return_spec = ReturnSpec(f_slow)
+
+    def test_invoke_returns_before_call_starts(self):
+        self._use_slow_function_prefetching(prefetch=3)
+        caller = Mock()
+        args = ArgsCreator(self._invoker.param_spec).args()
+
+        time_start = time.time()
+        for _ in range(3):
+            self._invoker.invoke(caller=caller, fargs=args)
+        # the single worker needs 0.1 seconds for each call
+        assert time.time() - time_start < 0.1
+
+        self._invoker.wait()
+        assert caller.on_result.call_count == 3
+        assert not caller.on_error.called
+
+    def test_stop_call_cancels_queued_call(self):
+        self._use_slow_function_prefetching(prefetch=2)
+        caller = Mock()
+        args = ArgsCreator(self._invoker.param_spec).args()
+
+        self._invoker.invoke(caller=caller, fargs=args)
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        reason = Exception()
+        call_handle.stop(reason=reason)
+        self._invoker.wait()
+
+        assert caller.on_result.call_count == 1
+        caller.on_error.assert_called_once_with(value=reason, fargs=args)
+
+    def _stop_running_call(self, f):
+        """Stops a running call of f, returns the id of the worker after."""
+        self._invoker.f = f
+        caller = Mock()
+        args = ArgsCreator(self._invoker.param_spec).args()
+        started = Event()
+
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        call_handle.add_start_callback(started.set)
+        worker_id = self._invoker._employer.worker_ids[0]
+        started.wait(timeout=5)
+        time.sleep(0.05)  # let f get going
+        reason = Exception()
+        call_handle.stop(reason=reason)
+
+        self._invoker.f = f_working
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        caller.on_error.assert_called_once_with(value=reason, fargs=args)
+        assert caller.on_result.call_count == 1
+        return worker_id, self._invoker._employer.worker_ids[0]
+
+    def test_stop_call_aborts_running_call_in_worker(self):
+        worker_id, worker_id_after = self._stop_running_call(f_slow)
+        assert worker_id_after == worker_id
+
+    def test_stop_call_replaces_unresponsive_worker(self):
+        self._invoker.stop()
+        self._invoker = MultiProcessInvoker(resources=1, grace_period=0.2)
+
+        time_start = time.time()
+        worker_id, worker_id_after = self._stop_running_call(f_stubborn)
+        assert worker_id_after != worker_id
+        assert time.time() - time_start < 5
+
+    def test_start_callback_is_called_upon_start(self):
+        self._use_slow_function_prefetching(prefetch=2)
+        caller = Mock()
+        args = ArgsCreator(self._invoker.param_spec).args()
+        started = Event()
+
+        self._invoker.invoke(caller=caller, fargs=args)
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        call_handle.add_start_callback(started.set)
+
+        assert not started.is_set()
+        started.wait(timeout=1)
+        assert started.is_set()
+        self._invoker.wait()
+
+    def test_futures_complete_without_waiting(self):
+        self._use_slow_function_prefetching(prefetch=3)
+        caller = Mock()
+        args = ArgsCreator(self._invoker.param_spec).args()
+
+        call_handles = self._invoker.invoke_many(caller=caller,
+                                                 fargs_list=[args] * 3)
+        done, not_done = wait(call_handles, timeout=5,
+                              return_when=FIRST_COMPLETED)
+        assert len(done) >= 1
+        results = [call_handle.result()
+                   for call_handle in as_completed(call_handles, timeout=5)]
+        self._invoker.wait()
+
+        assert sorted(results) == sorted(kwargs["value"] for _, kwargs
+                                         in caller.on_result.call_args_list)
+
+    def test_future_raises_error_of_call(self):
+        caller = Mock()
+        self._invoker.f = f_failing
+        self._invoker.param_spec = f_failing.param_spec
+        self._invoker.return_spec = ReturnSpec(f_failing)
+        args = ArgsCreator(f_failing.param_spec).args()
+
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        error = call_handle.exception(timeout=5)
+        self._invoker.wait()
+
+        caller.on_error.assert_called_once_with(value=error, fargs=args)
+
+    def test_future_records_times(self):
+        self._use_slow_function_prefetching(prefetch=1)
+        caller = Mock()
+        args = ArgsCreator(self._invoker.param_spec).args()
+
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        call_handle.result(timeout=5)
+
+        assert not call_handle.running()
+        assert call_handle.time_invoked <= call_handle.time_started <= \
+            call_handle.time_done
+        # the call takes 0.1 seconds
+        assert call_handle.duration > 0.05
+        self._invoker.wait()
+
+    def test_cancel_future_stops_call(self):
+        self._use_slow_function_prefetching(prefetch=2)
+        caller = Mock()
+        args = ArgsCreator(self._invoker.param_spec).args()
+
+        self._invoker.invoke(caller=caller, fargs=args)
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        assert call_handle.cancel()
+        self._invoker.wait()
+
+        assert call_handle.cancelled()
+        assert call_handle.stopped
+        assert caller.on_result.call_count == 1
+        assert caller.on_error.call_count == 1
+
 if __name__ == '__main__':
     nose.runmodule()
@@ -215,5 +215,79 @@ class TestPluggable(object):
         args = ArgsCreator(f.param_spec).args()
         invoker.invoke(stub_caller, args)
 
+    def test_invoke_many_calls_plugins_for_each_invocation(self):
+        mock_plugin = Mock()
+        plugins = [mock_plugin]
+
+        stub_invoker = Mock()
+        stub_invoker.f = f
+        stub_invoker.invoke_many = Mock(return_value=[Mock(), Mock()])
+
+        invoker = PluggableInvoker(stub_invoker, plugins=plugins)
+        invoker.f = f
+
+        args_creator = ArgsCreator(f.param_spec)
+        fargs_list = [args_creator.args(), args_creator.args()]
+        tasks = invoker.invoke_many(caller=None, fargs_list=fargs_list)
+
+        eq_(tasks, stub_invoker.invoke_many.return_value)
+        eq_(mock_plugin.before_invoke.call_count, 2)
+        eq_(mock_plugin.on_invoke.call_count, 2)
+        _, kwargs = stub_invoker.invoke_many.call_args
+        eq_(kwargs["fargs_list"], fargs_list)
+        for task, kwargs_invoker in zip(tasks, kwargs["kwargs_list"]):
+            eq_(kwargs_invoker["invocation"].current_task, task)
+
+    def test_invoke_many_calls_on_invoke_before_on_result(self):
+        events = []
+        mock_plugin = Mock()
+        mock_plugin.on_invoke.side_effect = \
+            lambda invocation: events.append(("on_invoke", invocation))
+        mock_plugin.on_result.side_effect = \
+            lambda invocation: events.append(("on_result", invocation))
+        plugins = [mock_plugin]
+
+        stub_invoker = Mock()
+        stub_invoker.f = f
+        invoker = PluggableInvoker(stub_invoker, plugins=plugins)
+        invoker.f = f
+
+        def stub_invoke_many(caller, fargs_list, kwargs_list):
+            # fast calls may be done before the tasks are returned
+            for fargs, kwargs in zip(fargs_list, kwargs_list):
+                caller.on_result(value=0, fargs=fargs, **kwargs)
+            return [Mock() for _ in fargs_list]
+
+        stub_invoker.invoke_many = Mock(side_effect=stub_invoke_many)
+
+        args_creator = ArgsCreator(f.param_spec)
+        fargs_list = [args_creator.args(), args_creator.args()]
+        invoker.invoke_many(caller=Mock(), fargs_list=fargs_list)
+
+        eq_([name for name, _ in events], ["on_invoke", "on_result"] * 2)
+        eq_(events[0][1], events[1][1])
+        eq_(events[2][1], events[3][1])
+
+    def test_invoke_passes_priorities_only_if_given(self):
+        stub_invoker = Mock()
+        stub_invoker.f = f
+        stub_invoker.invoke = Mock(return_value=Mock())
+        stub_invoker.invoke_many = Mock(return_value=[Mock()])
+
+        invoker = PluggableInvoker(stub_invoker, plugins=[])
+        invoker.f = f
+        args = ArgsCreator(f.param_spec).args()
+
+        invoker.invoke(caller=None, fargs=args)
+        _, kwargs = stub_invoker.invoke.call_args
+        assert "priority" not in kwargs
+        invoker.invoke(caller=None, fargs=args, priority=3)
+        _, kwargs = stub_invoker.invoke.call_args
+        eq_(kwargs["priority"], 3)
+
+        invoker.invoke_many(caller=None, fargs_list=[args], priorities=[2])
+        _, kwargs = stub_invoker.invoke_many.call_args
+        eq_(kwargs["priorities"], [2])
+
 if __name__ == '__main__':
     nose.runmodule()
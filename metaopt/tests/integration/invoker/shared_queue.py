@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the shared queue invoker with worker nodes on localhost.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+# Third Party
+import nose
+from mock import Mock
+
+# First Party
+import metaopt
+from metaopt.concurrent.invoker.shared_queue import SharedQueueInvoker
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.optimize.optimize import custom_optimize
+from metaopt.core.paramspec.util import param
+from metaopt.core.returnspec.returnspec import ReturnSpec
+from metaopt.core.stoppable.util.exception import StoppedError
+from metaopt.objective.integer.failing.f import f as f_failing
+from metaopt.objective.integer.fast.explicit.f import f as f_working
+from metaopt.objective.integer.slow.explicit.f import f as f_slow
+from metaopt.optimizer.gridsearch import GridSearchOptimizer
+
+# directory the nodes import metaopt from
+PATH = os.path.dirname(os.path.dirname(os.path.abspath(metaopt.__file__)))
+
+
+@param.int("x", interval=[0, 10])
+def f_stalling(x):
+    """Stub objective function whose first call suspends its process."""
+    marker = os.path.join(os.environ["METAOPT_TEST_DIRECTORY"], "stalled")
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        # stall while executing the call, between transactions
+        os.kill(os.getpid(), signal.SIGSTOP)
+    time.sleep(0.1)
+    return x
+
+
+class TestSharedQueueInvoker(object):
+    """
+    Integration tests for the shared queue invoker with worker nodes on
+    localhost.
+    """
+
+    def __init__(self):
+        self._directory = None
+        self._invoker = None
+        self._nodes = []
+
+    def setup(self):
+        self._directory = tempfile.mkdtemp()
+        self._invoker = SharedQueueInvoker(
+            path=os.path.join(self._directory, "queue.db"), lease=1)
+        self._nodes = []
+
+    def teardown(self):
+        try:
+            self._invoker.stop()
+        except StoppedError:
+            pass
+
+        # nodes exit as soon as the queue is closed, unless they were stopped
+        deadline = time.time() + 5
+        for node in self._nodes:
+            self._signal(node, signal.SIGCONT)
+            while node.poll() is None and time.time() < deadline:
+                time.sleep(0.05)
+            if node.poll() is None:
+                node.terminate()
+            node.wait()
+
+        shutil.rmtree(self._directory)
+
+    def _start_node(self, workers):
+        """Starts a node with the given number of workers."""
+        environment = dict(os.environ)
+        environment[str("PYTHONPATH")] = str(PATH)
+        environment[str("METAOPT_TEST_DIRECTORY")] = str(self._directory)
+
+        node = subprocess.Popen([sys.executable, "-m", "metaopt", "worker",
+                                 "--queue", self._invoker.path,
+                                 "--workers", str(workers)],
+                                env=environment, preexec_fn=os.setsid)
+        self._nodes.append(node)
+        return node
+
+    @staticmethod
+    def _signal(node, signum):
+        """Sends the given signal to the node and its workers."""
+        try:
+            os.killpg(node.pid, signum)
+        except OSError:
+            # The node and its workers exited already.
+            pass
+
+    def _use(self, function):
+        self._invoker.f = function
+        self._invoker.param_spec = function.param_spec
+        self._invoker.return_spec = ReturnSpec(function)
+
+    def test_custom_optimize(self):
+        self._start_node(workers=2)
+        result = custom_optimize(f_working, invoker=self._invoker,
+                                 optimizer=GridSearchOptimizer())
+        assert result[0].value == 10
+
+    def test_nodes_exit_when_stopped(self):
+        node = self._start_node(workers=1)
+        time.sleep(0.5)
+        self._invoker.stop()
+        assert node.wait() == 0
+
+    def test_invoke_reports_errors(self):
+        caller = Mock()
+        self._use(f_failing)
+        self._start_node(workers=1)
+
+        args = ArgsCreator(f_failing.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        assert caller.on_error.call_count == 1
+        assert not caller.on_result.called
+
+    def test_requeues_calls_of_killed_node(self):
+        caller = Mock()
+        self._use(f_slow)
+        node = self._start_node(workers=1)
+        self._start_node(workers=1)
+
+        args = ArgsCreator(f_slow.param_spec).args()
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 10)
+        time.sleep(0.5)
+        # kill the workers, too, so that they do not renew their leases
+        self._signal(node, signal.SIGKILL)
+        self._invoker.wait()
+
+        assert caller.on_result.call_count == 10
+        assert not caller.on_error.called
+
+    def test_requeues_calls_of_stalled_worker(self):
+        caller = Mock()
+        self._use(f_stalling)
+        self._start_node(workers=1)
+        self._start_node(workers=1)
+
+        args = ArgsCreator(f_stalling.param_spec).args()
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 10)
+        self._invoker.wait()
+
+        # the lease of the stalled call expired, so another worker took it
+        assert os.path.exists(os.path.join(self._directory, "stalled"))
+        assert caller.on_result.call_count == 10
+        assert not caller.on_error.called
+
+    def test_stop_call_reports_layoff(self):
+        caller = Mock()
+        self._use(f_slow)
+        self._start_node(workers=1)
+
+        args = ArgsCreator(f_slow.param_spec).args()
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        reason = Exception()
+        call_handle.stop(reason=reason)
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        caller.on_error.assert_called_once_with(value=reason, fargs=args)
+        assert caller.on_result.call_count == 1
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the single process invoker.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Third Party
+import nose
+from mock import Mock
+
+# First Party
+from metaopt.concurrent.invoker.singleprocess import SingleProcessInvoker
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.objective.integer.failing.f import f as f_failing
+from metaopt.objective.integer.fast.explicit.f import f as f_working
+
+
+def test_invoke_many_returns_call_handles_done_already():
+    caller = Mock()
+    invoker = SingleProcessInvoker()
+    invoker.f = f_working
+
+    creator = ArgsCreator(f_working.param_spec)
+    fargs_list = [creator.args(), creator.args()]
+    call_handles = invoker.invoke_many(caller=caller, fargs_list=fargs_list)
+
+    assert len(call_handles) == 2
+    assert all(call_handle.done() for call_handle in call_handles)
+    values = [kwargs["value"] for _, kwargs
+              in caller.on_result.call_args_list]
+    assert [call_handle.result() for call_handle in call_handles] == values
+
+
+def test_invoke_many_returns_call_handles_of_errors():
+    invoker = SingleProcessInvoker()
+    invoker.f = f_failing
+
+    args = ArgsCreator(f_failing.param_spec).args()
+    call_handle, = invoker.invoke_many(caller=Mock(), fargs_list=[args])
+
+    assert call_handle.exception() is not None
+
+
+def test_invoke_many_gives_each_call_its_own_kwargs():
+    caller = Mock()
+    invoker = SingleProcessInvoker()
+    invoker.f = f_working
+
+    def on_result(value, fargs, **kwargs):
+        kwargs["seen"] = True
+
+    caller.on_result.side_effect = on_result
+    creator = ArgsCreator(f_working.param_spec)
+    invoker.invoke_many(caller=caller, fargs_list=[creator.args()] * 2)
+
+    for _, kwargs in caller.on_result.call_args_list:
+        assert "seen" not in kwargs
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the thread pool invoker.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Third Party
+import nose
+from mock import Mock
+
+# First Party
+from metaopt.concurrent.invoker.pluggable import PluggableInvoker
+from metaopt.concurrent.invoker.threadpool import ThreadPoolInvoker
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.optimize.optimize import custom_optimize
+from metaopt.core.returnspec.returnspec import ReturnSpec
+from metaopt.core.returnspec.util.wrapper import ReturnValuesWrapper
+from metaopt.core.stoppable.util.exception import StoppedError
+from metaopt.objective.integer.failing.f import f as f_failing
+from metaopt.objective.integer.fast.explicit.f import f as f_working
+from metaopt.objective.integer.slow.explicit.f import f as f_slow
+from metaopt.optimizer.gridsearch import GridSearchOptimizer
+from metaopt.plugin.timeout import TimeoutPlugin
+
+
+class TestThreadPoolInvoker(object):
+    """
+    Integration tests for the thread pool invoker.
+    """
+
+    def __init__(self):
+        self._invoker = None
+
+    def setup(self):
+        self._invoker = ThreadPoolInvoker(resources=2)
+
+    def teardown(self):
+        try:
+            self._invoker.stop()
+        except StoppedError:
+            pass
+
+    def _use(self, function):
+        self._invoker.f = function
+        self._invoker.param_spec = function.param_spec
+        self._invoker.return_spec = ReturnSpec(function)
+
+    def test_invoke_calls_on_result(self):
+        caller = Mock()
+        self._use(f_working)
+
+        args = ArgsCreator(f_working.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args, data=None)
+        self._invoker.wait()
+
+        caller.on_result.assert_called_once_with(
+            value=ReturnValuesWrapper(None, 0), fargs=args, data=None)
+        assert not caller.on_error.called
+
+    def test_invoke_not_successful_calls_on_error(self):
+        caller = Mock()
+        self._use(f_failing)
+
+        args = ArgsCreator(f_failing.param_spec).args()
+        self._invoker.invoke(caller=caller, fargs=args)
+        self._invoker.wait()
+
+        assert not caller.on_result.called
+        assert caller.on_error.called
+
+    def test_invoke_many_calls_on_result_for_each_call(self):
+        caller = Mock()
+        self._use(f_working)
+
+        args = ArgsCreator(f_working.param_spec).args()
+        self._invoker.invoke_many(caller=caller, fargs_list=[args] * 5)
+        self._invoker.wait()
+
+        assert caller.on_result.call_count == 5
+        assert not caller.on_error.called
+
+    def test_stop_call_reports_layoff(self):
+        caller = Mock()
+        self._use(f_slow)
+
+        args = ArgsCreator(f_slow.param_spec).args()
+        call_handle = self._invoker.invoke(caller=caller, fargs=args)
+        reason = Exception()
+        call_handle.stop(reason=reason)
+        self._invoker.wait()
+
+        assert not caller.on_result.called
+        caller.on_error.assert_called_once_with(value=reason, fargs=args)
+
+    def test_custom_optimize_with_plugins(self):
+        self._invoker = PluggableInvoker(ThreadPoolInvoker(resources=2),
+                                         plugins=[TimeoutPlugin(1)])
+        result = custom_optimize(f_working, invoker=self._invoker,
+                                 optimizer=GridSearchOptimizer())
+        assert result[0].value == 10
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the steady-state mode of the SAES optimizer.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import time
+
+# Third Party
+import nose
+
+# First Party
+from metaopt.concurrent.invoker.multiprocess import MultiProcessInvoker
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.optimize.optimize import custom_optimize
+from metaopt.core.paramspec.util import param
+from metaopt.core.returnspec.returnspec import ReturnSpec
+from metaopt.core.stoppable.util.exception import StoppedError
+from metaopt.optimizer.saes import SAESOptimizer
+from metaopt.optimizer.util.quorum import Quorum
+
+
+@param.float("a", interval=(-1, 1))
+@param.float("b", interval=(-1, 1))
+def f(a, b):
+    return a ** 2 + b ** 2
+
+
+@param.float("a", interval=(-1, 1))
+@param.float("b", interval=(-1, 1))
+def f_varying(a, b):
+    # calls of some individuals take ten times as long as others
+    time.sleep(0.05 if a < 0 else 0.005)
+    return a ** 2 + b ** 2
+
+
+@param.float("a", interval=(-1, 1))
+@param.float("b", interval=(-1, 1))
+def f_straggling(a, b):
+    # some individuals take forever
+    time.sleep(60 if a < -0.5 else 0.01)
+    return a ** 2 + b ** 2
+
+
+class SynchronousInvoker(object):
+    """Stub invoker that calls back before invoke returns."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def invoke(self, caller, fargs, **kwargs):
+        if self.calls == 0:
+            raise StoppedError()
+        self.calls -= 1
+        value = f(*[arg.value for arg in fargs])
+        caller.on_result(value=value, fargs=fargs, **kwargs)
+
+    def wait(self):
+        pass
+
+
+def test_steady_state_keeps_workers_busy():
+    optimizer = SAESOptimizer(mu=5, lamb=10, steady_state=True)
+    invoker = MultiProcessInvoker(resources=2)
+
+    args = custom_optimize(f_varying, invoker=invoker, timeout=2,
+                           optimizer=optimizer)
+
+    assert len(args) == 2
+    # each call got replaced as soon as it was done, never waiting for the
+    # slowest call of a generation
+    assert optimizer.evaluations > 2 * optimizer.lamb
+    assert len(optimizer.scored_population) <= optimizer.mu
+    assert optimizer.generation > 1
+
+
+def test_steady_state_does_not_nest_invokes():
+    optimizer = SAESOptimizer(mu=5, lamb=10, steady_state=True)
+
+    args = optimizer.optimize(invoker=SynchronousInvoker(calls=5000),
+                              param_spec=f.param_spec)
+
+    assert len(args) == 2
+    assert optimizer.evaluations == 5000
+
+def test_quorum_finishes_generation_without_stragglers():
+    optimizer = SAESOptimizer(mu=2, lamb=8, quorum=Quorum(fraction=0.75))
+    invoker = MultiProcessInvoker(resources=8)
+    invoker.f = f_straggling
+    invoker.param_spec = f_straggling.param_spec
+    invoker.return_spec = ReturnSpec(f_straggling)
+    optimizer._invoker = invoker
+
+    # the last two individuals straggle
+    args_creator = ArgsCreator(f_straggling.param_spec)
+    optimizer.population = [(args_creator.args((a, 0.0)), [0.1, 0.1])
+                            for a in (0, 0.1, 0.2, 0.3, 0.4, 0.5, -1, -1)]
+
+    time_start = time.time()
+    try:
+        optimizer.score_population()
+    finally:
+        invoker.stop()
+
+    assert time.time() - time_start < 10
+    assert len(optimizer.scored_population) == 6
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -11,6 +11,7 @@ import nose
 
 # First Party
 from metaopt.concurrent.invoker.util.determine_package import determine_package
+from metaopt.concurrent.invoker.util.status_db import StatusDB
 from metaopt.concurrent.worker.util.import_function import import_function
 
 
@@ -38,15 +39,30 @@ class TestImportFunction(object):
         import_function(determine_package(f))
         assert f() == "My name is f."
 
-    def _test_import_local_class(self): # TODO
+    def test_import_local_class_by_name(self):
         """A function can be imported by the package of a class next to it."""
         module = determine_package(LocalClass)
         name = f.__name__
 
         function = {"module": module, "name": name}
 
-        import_function(function)
-        assert f() == "My name is f."
+        assert import_function(function)() == "My name is f."
+
+    def test_import_qualified_name(self):
+        """A function can be imported by module and name separated by colon."""
+        function = import_function(determine_package(f) + ":f")
+        assert function() == "My name is f."
+
+    def test_import_qualified_method(self):
+        """A method can be imported by its dotted qualified name."""
+        method = import_function("metaopt.concurrent.invoker.util." +
+                                 "status_db.StatusDB.issue_tasks")
+        assert method == StatusDB.issue_tasks
+
+    def test_import_module_defaults_to_f(self):
+        """A module name alone imports the module's function f."""
+        function = import_function(determine_package(f))
+        assert function.__name__ == "f"
 
     def test_import_local_class(self):
         """A function can be imported by the package of a class next to it."""
@@ -7,7 +7,8 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
-from multiprocessing import Manager
+import signal
+import time
 
 # Third Party
 import nose
@@ -16,6 +17,8 @@ from nose.tools.nontrivial import raises
 
 # First Party
 from metaopt.concurrent.employer.process import ProcessWorkerEmployer
+from metaopt.concurrent.employer.util.exception import LayoffError
+from metaopt.concurrent.transport.pipe import PipeTransport
 
 
 class TestProcessWorkerEmployer(object):
@@ -24,28 +27,23 @@ class TestProcessWorkerEmployer(object):
     """
 
     def __init__(self):
-        self._queue_outcome = None
-        self._queue_start = None
-        self._queue_task = None
+        self._transport = None
+        self._status_db = None
         self._employer = None
 
     def setup(self):
         """Nose will run this method before every test method."""
-        manager = Manager()
-        self._queue_task = manager.Queue()  # ignore error, this works
-        self._queue_start = manager.Queue()  # ignore error, this works
-        self._queue_outcome = manager.Queue()  # ignore error, this works
+        self._transport = PipeTransport()
 
         self._status_db = Mock()
         self._status_db.get_running_call = Mock(return_value=None)
-        self._employer = ProcessWorkerEmployer(queue_tasks=self._queue_task,
-                                              queue_outcome=self._queue_outcome,
-                                              queue_start=self._queue_start,
-                                              status_db=self._status_db)
+        self._employer = ProcessWorkerEmployer(transport=self._transport,
+                                               status_db=self._status_db)
 
     def teardown(self):
         """Nose will run this method after every test method."""
         self._employer.abandon()
+        self._transport.close()
 
     def test_employ_once(self):
         """
@@ -124,9 +122,7 @@ class TestProcessWorkerEmployer(object):
 
     def test_is_borg(self):
         """There can only be one instance of a worker process _employer."""
-        my_provider = ProcessWorkerEmployer(queue_tasks=self._queue_task,
-                                            queue_outcome=self._queue_outcome,
-                                            queue_start=self._queue_start,
+        my_provider = ProcessWorkerEmployer(transport=self._transport,
                                             status_db=self._status_db)
 
         number_of_workers = 1
@@ -153,5 +149,55 @@ class TestProcessWorkerEmployer(object):
         self._employer.employ(number_of_workers=worker_count)
         self._employer.abandon()
 
+    def test_employ_connects_worker(self):
+        """Employed workers are connected via the transport."""
+        self._employer.employ(1)
+        assert len(self._employer.worker_ids) == 1
+
+    def test_abandon_reports_layoff(self):
+        """Laid off workers are reported to the status database."""
+        self._employer.employ(1)
+        worker_id = self._employer.worker_ids[0]
+        self._employer.abandon()
+
+        _, kwargs = self._status_db.report_layoff.call_args
+        assert kwargs["worker_id"] == worker_id
+        assert isinstance(kwargs["reason"], LayoffError)
+        assert not kwargs["orphan"]
+        assert self._employer.worker_ids == []
+
+    def test_abandon_terminates_workers_despite_inherited_handler(self):
+        """Workers do not inherit the SIGTERM handler of their parent."""
+        handler = signal.signal(signal.SIGTERM, lambda signum, frame: None)
+        try:
+            self._employer.employ(1)
+        finally:
+            signal.signal(signal.SIGTERM, handler)
+        worker_process = self._employer._get_worker_process_for_id(
+            self._employer.worker_ids[0])
+        # let the worker run, a SIGTERM before that gets it killed instead
+        time.sleep(0.5)
+
+        time_start = time.time()
+        self._employer.abandon()
+        assert time.time() - time_start < \
+            ProcessWorkerEmployer.TERMINATE_TIMEOUT
+        assert worker_process.exitcode == -signal.SIGTERM
+
+    def test_abandon_kills_workers_ignoring_termination(self):
+        """Workers that do not terminate get killed."""
+        handler = signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        try:
+            self._employer.employ(1)
+        finally:
+            signal.signal(signal.SIGTERM, handler)
+        worker_process = self._employer._get_worker_process_for_id(
+            self._employer.worker_ids[0])
+
+        # terminate before the worker resets its handler
+        self._employer.TERMINATE_TIMEOUT = 0.1
+        self._employer.abandon()
+        assert worker_process.exitcode in (-signal.SIGTERM, -signal.SIGKILL)
+
 if __name__ == '__main__':
     nose.runmodule()
@@ -7,21 +7,63 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
+import os
+import shutil
+import tempfile
 from multiprocessing import cpu_count
 
 # Third Party
 import nose
+from mock import patch
 from nose.tools.nontrivial import raises
 
 # First Party
+from metaopt.concurrent.employer.util import determine_worker_count as module
 from metaopt.concurrent.employer.util. \
-    determine_worker_count import determine_worker_count
+    determine_worker_count import WorkerCount, detect_worker_count, \
+    determine_worker_count
 
 
 class TestDetermineWorkerCount(object):
 
+    def __init__(self):
+        self._directory = None
+        self._patches = []
+
+    def setup(self):
+        """Nose executes this method before each test."""
+        # fake the cgroup files of the kernel and clear the override
+        self._directory = tempfile.mkdtemp()
+        self._patches = [
+            patch.object(module, "PROC_CGROUP",
+                         os.path.join(self._directory, "cgroup")),
+            patch.object(module, "CGROUP_ROOT", self._directory),
+            patch.dict(os.environ),
+        ]
+        for patcher in self._patches:
+            patcher.start()
+        os.environ.pop(module.ENVIRONMENT_VARIABLE, None)
+
+    def teardown(self):
+        """Nose executes this method after each test."""
+        for patcher in reversed(self._patches):
+            patcher.stop()
+        shutil.rmtree(self._directory)
+
+    def _write(self, name, content):
+        path = os.path.join(self._directory, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "w") as cgroup_file:
+            cgroup_file.write(content)
+
+    def _patch_cpus(self, count):
+        """Makes the given number of CPUs available by affinity."""
+        return patch.object(module, "_count_cpus",
+                            return_value=WorkerCount(count, "affinity"))
+
     def test_determine_worker_count(self):
-        assert determine_worker_count() is cpu_count()
+        assert 1 <= determine_worker_count() <= cpu_count()
 
     def test_determine_worker_count_none(self):
         assert determine_worker_count(request=None) >= 1
@@ -40,5 +82,40 @@ class TestDetermineWorkerCount(object):
     def test_determine_worker_count_string(self):
         determine_worker_count(request="a")
 
+    def test_detect_worker_count_of_request(self):
+        assert detect_worker_count(request=3) == WorkerCount(3, "request")
+
+    def test_detect_worker_count_of_environment(self):
+        os.environ[module.ENVIRONMENT_VARIABLE] = "5"
+        assert detect_worker_count() == WorkerCount(5, "environment")
+
+    @raises(ValueError)
+    def test_detect_worker_count_of_invalid_environment(self):
+        os.environ[module.ENVIRONMENT_VARIABLE] = "many"
+        detect_worker_count()
+
+    def test_detect_worker_count_of_cgroup_v2_quota(self):
+        self._write("cgroup", "0::/pod\n")
+        self._write("pod/cpu.max", "150000 100000\n")
+        with self._patch_cpus(16):
+            assert detect_worker_count() == WorkerCount(2, "cgroup")
+
+    def test_detect_worker_count_of_cgroup_v1_quota(self):
+        self._write("cgroup", "4:cpu,cpuacct:/pod\n3:memory:/pod\n")
+        self._write("cpu,cpuacct/pod/cpu.cfs_quota_us", "400000\n")
+        self._write("cpu,cpuacct/pod/cpu.cfs_period_us", "100000\n")
+        with self._patch_cpus(16):
+            assert detect_worker_count() == WorkerCount(4, "cgroup")
+
+    def test_detect_worker_count_ignores_unlimited_and_larger_quota(self):
+        self._write("cgroup", "0::/\n")
+        self._write("cpu.max", "max 100000\n")
+        with self._patch_cpus(16):
+            assert detect_worker_count() == WorkerCount(16, "affinity")
+
+        self._write("cpu.max", "3200000 100000\n")
+        with self._patch_cpus(16):
+            assert detect_worker_count() == WorkerCount(16, "affinity")
+
 if __name__ == '__main__':
     nose.runmodule()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the policy placing worker processes on the CPUs of this machine.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+
+# Third Party
+import nose
+from mock import patch
+from nose.tools.nontrivial import raises
+
+# First Party
+from metaopt.concurrent.employer.util import placement as module
+from metaopt.concurrent.employer.util.placement import THREAD_VARIABLES, \
+    WorkerPlacement, place_process
+
+
+class TestWorkerPlacement(object):
+    """
+    Tests for the policy placing worker processes on the CPUs of this machine.
+    """
+
+    def test_count_workers_fitting_on_cpus(self):
+        placement = WorkerPlacement(threads_per_worker=2)
+        assert placement.count_workers(8) == 4
+        assert placement.count_workers(5) == 2
+        assert placement.count_workers(1) == 1
+
+    @raises(ValueError)
+    def test_threads_per_worker_must_be_positive(self):
+        WorkerPlacement(threads_per_worker=0)
+
+    def test_slots_are_disjoint(self):
+        placement = WorkerPlacement(threads_per_worker=2)
+        with patch.object(os, "sched_getaffinity", create=True,
+                          return_value=set(range(8))):
+            slots = [placement.get_cpus(slot, 6) for slot in range(3)]
+
+        assert slots == [set([0, 1]), set([2, 3]), set([4, 5])]
+
+    def test_get_cpus_without_pinning_returns_none(self):
+        placement = WorkerPlacement(threads_per_worker=2, pin=False)
+        assert placement.get_cpus(0, 8) is None
+
+    def test_place_process_limits_threads(self):
+        with patch.dict(os.environ), \
+                patch.object(module, "threadpool_limits", None):
+            place_process(threads=3)
+            values = [os.environ[name] for name in THREAD_VARIABLES]
+
+        assert values == ["3"] * len(THREAD_VARIABLES)
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the callbacks invokers call for starts and outcomes of calls.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Third Party
+import nose
+from mock import Mock
+
+# First Party
+from metaopt.concurrent.invoker.util.call_callbacks import CallCallbacks
+from metaopt.concurrent.model.call_lifecycle import Call, Result
+
+
+def result(call_id):
+    """Returns a stub result of the call with the given id."""
+    call = Call(id=call_id, function=None, args=None, kwargs=None,
+                param_spec=None, return_spec=None)
+    return Result(worker_id=None, call=call, value=None)
+
+
+class TestCallCallbacks(object):
+    """Tests for the callbacks invokers call for starts and outcomes."""
+
+    def test_start_returns_callbacks_once(self):
+        callbacks = CallCallbacks(report=Mock())
+        callback = Mock()
+        assert callbacks.add_start_callback(0, callback)
+
+        assert callbacks.start(0) == [callback]
+        assert callbacks.start(0) == []
+
+    def test_add_start_callback_leaves_running_calls_to_caller(self):
+        callbacks = CallCallbacks(report=Mock())
+        callbacks.start(0)
+
+        assert not callbacks.add_start_callback(0, Mock())
+        callbacks.unstart(0)
+        assert callbacks.add_start_callback(0, Mock())
+
+    def test_complete_queues_outcome_callbacks_till_called(self):
+        callbacks = CallCallbacks(report=Mock())
+        callback = Mock()
+        callbacks.add_outcome_callback(0, callback)
+        callbacks.add_start_callback(0, Mock())
+
+        outcome = result(0)
+        callbacks.complete(outcome)
+        assert not callback.called
+        assert callbacks.start(0) == []
+
+        callbacks.call_outcome_callbacks()
+        callback.assert_called_once_with(outcome)
+        callbacks.call_outcome_callbacks()
+        assert callback.call_count == 1
+
+    def test_call_outcome_callbacks_reports_outcomes_after_callbacks(self):
+        events = []
+        callbacks = CallCallbacks(
+            report=lambda outcome: events.append(("report", outcome)))
+        callbacks.add_outcome_callback(
+            0, lambda outcome: events.append(("callback", outcome)))
+
+        outcome = result(0)
+        callbacks.complete(outcome)
+        assert events == []
+
+        callbacks.call_outcome_callbacks()
+        assert events == [("callback", outcome), ("report", outcome)]
+
+if __name__ == '__main__':
+    nose.runmodule()
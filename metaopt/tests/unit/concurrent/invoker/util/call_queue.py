@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the queue of the calls waiting for a worker, by priority.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import time
+
+# Third Party
+import nose
+
+# First Party
+from metaopt.concurrent.invoker.util.call_queue import CallQueue
+from metaopt.concurrent.model.call_lifecycle import Call
+
+
+def calls(*call_ids):
+    """Returns stub calls with the given ids."""
+    return [Call(id=call_id, function=None, args=None, kwargs=None,
+                 param_spec=None, return_spec=None) for call_id in call_ids]
+
+
+def ids(calls_popped):
+    """Returns the ids of the given calls."""
+    return [call.id for call in calls_popped]
+
+
+class TestCallQueue(object):
+    """Tests for the queue of the calls waiting for a worker."""
+
+    def test_pops_higher_priorities_first_and_equal_ones_in_order(self):
+        queue = CallQueue(aging=None)
+        queue.push(calls(0, 1, 2, 3), priorities=[0, 2, 0, 2])
+
+        assert len(queue) == 4
+        assert ids(queue.pop(3)) == [1, 3, 0]
+        assert ids(queue.pop(3)) == [2]
+        assert len(queue) == 0
+
+    def test_aging_keeps_calls_from_starving(self):
+        queue = CallQueue(aging=0.01)
+        queue.push(calls(0), priorities=[0])
+        time.sleep(0.05)
+        queue.push(calls(1, 2), priorities=[1, 10])
+
+        # waited longer than one level of priority is worth, but not ten
+        assert ids(queue.pop(3)) == [2, 0, 1]
+
+    def test_discarded_calls_are_not_popped(self):
+        queue = CallQueue()
+        queue.push(calls(0, 1, 2))
+        queue.discard([1])
+
+        assert queue.queued([0, 1, 2]) == set([0, 2])
+        assert ids(queue.pop(3)) == [0, 2]
+
+    def test_stats_count_calls_and_waits_by_priority(self):
+        queue = CallQueue(aging=None)
+        queue.push(calls(0, 1, 2), priorities=[0, 1, 1])
+        time.sleep(0.01)
+        queue.pop(2)
+
+        stats = queue.stats
+        assert stats[1].issued == 2
+        assert stats[1].queued == 0
+        assert stats[1].wait_mean >= 0.01
+        assert stats[1].wait_max >= stats[1].wait_mean
+        assert stats[0].issued == 0
+        assert stats[0].queued == 1
+        assert stats[0].wait_mean is None
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the model predicting the durations of calls.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Third Party
+import nose
+
+# First Party
+from metaopt.concurrent.invoker.util.duration_model import DurationModel
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.paramspec.util import param
+
+
+@param.float("a", interval=(0, 10))
+@param.float("b", interval=(0, 1000))
+def f(a, b):
+    return a + b
+
+
+class TestDurationModel(object):
+    """Tests for the model predicting the durations of calls."""
+
+    def __init__(self):
+        self._model = None
+        self._creator = None
+
+    def setup(self):
+        """Nose will run this method before every test method."""
+        self._model = DurationModel(k=2)
+        self._creator = ArgsCreator(f.param_spec)
+
+    def test_predicts_nothing_without_records(self):
+        assert self._model.predict(self._creator.args((1, 1))) is None
+
+    def test_predicts_mean_duration_of_nearest_calls(self):
+        for a, duration in ((0, 1.0), (1, 3.0), (9, 100.0), (10, 200.0)):
+            self._model.record(self._creator.args((a, 500)), duration)
+
+        assert len(self._model) == 4
+        assert self._model.predict(self._creator.args((0.5, 500))) == 2.0
+        assert self._model.predict_many([
+            self._creator.args((9.5, 500)),
+            self._creator.args((0, 500))]) == [150.0, 2.0]
+
+    def test_scales_args_by_their_range(self):
+        self._model = DurationModel(k=1)
+        self._model.record(self._creator.args((0, 0)), 1.0)
+        self._model.record(self._creator.args((10, 1000)), 9.0)
+
+        # nearer in a than far in b, as both weigh the same
+        assert self._model.predict(self._creator.args((9, 400))) == 9.0
+        assert self._model.predict(self._creator.args((1, 600))) == 1.0
+
+    def test_ignores_args_that_are_not_numbers(self):
+        self._model.record(["a", "b"], 1.0)
+        assert len(self._model) == 0
+
+        self._model.record(self._creator.args((0, 0)), 1.0)
+        assert self._model.predict(["a", "b"]) is None
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the registry of the functions of calls by short ids.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Third Party
+import nose
+
+# First Party
+from metaopt.concurrent.invoker.util.function_registry import \
+    FunctionRegistry, encode_args
+from metaopt.concurrent.model.call_lifecycle import Call
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.call.util.batch import BatchArgs
+from metaopt.objective.integer.fast.explicit.f import f
+
+
+def call(args=None, param_spec=None):
+    """Returns a stub call of f with the given args and param spec."""
+    return Call(id=0, function=f, args=args, kwargs=None,
+                param_spec=param_spec, return_spec=None)
+
+
+class TestFunctionRegistry(object):
+    """Tests for the registry of the functions of calls by short ids."""
+
+    def test_register_gives_same_function_and_specs_one_id(self):
+        registry = FunctionRegistry()
+
+        function_id = registry.register(call())
+        assert registry.register(call()) == function_id
+        assert registry.register(call(param_spec=f.param_spec)) != \
+            function_id
+        assert registry[function_id].function is f
+
+    def test_encode_args_returns_raw_values(self):
+        args = ArgsCreator(f.param_spec).args()
+
+        assert encode_args(call(args)) == tuple(arg.value for arg in args)
+        assert encode_args(call(BatchArgs([args]))) == \
+            BatchArgs([tuple(arg.value for arg in args)])
+        assert encode_args(call()) is None
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for sharing NumPy arrays with worker processes.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+import pickle
+
+# Third Party
+import nose
+from nose.plugins.skip import SkipTest
+
+# First Party
+from metaopt.concurrent.invoker.util.shared_arrays import SharedArray, \
+    SharedArrays
+
+try:
+    # Numpy
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestSharedArrays(object):
+    """Tests for sharing NumPy arrays with worker processes."""
+
+    def __init__(self):
+        self._shared_arrays = None
+
+    def setup(self):
+        """Nose will run this method before every test method."""
+        if numpy is None:
+            raise SkipTest("NumPy is not installed.")
+        self._shared_arrays = SharedArrays()
+
+    def teardown(self):
+        """Nose will run this method after every test method."""
+        if self._shared_arrays is not None:
+            self._shared_arrays.close()
+
+    def test_share_replaces_arrays_only(self):
+        kwargs = self._shared_arrays.share({"a": numpy.arange(3), "b": 1})
+
+        assert isinstance(kwargs["a"], SharedArray)
+        assert kwargs["b"] == 1
+
+    def test_share_none(self):
+        assert self._shared_arrays.share(None) is None
+
+    def test_share_object_array(self):
+        array = numpy.array([object()])
+        kwargs = self._shared_arrays.share({"a": array})
+        assert kwargs["a"] is array
+
+    def test_share_writes_array_once(self):
+        array = numpy.arange(3)
+        kwargs = self._shared_arrays.share({"a": array, "b": array})
+        kwargs_again = self._shared_arrays.share({"a": array})
+
+        assert kwargs["a"] is kwargs["b"]
+        assert kwargs["a"] is kwargs_again["a"]
+
+    def test_share_writes_array_changed_in_place_again(self):
+        array = numpy.arange(3)
+        kwargs = self._shared_arrays.share({"a": array})
+        assert not self._shared_arrays.changed({"a": array})
+
+        array[1] = 5
+        assert self._shared_arrays.changed({"a": array})
+        kwargs_again = self._shared_arrays.share({"a": array})
+
+        assert kwargs_again["a"].filename != kwargs["a"].filename
+        assert not self._shared_arrays.changed({"a": array})
+        array_loaded = pickle.loads(pickle.dumps(kwargs_again["a"]))
+        assert (array_loaded == array).all()
+        # workers may still map the previous file
+        assert os.path.exists(kwargs["a"].filename)
+
+    def test_changed_for_arrays_not_shared_yet(self):
+        assert self._shared_arrays.changed({"a": numpy.arange(3)})
+        assert not self._shared_arrays.changed({"b": 1})
+
+    def test_unpickle_maps_array_read_only(self):
+        array = numpy.arange(1000, dtype=float)
+        kwargs = self._shared_arrays.share({"a": array})
+
+        array_loaded = pickle.loads(pickle.dumps(kwargs["a"]))
+
+        assert isinstance(array_loaded, numpy.memmap)
+        assert not array_loaded.flags.writeable
+        assert (array_loaded == array).all()
+        assert len(pickle.dumps(kwargs["a"])) < array.nbytes
+
+    def test_close_removes_files(self):
+        kwargs = self._shared_arrays.share({"a": numpy.arange(3)})
+        filename = kwargs["a"].filename
+        assert os.path.exists(filename)
+
+        self._shared_arrays.close()
+        assert not os.path.exists(filename)
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -8,7 +8,8 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
-from multiprocessing.dummy import Manager
+import time
+from threading import Event, Thread
 from uuid import uuid4
 
 # Third Party
@@ -17,7 +18,11 @@ from nose.tools.nontrivial import raises
 
 # First Party
 from metaopt.concurrent.invoker.util.status_db import StatusDB
-from metaopt.concurrent.model.call_lifecycle import Call, Result, Start
+from metaopt.concurrent.model.call_lifecycle import Call, Error, Function, \
+    Layoff, Result, Start, Task
+from metaopt.concurrent.transport.pipe import PipeTransport
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.stoppable.util.exception import StoppedError
 from metaopt.objective.integer.fast.explicit.f import f
 
 
@@ -30,24 +35,25 @@ class TestStatusDB(object):
     """
 
     def __init__(self):
-        self._queue_outcome = None
-        self._queue_task = None
-        self._queue_start = None
+        self._transport = None
+        self._worker_id = None
+        self._connection = None
         self._status_db = None
 
     def setup(self):
         """Nose executes this method before each test."""
-        manager = Manager()
-        self._queue_task = manager.Queue()
-        self._queue_start = manager.Queue()
-        self._queue_outcome = manager.Queue()
-        self._status_db = StatusDB(queue_task=self._queue_task,
-                                   queue_start=self._queue_start,
-                                   queue_outcome=self._queue_outcome)
+        self._transport = PipeTransport()
+        # act as the worker at the other end of the transport
+        self._worker_id = uuid4()
+        self._connection = self._transport.connect(self._worker_id)
+        self._status_db = StatusDB(transport=self._transport)
 
     def teardown(self):
         """Nose executes this method after each test."""
-        pass
+        if not self._status_db.stopped:
+            self._status_db.stop()
+        self._connection.close()
+        self._transport.close()
 
     def test_handle_status_start_once(self):
         worker_id = uuid4()
@@ -56,10 +62,11 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start = Start(worker_id=worker_id, call=call)
 
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
     def test_handle_status_start_duplicate_is_silent(self):
@@ -70,16 +77,17 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start = Start(worker_id=worker_id, call=call)
 
         # once
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
         # once again
         # will raise error because issuing the same task twice makes no sense
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
     @raises(ValueError)
@@ -91,19 +99,20 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start = Start(worker_id=worker_id, call=call)
 
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
         # once
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
         # once again
         worker_id = uuid4()
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
 
         # will work
         _ = self._status_db.wait_for_one_outcome()
@@ -117,10 +126,11 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start = Start(worker_id=worker_id, call=call)
 
-        self._queue_start.put(start)
+        self._connection.send(start)
         self._status_db.wait_for_one_start()
 
     def test_handle_status_increments_active_tasks_upon_start_once(self):
@@ -130,10 +140,11 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start = Start(worker_id=worker_id, call=call)
 
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
         count_tasks = self._status_db.count_running_tasks()
 
@@ -146,19 +157,22 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start = Start(worker_id=worker_id, call=call)
 
         call_id = uuid4()
-        call1 = Call(id=call_id, function=function, args=args, kwargs=kwargs)
-        start1 = Start(worker_id=worker_id, call=call1)
+        call1 = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
+        # a worker executes one call at a time, so start on another worker
+        start1 = Start(worker_id=uuid4(), call=call1)
 
         # once
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
         # twice
-        self._queue_start.put(start1)
+        self._connection.send(start1)
         _ = self._status_db.wait_for_one_start()
 
         count_tasks = self._status_db.count_running_tasks()
@@ -173,9 +187,10 @@ class TestStatusDB(object):
         kwargs = None
         value = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
 
         # there is no task that could have been finished
         # so a key error is risen
@@ -189,18 +204,21 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start = Start(worker_id=worker_id, call=call)
 
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
         outcome = self._status_db.wait_for_one_outcome()
 
         assert isinstance(outcome, Result)
-        assert outcome is result
+        assert outcome.call == result.call
+        # workers send raw values, which get wrapped in the return spec
+        assert outcome.value.raw_values == result.value
 
     def test_handle_status_decrements_active_tasks_upon_result_once(self):
         worker_id = uuid4()
@@ -209,14 +227,15 @@ class TestStatusDB(object):
         value = None
         args = None
         kwargs = None
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
 
         start = Start(worker_id=worker_id, call=call)
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
         _ = self._status_db.wait_for_one_outcome()
 
         count_tasks = self._status_db.count_running_tasks()
@@ -230,26 +249,28 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=uuid4(), function=function, args=args, kwargs=kwargs)
+        call = Call(id=uuid4(), function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start = Start(worker_id=worker_id, call=call)
 
-        call1 = Call(id=uuid4(), function=function, args=args, kwargs=kwargs)
+        call1 = Call(id=uuid4(), function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
         start1 = Start(worker_id=worker_id, call=call1)
 
         # once
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
         _ = self._status_db.wait_for_one_outcome()
 
         # twice
-        self._queue_start.put(start1)
+        self._connection.send(start1)
         _ = self._status_db.wait_for_one_start()
 
         result1 = Result(worker_id=worker_id, call=call1, value=value)
-        self._queue_outcome.put(result1)
+        self._connection.send(result1)
         _ = self._status_db.wait_for_one_outcome()
 
         # make assertions
@@ -264,14 +285,15 @@ class TestStatusDB(object):
         args = None
         kwargs = None
 
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
 
         start = Start(worker_id=worker_id, call=call)
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
         _ = self._status_db.wait_for_one_outcome()
 
     @raises(ValueError)
@@ -280,25 +302,341 @@ class TestStatusDB(object):
         function = f
         args = None
         kwargs = None
-        call = Call(id=call_id, function=function, args=args, kwargs=kwargs)
+        call = Call(id=call_id, function=function, args=args, kwargs=kwargs,
+                    param_spec=None, return_spec=None)
 
         value = None
 
         worker_id = uuid4()
         start = Start(worker_id=worker_id, call=call)
-        self._queue_start.put(start)
+        self._connection.send(start)
         _ = self._status_db.wait_for_one_start()
 
         # once
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
         _ = self._status_db.wait_for_one_outcome()
 
         # twice
         worker_id = uuid4()
         result = Result(worker_id=worker_id, call=call, value=value)
-        self._queue_outcome.put(result)
+        self._connection.send(result)
+        _ = self._status_db.wait_for_one_outcome()
+
+    def test_issue_task_sends_task_to_its_worker(self):
+        call = Call(id=uuid4(), function=f, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        task = Task(worker_id=self._worker_id, call=call)
+
+        self._status_db.issue_task(task)
+
+        registration = Function(id=0, function=f, param_spec=None,
+                                return_spec=None)
+        task_sent = task._replace(call=call._replace(function=0))
+        assert self._connection.recv() == [registration, task_sent]
+        assert self._status_db.get_idle_call(self._worker_id) == call
+        assert self._status_db.is_busy(self._worker_id)
+        assert self._status_db.outcomes_awaited == 1
+
+    def test_issue_tasks_sends_tasks_to_their_workers_at_once(self):
+        worker_id = uuid4()
+        connection = self._transport.connect(worker_id)
+        calls = [Call(id=uuid4(), function=f, args=None, kwargs=dict(a=i),
+                      param_spec=None, return_spec=None) for i in range(3)]
+        tasks = [Task(worker_id=self._worker_id, call=calls[0]),
+                 Task(worker_id=worker_id, call=calls[1]),
+                 Task(worker_id=self._worker_id, call=calls[2])]
+
+        self._status_db.issue_tasks(tasks)
+
+        # the keyword arguments stay with the caller
+        tasks_sent = [task._replace(call=task.call._replace(function=0,
+                                                            kwargs=None))
+                      for task in tasks]
+        registration = Function(id=0, function=f, param_spec=None,
+                                return_spec=None)
+        assert self._connection.recv() == \
+            [registration, tasks_sent[0], tasks_sent[2]]
+        assert connection.recv() == [registration, tasks_sent[1]]
+        assert self._status_db.outcomes_awaited == 3
+        connection.close()
+
+    def test_issue_task_sends_raw_values_of_args(self):
+        args = ArgsCreator(f.param_spec).args()
+        call = Call(id=0, function=f, args=args, kwargs=None,
+                    param_spec=f.param_spec, return_spec=None)
+
+        self._status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+
+        _, task_sent = self._connection.recv()
+        assert task_sent.call.args == tuple(arg.value for arg in args)
+
+        # the args get restored for the outcome
+        self._connection.send(Result(worker_id=self._worker_id,
+                                     call=task_sent.call, value=1))
+        outcome = self._status_db.wait_for_one_outcome()
+        assert outcome.call == call
+        assert outcome.value.raw_values == 1
+
+    def test_issue_tasks_sends_function_once_per_worker(self):
+        calls = [Call(id=uuid4(), function=f, args=None, kwargs=None,
+                      param_spec=None, return_spec=None) for _ in range(2)]
+
+        for call in calls:
+            self._status_db.issue_task(Task(worker_id=self._worker_id,
+                                            call=call))
+
+        messages = self._connection.recv()
+        assert isinstance(messages[0], Function)
+        assert messages[1].call.function == messages[0].id
+        task_sent, = self._connection.recv()
+        assert task_sent.call.function == messages[0].id
+        assert task_sent.call.param_spec is None
+
+    def test_handle_layoff_of_idle_call(self):
+        call = Call(id=uuid4(), function=f, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        self._status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+
+        self._status_db.report_layoff(worker_id=self._worker_id)
+        outcome = self._status_db.wait_for_one_outcome()
+
+        assert outcome == Layoff(worker_id=self._worker_id, call=call,
+                                 value=None)
+        assert not self._status_db.is_busy(self._worker_id)
+        assert self._status_db.outcomes_awaited == 0
+
+    def test_handle_result_after_layoff_is_dropped(self):
+        call = Call(id=uuid4(), function=f, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        self._status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+        self._connection.send(Start(worker_id=self._worker_id, call=call))
+        _ = self._status_db.wait_for_one_start()
+
+        self._status_db.report_layoff(worker_id=self._worker_id)
+        _ = self._status_db.wait_for_one_outcome()
+
+        # the result got sent right before the worker was laid off
+        result = Result(worker_id=self._worker_id, call=call, value=None)
+        self._connection.send(result)
+        self._status_db.stop()
+
+        assert self._status_db.flush_outcomes() == []
+
+    def test_cancel_running_call_reports_layoff_and_drops_outcome(self):
+        call = Call(id=uuid4(), function=f, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        self._status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+        assert self._status_db.cancel_running_call(call_id=call.id) is None
+
+        self._connection.send(Start(worker_id=self._worker_id, call=call))
+        _ = self._status_db.wait_for_one_start()
+        reason = Exception()
+        worker_id = self._status_db.cancel_running_call(call_id=call.id,
+                                                        reason=reason)
+
+        assert worker_id == self._worker_id
+        assert self._status_db.wait_for_one_outcome() == \
+            Layoff(worker_id=self._worker_id, call=call, value=reason)
+        assert self._status_db.is_cancelling(call.id)
+
+        # the worker aborted the call
+        self._connection.send(Error(worker_id=self._worker_id, call=call,
+                                    value=None))
+        deadline = time.time() + 1
+        while self._status_db.is_cancelling(call.id):
+            assert time.time() < deadline
+            time.sleep(0.01)
+        self._status_db.stop()
+
+        assert self._status_db.flush_outcomes() == []
+
+    def test_late_messages_of_cancelled_call_are_dropped_after_retention(
+            self):
+        # only one status database may receive from the transport
+        self._status_db.stop()
+        status_db = self._status_db = StatusDB(transport=self._transport,
+                                               retention=1)
+        calls = [Call(id=uuid4(), function=f, args=None, kwargs=None,
+                      param_spec=None, return_spec=None) for _ in range(3)]
+        for call in calls:
+            status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+        assert status_db.cancel_idle_call(call_id=calls[1].id)
+        _ = status_db.wait_for_one_outcome()
+
+        # the worker executes its calls in order, the cancelled one, too
+        for call in calls:
+            self._connection.send(Start(worker_id=self._worker_id, call=call))
+            self._connection.send(Result(worker_id=self._worker_id, call=call,
+                                         value=None))
+        outcomes = [status_db.wait_for_one_outcome() for _ in range(2)]
+
+        assert [outcome.call for outcome in outcomes] == [calls[0], calls[2]]
+        assert not status_db.is_busy(self._worker_id)
+        assert status_db._cancelled_calls == {}
+        assert status_db.outcomes_awaited == 0
+        status_db.stop()
+        assert status_db.flush_outcomes() == []
+
+    def test_handle_loss_orphans_running_and_idle_calls(self):
+        calls = [Call(id=uuid4(), function=f, args=None, kwargs=None,
+                      param_spec=None, return_spec=None) for _ in range(2)]
+        for call in calls:
+            self._status_db.issue_task(Task(worker_id=self._worker_id,
+                                            call=call))
+        self._connection.send(Start(worker_id=self._worker_id, call=calls[0]))
+        _ = self._status_db.wait_for_one_start()
+
+        self._status_db.report_loss(worker_id=self._worker_id)
+
+        assert self._status_db.get_orphaned_calls() == calls
+        assert not self._status_db.is_busy(self._worker_id)
+        assert self._status_db.outcomes_awaited == 2
+
+    def test_outcome_callbacks_get_outcome_before_it_is_waited_for(self):
+        call = Call(id=uuid4(), function=f, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        outcomes = []
+        # callbacks may be given before the call is issued
+        self._status_db.add_outcome_callback(call.id, outcomes.append)
+        self._status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+
+        self._status_db.report_layoff(worker_id=self._worker_id)
+        layoff = Layoff(worker_id=self._worker_id, call=call, value=None)
+        assert outcomes == [layoff]
+
+        # callbacks given after completion get called right away
+        self._status_db.add_outcome_callback(call.id, outcomes.append)
+        assert outcomes == [layoff, layoff]
+        assert self._status_db.wait_for_one_outcome() == layoff
+
+    def test_report_memory_keeps_peak_of_running_call(self):
+        call = Call(id=uuid4(), function=f, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        self._status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+        # idle workers use memory for no call
+        self._status_db.report_memory(worker_id=self._worker_id, rss=3)
+        self._connection.send(Start(worker_id=self._worker_id, call=call))
+        _ = self._status_db.wait_for_one_start()
+
+        for rss in (1, 5, 2):
+            self._status_db.report_memory(worker_id=self._worker_id, rss=rss)
+        self._status_db.report_layoff(worker_id=self._worker_id)
+
+        assert self._status_db.get_memory_peak(call.id) == 5
+
+    def test_wake_up_returns_no_outcome(self):
+        self._status_db.wake_up()
+        assert self._status_db.wait_for_one_outcome() is None
+
+    def test_stop_wakes_up_waiting_thread_immediately(self):
+        errors = []
+
+        def wait():
+            try:
+                self._status_db.wait_for_one_outcome()
+            except StoppedError as error:
+                errors.append(error)
+
+        thread = Thread(target=wait)
+        thread.start()
+        time.sleep(0.1)  # let the thread block on the transport
+
+        time_stop = time.time()
+        self._status_db.stop()
+        thread.join(timeout=1)
+
+        assert not thread.is_alive()
+        assert time.time() - time_stop < 0.5
+        assert len(errors) == 1
+
+    @raises(StoppedError)
+    def test_wait_after_stop_raises_error(self):
+        self._status_db.stop()
+        self._status_db.wait_for_one_start()
+
+    def test_get_worker_id_of_completed_call_raises_error(self):
+        call = Call(id=uuid4(), function=f, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        self._status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+        assert self._status_db.get_worker_id(call.id) == self._worker_id
+
+        self._connection.send(Start(worker_id=self._worker_id, call=call))
+        self._connection.send(Result(worker_id=self._worker_id, call=call,
+                                     value=None))
+        _ = self._status_db.wait_for_one_outcome()
+
+        # a late timeout must not lay off the worker executing another call
+        try:
+            self._status_db.get_worker_id(call.id)
+        except KeyError:
+            pass
+        else:
+            assert False
+        assert not self._status_db.is_busy(self._worker_id)
+        assert self._status_db.count_running_tasks() == 0
+
+    def test_idle_calls_are_kept_in_order(self):
+        calls = [Call(id=uuid4(), function=f, args=None, kwargs=None,
+                      param_spec=None, return_spec=None) for _ in range(3)]
+        for call in calls:
+            self._status_db.issue_task(Task(worker_id=self._worker_id,
+                                            call=call))
+        assert self._status_db.count_idle_tasks() == 3
+        assert self._status_db.get_idle_call(self._worker_id) == calls[0]
+
+        self._connection.send(Start(worker_id=self._worker_id, call=calls[0]))
+        _ = self._status_db.wait_for_one_start()
+
+        assert self._status_db.count_idle_tasks() == 2
+        assert self._status_db.get_idle_call(self._worker_id) == calls[1]
+        assert self._status_db.get_running_call(self._worker_id) == calls[0]
+
+    def test_chunked_reports_share_the_time_since_the_previous_report(self):
+        calls = [Call(id=uuid4(), function=f, args=None, kwargs=None,
+                      param_spec=None, return_spec=None) for _ in range(3)]
+        self._status_db.issue_tasks([Task(worker_id=self._worker_id,
+                                          call=call) for call in calls])
+        started = Event()
+        self._status_db.add_start_callback(call_id=calls[2].id,
+                                           callback=started.set)
+
+        self._connection.send(Start(worker_id=self._worker_id, call=calls[0]))
+        self._connection.send(Result(worker_id=self._worker_id, call=calls[0],
+                                     value=None))
         _ = self._status_db.wait_for_one_outcome()
+        time.sleep(0.2)
+        self._connection.send([report for call in calls[1:] for report in
+                               (Start(worker_id=self._worker_id, call=call),
+                                Result(worker_id=self._worker_id, call=call,
+                                       value=None))])
+
+        outcomes = [self._status_db.wait_for_one_outcome() for _ in calls[1:]]
+        assert [outcome.call.id for outcome in outcomes] == \
+            [call.id for call in calls[1:]]
+        # the receiving thread calls back after handing out the outcomes
+        assert started.wait(1)
+        # about 0.1 seconds each, weighted into the mean
+        for call in calls[1:]:
+            assert 0.09 < self._status_db.get_duration(call.id) < 0.2
+        assert 0.03 < self._status_db.duration_mean < 0.1
+
+    def test_completed_calls_are_retained_boundedly(self):
+        # only one status database may receive from the transport
+        self._status_db.stop()
+        status_db = self._status_db = StatusDB(transport=self._transport,
+                                               retention=2)
+        for _ in range(5):
+            call = Call(id=uuid4(), function=f, args=None, kwargs=None,
+                        param_spec=None, return_spec=None)
+            status_db.issue_task(Task(worker_id=self._worker_id, call=call))
+            self._connection.send(Result(worker_id=self._worker_id, call=call,
+                                         value=None))
+            _ = status_db.wait_for_one_outcome()
+
+        assert len(status_db._completed_statuses) == 2
+        assert status_db._call_status_dict == {}
+        assert status_db.outcomes_awaited == 0
 
 if __name__ == "__main__":
     nose.runmodule()
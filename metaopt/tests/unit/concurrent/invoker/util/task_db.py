@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the database of tasks that workers claim with leases.
+"""
+
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import os
+import shutil
+import tempfile
+import time
+
+# Third Party
+import nose
+
+# First Party
+from metaopt.concurrent.invoker.util.task_db import Closed, TaskDB
+from metaopt.concurrent.model.call_lifecycle import Call, Error, Result, \
+    Start
+
+
+class TestTaskDB(object):
+    """
+    Tests for the database of tasks that workers claim with leases.
+    """
+
+    def __init__(self):
+        self._directory = None
+        self._task_db = None
+
+    def setup(self):
+        """Nose executes this method before each test."""
+        self._directory = tempfile.mkdtemp()
+        self._task_db = TaskDB(os.path.join(self._directory, "queue.db"))
+        self._task_db.open(lease=60)
+
+    def teardown(self):
+        """Nose executes this method after each test."""
+        self._task_db.close_connection()
+        shutil.rmtree(self._directory)
+
+    @staticmethod
+    def _outcome(outcome_type, worker_id, call_id, value):
+        call = Call(id=call_id, function=0, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        return outcome_type(worker_id=worker_id, call=call, value=value)
+
+    def test_claim_before_open_returns_none(self):
+        task_db = TaskDB(os.path.join(self._directory, "other.db"))
+        assert task_db.claim("worker") is None
+        task_db.close_connection()
+
+    def test_claims_tasks_in_order(self):
+        self._task_db.put_tasks([(0, 0, (1,)), (1, 0, (2,))])
+
+        _, lease, call_id, function_id, args = self._task_db.claim("a")
+        assert (lease, call_id, function_id, args) == (60, 0, 0, (1,))
+        assert self._task_db.claim("b")[2:] == (1, 0, (2,))
+        assert self._task_db.claim("c") is None
+
+        assert self._task_db.fetch_events() == [(0, Start, "a", None),
+                                                (1, Start, "b", None)]
+
+    def test_claims_task_of_expired_lease(self):
+        self._task_db.open(lease=0.05)
+        self._task_db.put_tasks([(0, 0, (1,))])
+        self._task_db.claim("a")
+        assert self._task_db.claim("b") is None
+
+        time.sleep(0.1)
+        assert self._task_db.claim("b")[2] == 0
+        assert not self._task_db.renew("a", 0, lease=0.05)
+        assert self._task_db.renew("b", 0, lease=0.05)
+
+    def test_report_of_lost_call_is_dropped(self):
+        self._task_db.put_tasks([(0, 0, (1,))])
+        self._task_db.claim("a")
+        self._task_db.fetch_events()
+        assert self._task_db.cancel(0)
+
+        assert not self._task_db.report(self._outcome(Result, "a", 0, 1))
+        assert self._task_db.fetch_events() == []
+
+    def test_report_records_outcome(self):
+        self._task_db.put_tasks([(0, 0, (1,))])
+        self._task_db.claim("a")
+        self._task_db.fetch_events()
+
+        assert self._task_db.report(self._outcome(Error, "a", 0, "error"))
+        assert self._task_db.fetch_events() == [(0, Error, "a", "error")]
+        assert not self._task_db.cancel(0)
+
+    def test_put_and_get_function(self):
+        self._task_db.put_function(0, "function")
+        assert self._task_db.get_function(0) == "function"
+
+    def test_close_stops_claims(self):
+        self._task_db.put_tasks([(0, 0, (1,))])
+        assert not self._task_db.is_closed()
+
+        self._task_db.close()
+
+        assert self._task_db.is_closed()
+        assert self._task_db.claim("a") is Closed
+
+    def test_open_drops_previous_tasks(self):
+        self._task_db.put_tasks([(0, 0, (1,))])
+        session = self._task_db.claim("a")[0]
+        self._task_db.put_tasks([(1, 0, (1,))])
+
+        self._task_db.open(lease=60)
+
+        assert self._task_db.claim("a") is None
+        self._task_db.put_tasks([(0, 0, (1,))])
+        assert self._task_db.claim("a")[0] != session
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -8,8 +8,9 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
 
 # Standard Library
+import time
 import uuid
-from multiprocessing import Manager
+from multiprocessing import Pipe
 from multiprocessing.process import Process
 
 # Third Party
@@ -17,34 +18,53 @@ import nose
 from nose.tools.nontrivial import raises
 
 # First Party
-from metaopt.concurrent.invoker.util.determine_package import determine_package
-from metaopt.concurrent.model.call_lifecycle import Call, Error, Result, \
-    Start, Task
+from metaopt.concurrent.model.call_lifecycle import Call, Error, Function, \
+    Result, Start, Task
 from metaopt.concurrent.worker.process import ProcessWorker
+from metaopt.concurrent.worker.util.context import get_context
+from metaopt.core.paramspec.util import param
 from metaopt.concurrent.worker.worker import Worker
+from metaopt.objective.integer.fast.explicit.f import f
 from metaopt.objective.integer.fast import FUNCTIONS_FAST
 
 
+def initialize(offset):
+    """Stub initializer whose return value becomes the context."""
+    return offset
+
+
+def initialize_failing():
+    """Stub initializer that fails."""
+    raise ValueError("Initialization failed.")
+
+
+@param.int("x", interval=[0, 10])
+def f_context(x):
+    """Stub objective function that uses the context of its process."""
+    return get_context() + x
+
+
+@param.int("x", interval=[0, 10])
+def f_slow_at_5(x):
+    """Stub objective function that takes long for 5 only."""
+    if x == 5:
+        time.sleep(1)
+    return x
+
+
 class TestWorkerProcess(object):
     """Tests for the worker process."""
 
     def __init__(self):
-        self._queue_outcome = None
-        self._queue_start = None
-        self._queue_task = None
+        self._connection = None
         self.worker_process = None
 
     def setup(self):
         """Nose will run this method before every test method."""
 
-        manager = Manager()
-        self._queue_task = manager.Queue()  # ignore error, this works
-        self._queue_start = manager.Queue()  # ignore error, this works
-        self._queue_outcome = manager.Queue()  # ignore error, this works
-
-        self.worker_process = ProcessWorker(queue_outcome=self._queue_outcome,
-                                            queue_start=self._queue_start,
-                                            queue_tasks=self._queue_task)
+        self._connection, connection_worker = Pipe()
+        self.worker_process = ProcessWorker(worker_id=uuid.uuid4(),
+                                            connection=connection_worker)
 
     def teardown(self):
         """Nose will run this method after every test method."""
@@ -54,6 +74,7 @@ class TestWorkerProcess(object):
             self.worker_process.join()
         # check postcondition
         assert not self.worker_process.is_alive()
+        self._connection.close()
 
     def test_worker_inheritance(self):
         """Tests that is worker process is a worker."""
@@ -95,10 +116,132 @@ class TestWorkerProcess(object):
     def test_worker_process_start_task(self):
         """Tests that issuing task works does not raise an exception."""
 
-        function = determine_package(FUNCTIONS_FAST[0])
-        call_id = uuid.uuid4()
-        self._queue_task.put(Task(call=Call(id=call_id, function=function,
-                                            args=None, kwargs=None)))
+        function = FUNCTIONS_FAST[0]
+        registration = Function(id=0, function=function,
+                                param_spec=function.param_spec,
+                                return_spec=None)
+        call = Call(id=uuid.uuid4(), function=0, args=None, kwargs=None,
+                    param_spec=None, return_spec=None)
+        self._connection.send([registration,
+                               Task(worker_id=self.worker_process.worker_id,
+                                    call=call)])
+
+    def test_worker_process_remembers_function(self):
+        """Tests that a function is registered once for all later tasks."""
+
+        function = FUNCTIONS_FAST[0]
+        registration = Function(id=0, function=function,
+                                param_spec=function.param_spec,
+                                return_spec=None)
+        self._connection.send([registration])
+
+        for _ in range(2):
+            call = Call(id=uuid.uuid4(), function=0, args=None, kwargs=None,
+                        param_spec=None, return_spec=None)
+            self._connection.send([Task(
+                worker_id=self.worker_process.worker_id, call=call)])
+
+            assert isinstance(self._connection.recv(), Start)
+            outcome = self._connection.recv()
+            assert isinstance(outcome, Result) or isinstance(outcome, Error)
+            assert outcome.call.id == call.id
+
+    def test_worker_process_calls_with_raw_values(self):
+        """Tests that a worker process takes and returns raw values."""
+
+        registration = Function(id=0, function=f, param_spec=f.param_spec,
+                                return_spec=None)
+        call = Call(id=0, function=0, args=(3,), kwargs=None,
+                    param_spec=None, return_spec=None)
+        self._connection.send([registration,
+                               Task(worker_id=self.worker_process.worker_id,
+                                    call=call)])
+
+        assert isinstance(self._connection.recv(), Start)
+        outcome = self._connection.recv()
+        assert isinstance(outcome, Result)
+        assert outcome.value == 3
+
+    def test_worker_process_reports_fast_calls_in_chunks(self):
+        """Tests that a worker process reports fast calls in one list."""
+
+        registration = Function(id=0, function=f, param_spec=f.param_spec,
+                                return_spec=None)
+        calls = [Call(id=x, function=0, args=(x,), kwargs=None,
+                      param_spec=None, return_spec=None) for x in range(4)]
+        self._connection.send([registration] + [
+            Task(worker_id=self.worker_process.worker_id, call=call)
+            for call in calls])
+
+        # the first call reveals that calls are fast
+        assert isinstance(self._connection.recv(), Start)
+        assert self._connection.recv().value == 0
+
+        reports = self._connection.recv()
+        assert [type(report) for report in reports] == [Start, Result] * 3
+        assert [report.value for report in reports[1::2]] == [1, 2, 3]
+
+    def test_worker_process_reports_start_of_slow_call_among_fast_ones(self):
+        """Tests that a worker process reports a slow call while it runs."""
+
+        registration = Function(id=0, function=f_slow_at_5,
+                                param_spec=f_slow_at_5.param_spec,
+                                return_spec=None)
+        calls = [Call(id=x, function=0, args=(x,), kwargs=None,
+                      param_spec=None, return_spec=None)
+                 for x in (0, 1, 2, 5, 3)]
+        self._connection.send([registration] + [
+            Task(worker_id=self.worker_process.worker_id, call=call)
+            for call in calls])
+
+        times_received = dict()
+        while (Result, 3) not in times_received:
+            reports = self._connection.recv()
+            if not isinstance(reports, list):
+                reports = [reports]
+            for report in reports:
+                times_received[(type(report), report.call.id)] = time.time()
+
+        # the start arrived while the call still ran
+        assert times_received[(Result, 5)] - times_received[(Start, 5)] > 0.5
+
+    def _call_f_context(self, setup, x):
+        """Calls f_context in a worker with the given setup."""
+        connection, connection_worker = Pipe()
+        worker_process = ProcessWorker(worker_id=uuid.uuid4(),
+                                       connection=connection_worker, **setup)
+        try:
+            registration = Function(id=0, function=f_context,
+                                    param_spec=f_context.param_spec,
+                                    return_spec=None)
+            call = Call(id=0, function=0, args=(x,), kwargs=None,
+                        param_spec=None, return_spec=None)
+            connection.send([registration,
+                             Task(worker_id=worker_process.worker_id,
+                                  call=call)])
+
+            assert isinstance(connection.recv(), Start)
+            return connection.recv()
+        finally:
+            worker_process.terminate()
+            worker_process.join()
+            connection.close()
+
+    def test_worker_process_initializer_sets_context(self):
+        """Tests that calls get the context returned by the initializer."""
+
+        outcome = self._call_f_context(dict(initializer=initialize,
+                                            initargs=(5,)), x=3)
+        assert isinstance(outcome, Result)
+        assert outcome.value == 8
+
+    def test_worker_process_initializer_fails_calls(self):
+        """Tests that calls fail with the error of the initializer."""
+
+        outcome = self._call_f_context(
+            dict(initializer=initialize_failing), x=3)
+        assert isinstance(outcome, Error)
+        assert isinstance(outcome.value, ValueError)
 
     def test_worker_process_start_task_status_repeated(self):
         """
@@ -112,19 +255,25 @@ class TestWorkerProcess(object):
             print("next function: %s" % function.__module__)
 
             # run
-            function = determine_package(function)
             call_id = uuid.uuid4()
-            call = Call(id=call_id, function=function, args=None, kwargs=None)
-            task = Task(call=call)
-            self._queue_task.put(task)
+            registration = Function(id=call_id, function=function,
+                                    param_spec=function.param_spec,
+                                    return_spec=None)
+            call = Call(id=call_id, function=call_id, args=None, kwargs=None,
+                        param_spec=None, return_spec=None)
+            task = Task(worker_id=self.worker_process.worker_id, call=call)
+            self._connection.send([registration, task])
 
             # check status
-            start = self._queue_start.get()
+            start = self._connection.recv()
             assert start
             assert isinstance(start, Start)
             assert start.worker_id == self.worker_process.worker_id
             assert start.call.id == call_id
 
+            # skip outcome
+            self._connection.recv()
+
     def test_worker_process_start_task_status_outcome_repeated(self):
         """
         Tests that a worker process reports its start and outcome.
@@ -137,21 +286,24 @@ class TestWorkerProcess(object):
             print("next function: %s" % function.__module__)
 
             # run
-            function = determine_package(function)
             call_id = uuid.uuid4()
-            call = Call(id=call_id, function=function, args=None, kwargs=None)
-            task = Task(call=call)
-            self._queue_task.put(task)
+            registration = Function(id=call_id, function=function,
+                                    param_spec=function.param_spec,
+                                    return_spec=None)
+            call = Call(id=call_id, function=call_id, args=None, kwargs=None,
+                        param_spec=None, return_spec=None)
+            task = Task(worker_id=self.worker_process.worker_id, call=call)
+            self._connection.send([registration, task])
 
             # check status
-            status = self._queue_start.get()
+            status = self._connection.recv()
             assert status
             assert isinstance(status, Start)
             assert status.worker_id == self.worker_process.worker_id
             assert status.call.id == call_id
 
             # check outcome
-            outcome = self._queue_outcome.get()
+            outcome = self._connection.recv()
             assert outcome
 
             # TODO avoid Errors
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the pipe transport.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+from uuid import uuid4
+
+# Third Party
+import nose
+from nose.tools.nontrivial import raises
+
+# First Party
+from metaopt.concurrent.transport.pipe import PipeTransport
+
+
+class TestPipeTransport(object):
+    """
+    Tests for the pipe transport.
+    """
+
+    def __init__(self):
+        self._transport = None
+
+    def setup(self):
+        """Nose will run this method before every test method."""
+        self._transport = PipeTransport()
+
+    def teardown(self):
+        """Nose will run this method after every test method."""
+        self._transport.close()
+
+    def test_send_reaches_connected_worker(self):
+        worker_id = uuid4()
+        connection = self._transport.connect(worker_id)
+
+        self._transport.send(worker_id, "message")
+
+        assert connection.recv() == "message"
+
+    def test_receive_from_connected_worker(self):
+        connection = self._transport.connect(uuid4())
+
+        connection.send("message")
+
+        assert self._transport.receive(timeout=1) == "message"
+
+    def test_receive_posted_message(self):
+        self._transport.post("message")
+
+        assert self._transport.receive(timeout=1) == "message"
+
+    def test_receive_returns_none_after_timeout(self):
+        self._transport.connect(uuid4())
+
+        assert self._transport.receive(timeout=0) is None
+
+    def test_receive_skips_closed_worker(self):
+        connection = self._transport.connect(uuid4())
+        connection.close()
+
+        assert self._transport.receive(timeout=0.1) is None
+
+    @raises(KeyError)
+    def test_send_to_disconnected_worker_raises_error(self):
+        worker_id = uuid4()
+        self._transport.connect(worker_id)
+        self._transport.disconnect(worker_id)
+
+        self._transport.send(worker_id, "message")
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the thread transport.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+from uuid import uuid4
+
+# Third Party
+import nose
+from nose.tools.nontrivial import raises
+
+# First Party
+from metaopt.concurrent.transport.thread import ThreadTransport
+
+
+class TestThreadTransport(object):
+    """
+    Tests for the thread transport.
+    """
+
+    def __init__(self):
+        self._transport = None
+
+    def setup(self):
+        """Nose will run this method before every test method."""
+        self._transport = ThreadTransport()
+
+    def teardown(self):
+        """Nose will run this method after every test method."""
+        self._transport.close()
+
+    def test_send_reaches_connected_worker(self):
+        worker_id = uuid4()
+        connection = self._transport.connect(worker_id)
+        message = object()
+
+        self._transport.send(worker_id, message)
+
+        # messages are passed by reference
+        assert connection.recv() is message
+
+    def test_receive_from_connected_worker(self):
+        connection = self._transport.connect(uuid4())
+
+        connection.send("message")
+
+        assert self._transport.receive(timeout=1) == "message"
+
+    def test_receive_posted_message(self):
+        self._transport.post("message")
+
+        assert self._transport.receive(timeout=1) == "message"
+
+    def test_receive_returns_none_after_timeout(self):
+        self._transport.connect(uuid4())
+
+        assert self._transport.receive(timeout=0) is None
+
+    @raises(KeyError)
+    def test_send_to_disconnected_worker_raises_error(self):
+        worker_id = uuid4()
+        self._transport.connect(worker_id)
+        self._transport.disconnect(worker_id)
+
+        self._transport.send(worker_id, "message")
+
+    @raises(EOFError)
+    def test_disconnected_worker_receives_eof(self):
+        worker_id = uuid4()
+        connection = self._transport.connect(worker_id)
+        self._transport.disconnect(worker_id)
+
+        connection.recv()
+
+    @raises(IOError)
+    def test_disconnected_worker_can_not_send(self):
+        worker_id = uuid4()
+        connection = self._transport.connect(worker_id)
+        self._transport.disconnect(worker_id)
+
+        connection.send("message")
+
+if __name__ == '__main__':
+    nose.runmodule()
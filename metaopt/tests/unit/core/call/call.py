@@ -1,6 +1,61 @@
 """
-TODO Write unit tests for call. Note that there are already integration tests.
+Tests for calling batch functions. Note that there are already integration
+tests for call.
 """
 # Future
 from __future__ import absolute_import, division, print_function, \
     unicode_literals, with_statement
+
+# Third Party
+import nose
+from nose.tools import raises
+
+# First Party
+from metaopt.core.arg.util.creator import ArgsCreator
+from metaopt.core.call.call import call, call_batch
+from metaopt.core.call.util.batch import batch, is_batch
+from metaopt.core.call.util.exception import CallNotPossibleError
+from metaopt.core.paramspec.util import param
+from metaopt.core.returnspec.util.decorator import minimize
+
+
+@batch
+@minimize("y")
+@param.int("a", interval=[0, 10])
+@param.int("b", interval=[0, 10])
+def f(candidates):
+    return [int(row[0]) - int(row[1]) for row in candidates]
+
+
+@batch
+@param.int("a", interval=[0, 10])
+def f_short(candidates):
+    return [0]
+
+
+class TestCallBatch(object):
+
+    def test_batch_marks_function(self):
+        assert is_batch(f)
+        assert not is_batch(lambda x: x)
+
+    def test_call_batch_calls_function_once_for_all_args(self):
+        creator = ArgsCreator(f.param_spec)
+        fargs_list = [creator.args((1, 2)), creator.args((5, 3))]
+
+        values = call_batch(f, fargs_list, f.param_spec, f.return_spec)
+
+        assert [value.raw_values for value in values] == [-1, 2]
+
+    def test_call_calls_batch_function_with_batch_of_one(self):
+        fargs = ArgsCreator(f.param_spec).args((4, 1))
+        assert call(f, fargs, f.param_spec, f.return_spec).raw_values == 3
+
+    @raises(CallNotPossibleError)
+    def test_call_batch_checks_number_of_return_values(self):
+        creator = ArgsCreator(f_short.param_spec)
+        call_batch(f_short, [creator.args((1,)), creator.args((2,))],
+                   f_short.param_spec)
+
+if __name__ == '__main__':
+    nose.runmodule()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the quorum finishing generations without their stragglers.
+"""
+# Future
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals, with_statement
+
+# Standard Library
+import time
+from concurrent.futures import Future
+from threading import Timer
+
+# Third Party
+import nose
+from nose.tools import raises
+
+# First Party
+from metaopt.optimizer.util.quorum import Quorum
+
+
+class StubCallHandle(Future):
+    """Future with the times a call handle records."""
+
+    def __init__(self, time_started=None, duration=None):
+        super(StubCallHandle, self).__init__()
+        self.time_started = time_started
+        self.duration = duration
+
+    def finish(self):
+        self.set_result(None)
+        return self
+
+
+class TestQuorum(object):
+
+    def test_returns_once_the_fraction_is_done_and_cancels_the_rest(self):
+        call_handles = [StubCallHandle().finish() for _ in range(9)]
+        call_handles.append(StubCallHandle())
+
+        cancelled = Quorum(fraction=0.9).wait(call_handles)
+
+        assert cancelled == call_handles[-1:]
+        assert call_handles[-1].cancelled()
+
+    def test_waits_for_the_minimum(self):
+        call_handles = [StubCallHandle() for _ in range(10)]
+        for call_handle in call_handles[:5]:
+            call_handle.finish()
+        for call_handle in call_handles[5:8]:
+            Timer(0.1, call_handle.finish).start()
+
+        cancelled = Quorum(fraction=0.5).wait(call_handles, minimum=8)
+
+        assert all(call_handle.done() for call_handle in call_handles[:8])
+        assert set(cancelled) == set(call_handles[8:])
+
+    def test_cancels_stragglers_running_longer_than_the_percentile(self):
+        quorum = Quorum(fraction=None, percentile=95)
+        quorum.wait([StubCallHandle(duration=0.01).finish()
+                     for _ in range(Quorum.SAMPLES_MIN)])
+        assert quorum.duration_limit == 0.01
+
+        call_handles = [StubCallHandle(duration=0.01).finish(),
+                        StubCallHandle(time_started=time.time() - 1),
+                        StubCallHandle(time_started=time.time())]
+
+        time_start = time.time()
+        cancelled = quorum.wait(call_handles)
+
+        assert time.time() - time_start < 1
+        assert set(cancelled) == set(call_handles[1:])
+
+    def test_ignores_invokers_without_call_handles(self):
+        assert Quorum().wait([None, None]) == []
+
+    @raises(ValueError)
+    def test_fraction_needs_to_be_positive(self):
+        Quorum(fraction=0)
+
+if __name__ == '__main__':
+    nose.runmodule()
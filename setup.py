@@ -66,7 +66,7 @@ setup(
                       "requirements_lint.txt", "requirements_test.txt"])],
     description=DESCRIPTION,
     ext_modules=[],
-    install_requires=[],
+    install_requires=['futures'] if sys.version_info < (3, 2) else [],
     license=metaopt.__license__,
     long_description=LONG_DESCRIPTION,
     name='metaopt',